@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Jun 16 09:12:27 2025
+
+@author: did
+
+Réannotation des logs de parties (save_log) par un moteur de référence, en parallèle, pour mesurer les erreurs des bots.
+
+Les logs ne contiennent que les coups joués : chaque partie est rejouée (apply_move, en partant de l'état initial du jeu)
+et chaque position est réévaluée par le Minimax du jeu, du point de vue du joueur qui doit jouer :
+    - best_value : valeur de la position (meilleur coup du moteur de référence),
+    - played_value : valeur du coup effectivement joué,
+    - value_loss : best_value - played_value (0 si le coup joué est aussi bon que le meilleur),
+    - blunder : value_loss >= blunder_threshold ou, sans seuil, le coup joué fait perdre le gain ou la nulle (le signe de la valeur baisse).
+      Le seuil dépend de l'échelle des scores du jeu (ex : 10 pour TicTacToe, dont les nuls valent de 0 à 9 et les victoires au moins 10).
+Jeux à 2 joueurs en mode all_against_ref_player : alpha-beta, la valeur du coup joué étant recalculée avec une fenêtre complète
+s'il n'est pas le meilleur. Sinon : Minimax selfish, qui évalue tous les coups de la racine.
+
+L'unité de travail d'un process est une partie. Tous les process partagent le cache persistant du jeu (search_cache.py) :
+le fichier est créé par le process principal avant le lancement des process, le premier process qui l'ouvre en devient l'écrivain,
+les autres le lisent.
+
+Les résultats sont écrits au fil de l'eau pour que le traitement puisse être interrompu et repris :
+    - chaque partie annotée est ajoutée au journal <output_folder>/journal.jsonl (une ligne JSON par partie),
+    - dès que toutes les parties d'un log sont annotées, le log annoté est écrit dans <output_folder>/<nom du log>.json
+      (clé "annotation" ajoutée à chaque événement move).
+A la reprise, les logs annotés et les parties du journal déjà traités avec le même moteur (algorithme, max_depth, seuil) sont sautés.
+
+Exemple :
+    from tictactoe import TicTacToe
+    annotator = LogAnnotator(TicTacToe, blunder_threshold=10)      # game_logs/TicTacToe/*.json -> game_logs/TicTacToe/annotated/
+    annotator.run()
+    annotator.print_stats()
+"""
+
+import os
+import json
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+def sign(value) -> int:
+    return (value > 0) - (value < 0)
+
+
+class BotAccuracy:
+    """
+    Statistiques d'erreurs d'un bot (ou d'un humain) sur l'ensemble des coups annotés.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.nb_moves = 0
+        self.nb_best_moves = 0               # coups sans perte de valeur
+        self.nb_blunders = 0
+        self.total_loss = 0
+
+    def add(self, annotation: dict) -> None:
+        self.nb_moves += 1
+        self.nb_best_moves += annotation["value_loss"] == 0
+        self.nb_blunders += annotation["blunder"]
+        self.total_loss += annotation["value_loss"]
+
+    def to_dict(self) -> dict:
+        nb_moves = self.nb_moves or 1
+        return {
+            "bot": self.name,
+            "moves": self.nb_moves,
+            "accuracy": round(self.nb_best_moves / nb_moves, 4),
+            "mean_value_loss": round(self.total_loss / nb_moves, 3),
+            "blunders": self.nb_blunders,
+            "blunder_rate": round(self.nb_blunders / nb_moves, 4),
+        }
+
+
+class LogAnnotator:
+    """
+    Réannote les logs d'un jeu avec un moteur de référence et agrège la précision de chaque bot.
+
+    Paramètres :
+    - game_class : classe du jeu des logs.
+    - max_depth : profondeur de la recherche de référence (None : recherche complète, réservée aux petits jeux).
+    - blunder_threshold : perte de valeur à partir de laquelle un coup est une gaffe (None : baisse du signe de la valeur).
+    - log_folder : dossier des logs (par défaut game_logs/<NomClasse>, où save_log les écrit).
+    - output_folder : dossier des logs annotés et du journal (par défaut <log_folder>/annotated).
+    - workers : nb de process (par défaut, le nb de CPU).
+    - use_cache : True pour partager le cache persistant du jeu entre les process (et entre les exécutions).
+    - game_kwargs : paramètres passés au constructeur du jeu (ex : m, n, k de MNKGame).
+    """
+
+    def __init__(self, game_class, max_depth: int = None, blunder_threshold: float = None, log_folder: str = None, output_folder: str = None,
+                 workers: int = None, use_cache: bool = True, game_kwargs: dict = None):
+        self.game_class = game_class
+        self.max_depth = max_depth
+        self.blunder_threshold = blunder_threshold
+        self.log_folder = log_folder or os.path.join("game_logs", game_class.__name__)
+        self.output_folder = output_folder or os.path.join(self.log_folder, "annotated")
+        self.workers = workers or os.cpu_count()
+        self.use_cache = use_cache
+        self.game_kwargs = game_kwargs or {}
+        self.engine = {"algorithm": "minimax", "max_depth": max_depth, "blunder_threshold": blunder_threshold}       # moteur de référence, noté dans le journal et les logs annotés
+        self.journal_path = os.path.join(self.output_folder, "journal.jsonl")
+        self.accuracies = {}                 # {bot : BotAccuracy}
+
+    def get_log_paths(self) -> list:
+        return sorted(glob(os.path.join(self.log_folder, "*.json")))
+
+    def get_output_path(self, log_path: str) -> str:
+        return os.path.join(self.output_folder, os.path.basename(log_path))
+
+    def is_annotated(self, log_path: str) -> bool:
+        """
+        Indique si le log annoté existe déjà, avec le même moteur de référence.
+        """
+        output_path = self.get_output_path(log_path)
+        if not os.path.isfile(output_path):
+            return False
+        with open(output_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("annotation_engine") == self.engine
+
+    def load_journal(self) -> dict:
+        """
+        Retourne les parties déjà annotées avec le même moteur : {(nom du log, n° de la partie dans le log) : annotations des coups}.
+        Une dernière ligne incomplète (interruption pendant l'écriture) est ignorée.
+        """
+        done = {}
+        if not os.path.isfile(self.journal_path):
+            return done
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry["engine"] == self.engine:
+                    done[(entry["log"], entry["game_index"])] = entry["annotations"]
+        return done
+
+    @staticmethod
+    def get_bot_names(log: dict) -> dict:
+        """
+        Retourne {symbole : nom du bot} : nom de la fonction de bot et profondeur de recherche, ou nom du joueur pour un humain.
+        """
+        return {
+            player["symbol"]: f"{player['move_fn_name']}@{log['max_depth']}" if player["is_bot"] else player["name"]
+            for player in log["players"]
+        }
+
+    def run(self) -> dict:
+        """
+        Annote tous les logs non encore annotés et retourne les statistiques de chaque bot (cf. BotAccuracy.to_dict),
+        calculées sur tous les logs du dossier (y compris ceux annotés lors d'exécutions précédentes).
+        """
+
+        os.makedirs(self.output_folder, exist_ok=True)
+        done = self.load_journal()
+        logs = {}                            # {nom du log : (chemin, log)} des logs à annoter
+        tasks = []
+        for log_path in self.get_log_paths():
+            if self.is_annotated(log_path):
+                continue
+            with open(log_path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+            name = os.path.basename(log_path)
+            logs[name] = (log_path, log)
+            symbols = [player["symbol"] for player in log["players"]]
+            for game_index, game in enumerate(log["games"]):
+                if (name, game_index) not in done:
+                    moves = [(event["player"], event["action"], event["state"]) for event in game["events"] if event["event"] == "move"]
+                    tasks.append((name, game_index, symbols, log["all_against_ref_player"], log["initial_state"], moves))
+
+        #logs dont toutes les parties sont déjà dans le journal (interruption avant l'écriture du log annoté)
+        for name in logs:
+            self.write_annotated_log(name, logs, done)
+
+        if tasks:
+            cache_path = None
+            if self.use_cache:
+                from search_cache import PersistentCache
+                cache_path = os.path.join(self.log_folder, "search_cache.bin")
+                PersistentCache.create(cache_path)           # avant les process : ils ne font qu'ouvrir le fichier (pas de course à la création)
+            initargs = (self.game_class, self.game_kwargs, self.max_depth, self.blunder_threshold, cache_path)
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=initargs) as executor, \
+                 open(self.journal_path, "a+", encoding="utf-8") as journal:
+                #ligne incomplète laissée par une interruption : les nouvelles lignes commencent à la ligne suivante
+                if journal.tell() > 0:
+                    journal.seek(journal.tell() - 1)
+                    if journal.read(1) != "\n":
+                        journal.write("\n")
+                in_flight = {executor.submit(_annotate_game, task): task[:2] for task in tasks}
+                while in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name, game_index = in_flight.pop(future)
+                        annotations = future.result()
+                        journal.write(json.dumps({"log": name, "game_index": game_index, "engine": self.engine, "annotations": annotations}) + "\n")
+                        journal.flush()
+                        done[(name, game_index)] = annotations
+                        self.write_annotated_log(name, logs, done)
+
+        return self.compute_stats()
+
+    def write_annotated_log(self, name: str, logs: dict, done: dict) -> None:
+        """
+        Ecrit le log annoté si toutes ses parties sont annotées (écriture dans un fichier temporaire puis renommage :
+        un log annoté présent est toujours complet).
+        """
+        log_path, log = logs[name]
+        if not all((name, game_index) in done for game_index in range(len(log["games"]))):
+            return
+        for game_index, game in enumerate(log["games"]):
+            move_events = [event for event in game["events"] if event["event"] == "move"]
+            for event, annotation in zip(move_events, done[(name, game_index)]):
+                event["annotation"] = annotation
+        log["annotation_engine"] = self.engine
+        output_path = self.get_output_path(log_path)
+        with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(log, f, indent=2)
+        os.replace(output_path + ".tmp", output_path)
+        print(f"📝 {name} annotated ({len(log['games'])} games)")
+
+    def compute_stats(self) -> dict:
+        """
+        Agrège les annotations de tous les logs annotés du dossier de sortie (même moteur) par bot.
+        """
+        self.accuracies = {}
+        for output_path in sorted(glob(os.path.join(self.output_folder, "*.json"))):
+            with open(output_path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+            if log.get("annotation_engine") != self.engine:
+                continue
+            bot_names = self.get_bot_names(log)
+            for game in log["games"]:
+                for event in game["events"]:
+                    if event["event"] == "move" and "annotation" in event:
+                        bot = bot_names[event["player"]]
+                        self.accuracies.setdefault(bot, BotAccuracy(bot)).add(event["annotation"])
+        return {bot: accuracy.to_dict() for bot, accuracy in self.accuracies.items()}
+
+    def print_stats(self) -> None:
+        for accuracy in sorted(self.accuracies.values(), key=lambda accuracy: accuracy.name):
+            stats = accuracy.to_dict()
+            print(f"{stats['bot']} : {stats['moves']} moves  accuracy {100 * stats['accuracy']:.1f} %  "
+                  f"mean loss {stats['mean_value_loss']}  blunders {stats['blunders']} ({100 * stats['blunder_rate']:.1f} %)")
+
+
+_worker = {}                                 # jeu, moteur et paramètres du process (cf. _init_worker)
+
+
+def _init_worker(game_class, game_kwargs, max_depth, blunder_threshold, cache_path) -> None:
+    """
+    Initialisation d'un process : paramètres de l'annotation (le jeu et le cache persistant sont ouverts au premier besoin).
+    """
+    _worker.update(game_class=game_class, game_kwargs=game_kwargs, max_depth=max_depth, blunder_threshold=blunder_threshold,
+                   cache_path=cache_path, games={})
+
+
+def _get_worker_game(symbols):
+    """
+    Retourne le jeu du process pour ces symboles de joueurs (créé au premier appel), sans livre d'ouvertures.
+    """
+    game = _worker["games"].get(tuple(symbols))
+    if game is None:
+        game = _worker["game_class"].create_headless(["random_move"] * len(symbols), symbols=symbols, **_worker["game_kwargs"])
+        game.opening_book = None                     # le moteur de référence doit évaluer toutes les positions
+        if _worker["cache_path"]:
+            from search_cache import PersistentCache
+            if "cache" not in _worker:
+                _worker["cache"] = PersistentCache.open(game, _worker["cache_path"])
+            game.minimax.cache = _worker["cache"]
+        _worker["games"][tuple(symbols)] = game
+    return game
+
+
+def _annotate_game(task) -> list:
+    """
+    Worker : rejoue une partie et retourne l'annotation de chacun de ses coups.
+    """
+
+    name, game_index, symbols, all_against_ref_player, initial_state_str, moves = task
+    game = _get_worker_game(symbols)
+    engine = game.minimax
+    max_depth, blunder_threshold = _worker["max_depth"], _worker["blunder_threshold"]
+    alphabeta = all_against_ref_player and len(symbols) == 2
+
+    state = game.initial_state
+    if game.state_to_str(state) != initial_state_str:
+        raise ValueError(f"{name}: the initial state of the log does not match {game.__class__.__name__} (check game_kwargs).")
+
+    game.notify_engines("on_new_game")
+    annotations = []
+    for ply, (symbol, action, state_str) in enumerate(moves):
+        player = game.get_player_by_symbol(symbol)
+        move = game.str_to_move(action)
+
+        if alphabeta:
+            best_move = engine.get_best_move_ab(state, player, player, True, max_depth)
+            best_value, nodes = engine.last_search["value"], engine.nodes
+            if move == best_move:
+                played_value = best_value
+            else:
+                next_state = game.apply_move(state, move, player)
+                played_value = engine.minimax_ab(next_state, game.get_next_player(player), player, 1, max_depth)
+                nodes = engine.nodes
+        else:
+            best_move = engine.get_best_move(state, player, player, False, max_depth)
+            best_value, nodes = engine.last_search["value"], engine.nodes
+            played_value = engine.last_search["move_values"][move]
+
+        value_loss = max(best_value - played_value, 0)
+        if blunder_threshold is None:
+            blunder = sign(played_value) < sign(best_value)
+        else:
+            blunder = value_loss >= blunder_threshold
+        annotations.append({
+            "best_move": game.move_to_str(best_move),
+            "best_value": best_value,
+            "played_value": played_value,
+            "value_loss": value_loss,
+            "blunder": blunder,
+            "nodes": nodes,
+        })
+
+        game.notify_engines("on_move_played", state, move, player)
+        state = game.apply_move(state, move, player)
+        if game.state_to_str(state) != state_str:
+            raise ValueError(f"{name}: game {game_index} diverges from the log at ply {ply + 1}.")
+    return annotations
+
+
+if __name__ == "__main__":
+    from tictactoe import TicTacToe
+    annotator = LogAnnotator(TicTacToe, blunder_threshold=10)
+    annotator.run()
+    annotator.print_stats()
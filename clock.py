@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Jun  8 10:02:48 2025
+
+@author: did
+
+Cadences de jeu façon échecs : une pendule par joueur (temps de base + incrément par coup).
+
+La boucle de jeu (Game.get_player_move) démarre la pendule du joueur qui doit jouer et l'arrête une fois le coup choisi.
+Avant chaque coup, TimeControl transforme le temps restant en une échéance (deadline, au sens de time.perf_counter)
+transmise à move_fn avec la pendule : move_fn(..., clock=clock, deadline=deadline).
+Un joueur dont le temps est écoulé perd la partie.
+
+Exemple :
+    my_game.start(log=True, time_control=TimeControl(base_time=60, increment=1))     # 1 min + 1 s par coup
+"""
+
+from time import perf_counter
+
+
+class Clock:
+    """
+    Pendule d'un joueur.
+
+    Paramètres :
+    - base_time : temps initial en secondes.
+    - increment : temps ajouté après chaque coup joué dans les temps, en secondes.
+    """
+
+    def __init__(self, base_time: float, increment: float = 0.0):
+        self.base_time = base_time
+        self.increment = increment
+        self.remaining = base_time           # temps restant en secondes
+        self.nb_moves = 0                    # nb de coups joués
+        self.last_elapsed = None             # durée du dernier coup en secondes
+        self._t_start = None
+
+    @property
+    def flagged(self) -> bool:
+        """
+        True si le temps du joueur est écoulé (la "chute du drapeau").
+        """
+        return self.remaining <= 0
+
+    def start(self) -> None:
+        """
+        Démarre la pendule au début de la réflexion du joueur.
+        """
+        self._t_start = perf_counter()
+
+    def stop(self) -> float:
+        """
+        Arrête la pendule une fois le coup choisi, décompte le temps écoulé (et ajoute l'incrément si le joueur est encore dans les temps).
+        Retourne le temps écoulé en secondes.
+        """
+        elapsed = perf_counter() - self._t_start
+        self._t_start = None
+        self.remaining -= elapsed
+        self.last_elapsed = elapsed
+        self.nb_moves += 1
+        if not self.flagged:
+            self.remaining += self.increment
+        return elapsed
+
+    def to_dict(self) -> dict:
+        """
+        Retourne l'état de la pendule, tel qu'il est enregistré dans les logs (en ms).
+        """
+        return {
+            "remaining_ms": int(1000 * self.remaining),
+            "elapsed_ms": None if self.last_elapsed is None else int(1000 * self.last_elapsed),
+            "increment_ms": int(1000 * self.increment),
+            "flagged": self.flagged
+        }
+
+
+class TimeControl:
+    """
+    Cadence de jeu et politique de répartition du temps entre les coups.
+
+    Paramètres :
+    - base_time : temps initial de chaque joueur en secondes.
+    - increment : incrément par coup en secondes.
+    - moves_to_go : nb de coups restants supposé pour répartir le temps restant.
+    - max_fraction : fraction maximale du temps restant accordée à un seul coup.
+    - safety_margin : temps en secondes gardé en réserve (latence de la boucle de jeu, dépassement de la recherche).
+
+    Le temps accordé à un coup est : temps restant / moves_to_go + incrément,
+    plafonné à max_fraction du temps restant diminué de safety_margin.
+    """
+
+    def __init__(self, base_time: float, increment: float = 0.0, moves_to_go: int = 20, max_fraction: float = 0.5, safety_margin: float = 0.05):
+        self.base_time = base_time
+        self.increment = increment
+        self.moves_to_go = moves_to_go
+        self.max_fraction = max_fraction
+        self.safety_margin = safety_margin
+
+    def create_clocks(self, players) -> dict:
+        """
+        Retourne une pendule neuve par joueur : {symbole : Clock}
+        """
+        return {player.symbol: Clock(self.base_time, self.increment) for player in players}
+
+    def get_move_time(self, clock: Clock) -> float:
+        """
+        Retourne le temps de réflexion (en secondes) accordé au prochain coup du joueur de cette pendule.
+        """
+        available = max(clock.remaining - self.safety_margin, 0)
+        budget = clock.remaining / self.moves_to_go + clock.increment
+        return min(budget, self.max_fraction * available)
+
+    def get_deadline(self, clock: Clock) -> float:
+        """
+        Retourne l'échéance du prochain coup (valeur de time.perf_counter à ne pas dépasser).
+        """
+        return perf_counter() + self.get_move_time(clock)
+
+    def to_dict(self) -> dict:
+        return {
+            "base_time_s": self.base_time,
+            "increment_s": self.increment,
+            "moves_to_go": self.moves_to_go,
+            "max_fraction": self.max_fraction,
+            "safety_margin_s": self.safety_margin
+        }
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Jun 13 10:14:36 2025
+
+@author: did
+
+Puissance 4 (Connect Four) : grille de 7 colonnes et 6 lignes, les pions tombent en bas de la colonne jouée,
+le premier joueur qui aligne 4 pions (ligne, colonne ou diagonale) gagne.
+
+Jeu de référence pour les moteurs : facteur de branchement 7 et parties de 42 coups, bien plus profondes que TicTacToe.
+
+Représentation en bitboards : chaque joueur a un entier dont chaque bit est une case de la grille.
+Les cases sont numérotées colonne par colonne, de bas en haut, avec un bit de garde en haut de chaque colonne :
+
+    5 12 19 26 33 40 47
+    4 11 18 25 32 39 46
+    3 10 17 24 31 38 45
+    2  9 16 23 30 37 44
+    1  8 15 22 29 36 43
+    0  7 14 21 28 35 42
+
+(bits 6, 13, 20... : gardes toujours vides, qui empêchent un alignement de passer d'une colonne à la suivante).
+Un alignement de 4 se détecte par décalages : b & (b >> d) & (b >> 2d) & (b >> 3d) pour d = 1 (vertical), 7 (horizontal), 6 et 8 (diagonales).
+
+Move est le numéro de colonne, de 0 (à gauche) à 6 (à droite).
+"""
+
+from game import Game, FastPathGame, Move
+from typing import List, Any
+
+WIDTH, HEIGHT = 7, 6
+STRIDE = HEIGHT + 1                          # nb de bits par colonne (6 cases + 1 bit de garde)
+DIRECTIONS = (1, STRIDE, STRIDE - 1, STRIDE + 1)     # vertical, horizontal, diagonale descendante, diagonale montante
+CENTER_FIRST = (3, 2, 4, 1, 5, 0, 6)         # ordre des coups : les colonnes centrales participent à plus d'alignements
+
+#alignements de 4 cases (masques de bits) : 69 fenêtres, utilisées par l'heuristique
+WINDOWS = [
+    sum(1 << ((col + i * d_col) * STRIDE + row + i * d_row) for i in range(4))
+    for col in range(WIDTH) for row in range(HEIGHT)
+    for d_col, d_row in ((0, 1), (1, 0), (1, 1), (1, -1))
+    if 0 <= col + 3 * d_col < WIDTH and 0 <= row + 3 * d_row < HEIGHT
+]
+CENTER_MASK = ((1 << HEIGHT) - 1) << (3 * STRIDE)
+
+#fast path : masques de la grille entière (sans les gardes), de la case du bas et de la case du haut de chaque colonne
+BOARD_BITS = WIDTH * STRIDE
+BOARD_MASK = sum(((1 << HEIGHT) - 1) << (col * STRIDE) for col in range(WIDTH))
+TOP_MASK = sum(1 << (col * STRIDE + HEIGHT - 1) for col in range(WIDTH))
+#masque des colonnes jouables selon les colonnes pleines (cases du haut occupées)
+LEGAL_BY_TOP = {
+    sum(1 << (col * STRIDE + HEIGHT - 1) for col in range(WIDTH) if full >> col & 1): ~full & ((1 << WIDTH) - 1)
+    for full in range(1 << WIDTH)
+}
+
+
+def has_four(board: int) -> bool:
+    """
+    Indique si le bitboard contient 4 pions alignés.
+    """
+    for direction in DIRECTIONS:
+        pairs = board & (board >> direction)
+        if pairs & (pairs >> 2 * direction):
+            return True
+    return False
+
+
+class ConnectFourState:
+    """
+    Etat compact et non modifiable d'une partie de Puissance 4 (apply_move crée un nouvel état en O(1), sans deepcopy).
+
+    Attributs :
+    - boards : (bitboard du 1er joueur, bitboard du 2nd joueur), le joueur au trait étant boards[nb_moves % 2].
+    - symbols : (symbole du 1er joueur, symbole du 2nd joueur), renseignés au premier coup de chacun.
+    - heights : hauteur de chaque colonne (nb de pions), donc ligne de la prochaine case libre.
+    - nb_moves : nb de pions joués.
+    - winner : symbole du vainqueur ou None.
+    """
+
+    __slots__ = ("boards", "symbols", "heights", "nb_moves", "winner")
+
+    def __init__(self, boards: tuple = (0, 0), symbols: tuple = (None, None), heights: tuple = (0,) * WIDTH, nb_moves: int = 0, winner: str = None):
+        self.boards = boards
+        self.symbols = symbols
+        self.heights = heights
+        self.nb_moves = nb_moves
+        self.winner = winner
+
+    def get_cell(self, col: int, row: int) -> str:
+        """
+        Retourne le symbole de la case (col, row), row = 0 étant la ligne du bas, ou ' ' si elle est vide.
+        """
+        bit = 1 << (col * STRIDE + row)
+        for board, symbol in zip(self.boards, self.symbols):
+            if board & bit:
+                return symbol
+        return ' '
+
+
+StateType = ConnectFourState
+
+
+class ConnectFour(Game, FastPathGame):
+
+    DEFAULT_SYMBOLS = ("X", "O")
+    DEFAULT_COLORS = ("yellow", "red")
+    ACTION_SIZE = WIDTH                   # nb de moves distincts (taille de la distribution de coups en self-play)
+    ASPIRATION_WINDOW = 10                # l'heuristique varie de 2 alignements de 3 pions (2 * 5) d'une itération à l'autre : à 5, les relances coûtent plus qu'elles n'économisent
+
+    def __init__(self, initial_state: StateType = None, all_against_ref_player = True, players_ui: bool = True):
+        super().__init__(initial_state if initial_state is not None else ConnectFourState(), all_against_ref_player)
+
+        #pre-start : création des 2 joueurs via UI sans demander le nb de joueurs et avec symboles par défaut
+        self.nb_players = 2
+        if players_ui:
+            for symbol, color in zip(self.DEFAULT_SYMBOLS, self.DEFAULT_COLORS):
+                self.managerUI.new_player(symbol = symbol, color = color)
+
+    def print_help(self):
+        print("How to play:")
+        print("- Choose a column by entering its number, from 0 (left) to 6 (right): your disc falls to the lowest free cell.")
+        print("- Align 4 discs in a row, a column or a diagonal to win.")
+        print("- Type '?' or 'help' to display these instructions again.")
+
+    def is_terminal(self, state: StateType) -> bool:
+        return state.winner is not None or state.nb_moves == WIDTH * HEIGHT
+
+    def get_winner_by_symbol(self, state: StateType) -> str | None:
+        return state.winner
+
+    def get_score_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        Victoire : 1000 - depth (une victoire rapide vaut plus), défaite : -(1000 - depth), match nul : 0.
+        """
+        if state.winner is None:
+            return 0
+        return 1000 - depth if state.winner == reference_player_symbol else -(1000 - depth)
+
+    def get_heuristic_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        Pour chaque alignement de 4 cases encore ouvert à un seul joueur : +1 s'il y a 2 pions, +5 s'il y en a 3
+        (signe selon le joueur), plus 2 par pion dans la colonne centrale.
+        Toujours inférieure en valeur absolue à une victoire (au plus 69 * 5 + 2 * 6 = 357).
+        """
+
+        side = 0 if state.symbols[0] in (reference_player_symbol, None) else 1      # symbols[0] est None tant que la grille est vide
+        mine, theirs = state.boards[side], state.boards[1 - side]
+        score = 2 * (bin(mine & CENTER_MASK).count("1") - bin(theirs & CENTER_MASK).count("1"))
+        for window in WINDOWS:
+            if window & theirs == 0:
+                score += (0, 0, 1, 5, 0)[bin(window & mine).count("1")]
+            elif window & mine == 0:
+                score -= (0, 0, 1, 5, 0)[bin(window & theirs).count("1")]
+        return score
+
+    def get_possible_moves(self, state: StateType) -> List[Move]:
+        heights = state.heights
+        return [col for col in CENTER_FIRST if heights[col] < HEIGHT]
+
+    def get_move_hints(self, state: StateType, moves: List[Move], player) -> dict:
+        """
+        2 pour un coup gagnant, 1 pour un coup qui bloque une victoire immédiate de l'adversaire.
+        """
+        side = state.nb_moves & 1
+        mine, theirs = state.boards[side], state.boards[1 - side]
+        hints = {}
+        for col in self.get_possible_moves(state):
+            bit = 1 << (col * STRIDE + state.heights[col])
+            if has_four(mine | bit):
+                hints[col] = 2
+            elif has_four(theirs | bit):
+                hints[col] = 1
+        return hints
+
+    def apply_move(self, state: StateType, move: Move, player) -> StateType:
+        """
+        Retourne le nouvel état en O(1) : un bit ajouté au bitboard du joueur, une hauteur de colonne incrémentée,
+        et la détection d'alignement limitée au bitboard du joueur qui vient de jouer.
+        """
+
+        side = state.nb_moves & 1
+        row = state.heights[move]
+        if row >= HEIGHT:
+            raise ValueError(f"Column {move} is full.")
+        board = state.boards[side] | 1 << (move * STRIDE + row)
+        boards = (board, state.boards[1]) if side == 0 else (state.boards[0], board)
+        symbols = state.symbols
+        if symbols[side] != player.symbol:
+            symbols = (player.symbol, symbols[1]) if side == 0 else (symbols[0], player.symbol)
+        heights = state.heights[:move] + (row + 1,) + state.heights[move + 1:]
+        winner = player.symbol if has_four(board) else None
+        return ConnectFourState(boards, symbols, heights, state.nb_moves + 1, winner)
+
+    #Fast path (cf. FastPathGame) : code = bitboard du 1er joueur de self.players | bitboard du 2nd << BOARD_BITS
+
+    def has_fast_path(self) -> bool:
+        cls = type(self)
+        return super().has_fast_path() and all(getattr(cls, name) is getattr(ConnectFour, name) for name in (
+            "is_terminal", "get_possible_moves", "apply_move", "get_score_by_symbol", "get_heuristic_by_symbol",
+            "get_proven_result", "early_pruning_hook"))
+
+    def encode_state(self, state: StateType) -> int:
+        symbols = [player.symbol for player in self.players]
+        code = 0
+        for board, symbol in zip(state.boards, state.symbols):
+            if board:
+                code |= board << (BOARD_BITS * symbols.index(symbol))
+        return code
+
+    def legal_moves_mask(self, code: int) -> int:
+        return LEGAL_BY_TOP[(code | code >> BOARD_BITS) & TOP_MASK]
+
+    def get_fast_move_order(self) -> tuple:
+        return CENTER_FIRST
+
+    def make_move(self, code: int, move: Move, side: int) -> int:
+        occupied = (code | code >> BOARD_BITS) & BOARD_MASK
+        bit = (occupied + (1 << move * STRIDE)) & (((1 << HEIGHT) - 1) << move * STRIDE)     # case libre la plus basse de la colonne
+        return code | bit << (BOARD_BITS * side)
+
+    def get_winner_index(self, code: int) -> int:
+        if has_four(code & BOARD_MASK):
+            return 0
+        if has_four(code >> BOARD_BITS):
+            return 1
+        return -1
+
+    def get_fast_score(self, code: int, reference_side: int, depth: int) -> int:
+        winner = self.get_winner_index(code)
+        if winner < 0:
+            return 0
+        return 1000 - depth if winner == reference_side else -(1000 - depth)
+
+    def get_fast_heuristic(self, code: int, reference_side: int, depth: int) -> int:
+        mine, theirs = code >> BOARD_BITS * reference_side & BOARD_MASK, code >> BOARD_BITS * (1 - reference_side) & BOARD_MASK
+        score = 2 * ((mine & CENTER_MASK).bit_count() - (theirs & CENTER_MASK).bit_count())
+        for window in WINDOWS:
+            if window & theirs == 0:
+                score += (0, 0, 1, 5, 0)[(window & mine).bit_count()]
+            elif window & mine == 0:
+                score -= (0, 0, 1, 5, 0)[(window & theirs).bit_count()]
+        return score
+
+    def str_to_move(self, move_str: str) -> Move:
+        move_str = move_str.strip()
+        if len(move_str) != 1 or move_str not in "0123456":
+            raise ValueError(f"'{move_str}' is not a valid column (expected 0 to 6).")
+        return int(move_str)
+
+    def state_to_str(self, state: StateType) -> str:
+        """
+        42 caractères : les 6 lignes de la grille, de haut en bas, de 7 cases chacune (' ' pour une case vide).
+        """
+        return "".join(state.get_cell(col, row) for row in reversed(range(HEIGHT)) for col in range(WIDTH))
+
+    def str_to_state(self, state_str: str) -> StateType:
+        """
+        Reconstruit l'état à partir des 42 caractères de state_to_str. Le joueur qui a le plus de pions a joué le premier ;
+        à égalité, c'est le premier des joueurs de la partie (ou des symboles par défaut).
+        """
+        if len(state_str) != WIDTH * HEIGHT:
+            raise ValueError(f"'{state_str}' is not a valid state (expected {WIDTH * HEIGHT} cells).")
+        player_symbols = [player.symbol for player in self.players] or list(self.DEFAULT_SYMBOLS)
+        found = set(state_str) - {' '}
+        symbols = [symbol for symbol in player_symbols if symbol in found] + sorted(found - set(player_symbols))
+        counts = [state_str.count(symbol) for symbol in symbols]
+        if len(symbols) == 2 and counts[1] > counts[0]:
+            symbols.reverse()
+            counts.reverse()
+        if len(symbols) > 2 or (len(symbols) == 2 and counts[0] - counts[1] > 1) or (len(symbols) == 1 and counts[0] > 1):
+            raise ValueError(f"'{state_str}' is not a valid state (the players must alternate).")
+        symbols += [None] * (2 - len(symbols))
+
+        boards, heights = [0, 0], []
+        for col in range(WIDTH):
+            column = [state_str[(HEIGHT - 1 - row) * WIDTH + col] for row in range(HEIGHT)]        # de bas en haut
+            height = HEIGHT - column.count(' ')
+            if ' ' in column[:height]:
+                raise ValueError(f"'{state_str}' is not a valid state (floating disc in column {col}).")
+            for row in range(height):
+                boards[symbols.index(column[row])] |= 1 << (col * STRIDE + row)
+            heights.append(height)
+        winners = [symbol for board, symbol in zip(boards, symbols) if has_four(board)]
+        return ConnectFourState(tuple(boards), tuple(symbols), tuple(heights), sum(heights), winners[0] if winners else None)
+
+    def state_to_tensor(self, state: StateType, player):
+        """
+        Encode l'état du point de vue de player en un tableau NumPy int8 de forme (3, 6, 7) (ligne du haut en premier) :
+        plan 0 = cases de player, plan 1 = cases de l'adversaire, plan 2 = cases vides.
+        """
+        import numpy as np                              # import local : NumPy n'est nécessaire que pour les réseaux de neurones
+
+        cells = np.array(list(self.state_to_str(state))).reshape(HEIGHT, WIDTH)
+        mine = cells == player.symbol
+        empty = cells == ' '
+        return np.stack([mine, ~mine & ~empty, empty]).astype(np.int8)
+
+    def print_state_from_str(self, state) -> None:
+        """
+        Affiche la grille à partir de state_to_str (ou d'une liste de 42 symboles déjà colorisés), numéros de colonnes en dessous.
+        """
+        for row in range(HEIGHT):
+            print("\t║ " + " ║ ".join(state[row * WIDTH + col] for col in range(WIDTH)) + " ║")
+        print("\t╚" + "╩".join(["═══"] * WIDTH) + "╝")
+        print("\t  " + "   ".join(str(col) for col in range(WIDTH)))
+
+    def print_colored_state(self, state: StateType, players: List[Any]):
+        colored_symbols = self.get_colored_symbols(players)
+        colored_cells = [colored_symbols.get(cell, cell) for cell in self.state_to_str(state)]
+        self.print_state_from_str(colored_cells)
+
+
+if __name__ == "__main__":
+    my_game = ConnectFour()
+    my_game.start(max_depth=6, log=True)
+    my_game.replay()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Jun 17 08:41:05 2025
+
+@author: did
+
+Moteur persistant piloté par un protocole texte, ligne par ligne (dans l'esprit d'UCI), sur stdin/stdout ou sur une socket Unix.
+
+Un bot lancé dans un nouveau process réimporte le framework et démarre avec des caches froids. Le démon garde au contraire
+un seul jeu et un seul moteur en mémoire d'une requête à l'autre : meilleurs coups conservés (Minimax.best_moves), killers
+et historique, table des nombres de preuve, cache persistant ouvert une fois pour toutes...
+Un orchestrateur (arène, tournoi, interface externe) peut ainsi réutiliser un moteur chaud par coeur.
+
+Commandes (une par ligne) et réponses :
+    isready                                        -> readyok
+    newgame                                        nouvelle partie : le moteur oublie ce qu'il conserve d'un coup à l'autre
+    position startpos [turn <symbole>] [moves <m1> <m2> ...]
+    position state "<state_to_str>" [turn <symbole>] [moves ...]
+                                                   position de la prochaine recherche : état initial du jeu ou état textuel
+                                                   (chaîne JSON, les états contenant des espaces), joueur au trait (par défaut
+                                                   le premier joueur) et coups joués depuis (format move_to_str)
+    go [depth <n>] [movetime <ms>] [infinite]      recherche en arrière-plan, puis :
+                                                   -> info [depth <n>] [value <v>] [result <r>] nodes <n> time <ms> [pv <m1> ...]
+                                                   -> bestmove <m>    (bestmove (none) si la position est terminale)
+    stop                                           arrête la recherche en cours (le meilleur coup déjà trouvé est donné)
+                                                   (newgame, position et go l'arrêtent aussi, comme un moteur UCI,
+                                                   sans quoi une recherche infinie bloquerait la lecture des commandes)
+    quit                                           arrête le démon (ou ferme la connexion sur une socket)
+Une commande invalide reçoit "error <message>".
+
+Si la nouvelle position prolonge la précédente (même état de départ et mêmes premiers coups), seuls les nouveaux coups
+sont notifiés au moteur (on_move_played) : son arbre avance au lieu d'être oublié.
+
+Exemple :
+    python engine_daemon.py tictactoe:TicTacToe --bot pvs_best_move
+    python engine_daemon.py connect_four:ConnectFour --depth 8 --socket /tmp/connect_four.sock --cache
+"""
+
+import os
+import sys
+import json
+import math
+import socket
+import argparse
+import importlib
+import threading
+from copy import deepcopy
+from time import perf_counter
+
+
+class EngineDaemon:
+    """
+    Session du protocole autour d'un jeu et de son moteur.
+
+    Paramètres :
+    - game_class : classe du jeu.
+    - bot_fn_name : nom de la fonction de bot_move_fns utilisée pour chercher (son moteur est celui du démon).
+    - max_depth : profondeur de go sans limite de profondeur explicite (None : pas de limite).
+    - cache : True pour ouvrir le cache persistant du jeu (search_cache.py), partagé avec les autres démons du même jeu.
+    - game_kwargs : paramètres passés au constructeur du jeu.
+    """
+
+    def __init__(self, game_class, bot_fn_name: str = "pvs_best_move", max_depth: int = None, cache: bool = False, game_kwargs: dict = None):
+        nb_players = len(game_class.DEFAULT_SYMBOLS) or 2
+        self.game = game_class.create_headless([bot_fn_name] * nb_players, **(game_kwargs or {}))
+        self.move_fn = self.game.players[0].move_fn
+        self.engine = getattr(self.move_fn, "__self__", None)
+        self.max_depth = max_depth
+        self.stop_event = threading.Event()
+        if hasattr(self.engine, "stop_event"):
+            self.engine.stop_event = self.stop_event
+        if cache and hasattr(self.engine, "cache"):
+            from search_cache import PersistentCache
+            self.engine.cache = PersistentCache.open(self.game)
+
+        self.output = sys.stdout
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self.position_key = None             # (état de départ, joueur au trait au départ, coups) de la position courante
+        self.state = deepcopy(self.game.initial_state)
+        self.player = self.game.players[0]
+
+    def send(self, text: str) -> None:
+        with self._output_lock:
+            self.output.write(text + "\n")
+            self.output.flush()
+
+    def run(self, input_stream=None, output_stream=None) -> None:
+        """
+        Traite les commandes de input_stream (par défaut stdin) jusqu'à quit ou la fin du flux.
+        """
+        self.output = output_stream or sys.stdout
+        for line in input_stream or sys.stdin:
+            if not self.execute(line):
+                break
+        self.stop_search()
+
+    def serve(self, path: str) -> None:
+        """
+        Ecoute sur la socket Unix path et sert les connexions l'une après l'autre, avec le même moteur (caches conservés).
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not available on this platform (use stdin/stdout).")
+        if os.path.exists(path):
+            os.remove(path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen()
+            while True:
+                connection, _ = server.accept()
+                with connection, connection.makefile("r", encoding="utf-8") as reader, connection.makefile("w", encoding="utf-8") as writer:
+                    self.run(reader, writer)
+
+    def execute(self, line: str) -> bool:
+        """
+        Exécute une commande. Retourne False pour quit.
+        """
+        command, _, arguments = line.strip().partition(" ")
+        try:
+            if command == "":
+                pass
+            elif command == "isready":
+                self.send("readyok")
+            elif command == "newgame":
+                self.stop_search()
+                self.position_key = None
+                self.state = deepcopy(self.game.initial_state)
+                self.player = self.game.players[0]
+                self.game.notify_engines("on_new_game")
+            elif command == "position":
+                self.stop_search()
+                self.set_position(arguments)
+            elif command == "go":
+                self.stop_search()
+                self.go(arguments.split())
+            elif command == "stop":
+                self.stop_search()
+            elif command == "quit":
+                return False
+            else:
+                raise ValueError(f"unknown command '{command}'")
+        except (ValueError, IndexError) as e:
+            self.send(f"error {e}")
+        return True
+
+    def set_position(self, arguments: str) -> None:
+        """
+        position startpos|state "<état>" [turn <symbole>] [moves ...]
+        """
+        game = self.game
+        if arguments.startswith("startpos"):
+            base, state = None, deepcopy(game.initial_state)
+            rest = arguments[len("startpos"):]
+        elif arguments.startswith("state"):
+            rest = arguments[len("state"):].lstrip()
+            try:
+                base, end = json.JSONDecoder().raw_decode(rest)
+            except json.JSONDecodeError:
+                raise ValueError("the state must be a JSON string, e.g. position state \"X   O    \"")
+            state, rest = game.str_to_state(base), rest[end:]
+        else:
+            raise ValueError("expected 'position startpos' or 'position state \"<state>\"'")
+
+        tokens = rest.split()
+        player = game.players[0]
+        if tokens[:1] == ["turn"]:
+            player = game.get_player_by_symbol(tokens[1])
+            if player is None:
+                raise ValueError(f"unknown player '{tokens[1]}'")
+            tokens = tokens[2:]
+        if tokens and tokens[0] != "moves":
+            raise ValueError(f"unexpected '{tokens[0]}'")
+        key = (base, player.symbol, tuple(tokens[1:]))
+
+        #tous les coups sont vérifiés avant toute notification : un coup illégal laisse le moteur et la position inchangés
+        played = []                          # (état, coup, joueur) de chaque coup
+        for move_str in key[2]:
+            move = game.str_to_move(move_str)
+            if game.is_terminal(state) or move not in game.get_possible_moves(state):
+                raise ValueError(f"illegal move '{move_str}'")
+            played.append((state, move, player))
+            state = game.apply_move(state, move, player)
+            player = game.get_next_player(player)
+
+        #la position prolonge-t-elle la précédente ? sinon, nouvelle partie pour le moteur
+        previous = self.position_key
+        extends = previous is not None and previous[:2] == key[:2] and previous[2] == key[2][:len(previous[2])]
+        if not extends:
+            game.notify_engines("on_new_game")
+        for move_args in played[len(previous[2]) if extends else 0:]:
+            game.notify_engines("on_move_played", *move_args)
+
+        self.position_key = key
+        self.state, self.player = state, player
+
+    def go(self, tokens: list) -> None:
+        """
+        go [depth <n>] [movetime <ms>] [infinite] : lance la recherche dans un thread (stop reste ainsi possible).
+        """
+        max_depth, deadline = self.max_depth, None
+        index = 0
+        while index < len(tokens):
+            if tokens[index] == "depth":
+                max_depth = int(tokens[index + 1])
+                index += 2
+            elif tokens[index] == "movetime":
+                deadline = perf_counter() + int(tokens[index + 1]) / 1000
+                index += 2
+            elif tokens[index] == "infinite":
+                max_depth = None
+                index += 1
+            else:
+                raise ValueError(f"unexpected '{tokens[index]}'")
+
+        if self.game.is_terminal(self.state):
+            self.send("bestmove (none)")
+            return
+        self.stop_event.clear()
+        self._search_thread = threading.Thread(target=self.search, args=(self.state, self.player, max_depth, deadline), daemon=True)
+        self._search_thread.start()
+
+    def search(self, state, player, max_depth, deadline) -> None:
+        game = self.game
+        start = perf_counter()
+        try:
+            move = self.move_fn(state=state, player=player, reference_player=player, all_against_ref_player=game.all_against_ref_player,
+                                max_depth=max_depth, deadline=deadline)
+        except Exception as e:                   # la session doit survivre à une erreur du moteur
+            self.send(f"error search failed: {e!r}")
+            return
+        search_info = getattr(self.engine, "last_search", None) or {}
+        info = ["info"]
+        for key in ("depth", "value", "result"):
+            if key in search_info:
+                if key == "value" and isinstance(search_info[key], float) and not math.isfinite(search_info[key]):
+                    continue                 # recherche arrêtée avant d'avoir évalué un coup : pas de valeur
+                info += [key, str(search_info[key])]
+        info += ["nodes", str(search_info.get("nodes", 0)), "time", str(int(1000 * (perf_counter() - start)))]
+        if search_info.get("pv"):
+            info += ["pv"] + [pv_move if isinstance(pv_move, str) else game.move_to_str(pv_move) for pv_move in search_info["pv"]]
+        self.send(" ".join(info))
+        self.send(f"bestmove {game.move_to_str(move)}")
+
+    def wait_search(self) -> None:
+        """
+        Attend la fin de la recherche en cours (et son bestmove).
+        """
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+    def stop_search(self) -> None:
+        """
+        Arrête la recherche en cours et attend son bestmove (appelé avant toute commande qui change la position ou relance
+        une recherche : les commandes sont lues sur le même thread et ne doivent jamais attendre une recherche infinie).
+        """
+        self.stop_event.set()
+        self.wait_search()
+
+
+def load_game_class(spec: str):
+    """
+    Retourne la classe de jeu désignée par "<module>:<Classe>" (ex : "tictactoe:TicTacToe").
+    """
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Persistent game engine speaking a line-based protocol.")
+    parser.add_argument("game", help="game class, as <module>:<Class> (e.g. tictactoe:TicTacToe)")
+    parser.add_argument("--bot", default="pvs_best_move", help="name of the bot function used to search")
+    parser.add_argument("--depth", type=int, default=None, help="default search depth of go")
+    parser.add_argument("--socket", default=None, help="serve on this Unix socket instead of stdin/stdout")
+    parser.add_argument("--cache", action="store_true", help="open the persistent search cache of the game")
+    args = parser.parse_args()
+
+    daemon = EngineDaemon(load_game_class(args.game), args.bot, args.depth, args.cache)
+    if args.socket:
+        daemon.serve(args.socket)
+    else:
+        daemon.run()
@@ -20,19 +20,125 @@ import datetime
 import os
 import json
 import random
+import hashlib
 from colorama import Fore, Style
-from player import PlayerManagerUI
+from player import PlayerManagerUI, Bot
 from minimax import Minimax
+from pondering import Ponderer
+from proof_number import ProofNumberSearch
+from mcts import MCTS
+from renderer import AnsiRenderer
 from tkinter import Tk, filedialog
 
 
 #NOTE: State a un type libre qui pourra être spécifié lors de la création d'une sous-classe
 StateType = TypeVar("StateType")
 
+#NOTE: Move est un entier compact utilisé en interne par Game et les moteurs (Minimax...).
+#      Sa forme textuelle (move_to_str / str_to_move) n'est utilisée qu'à la frontière UI et logs.
+Move = int
+
+#NOTE: résultat de get_proven_result pour un match nul certain (même clé que les nuls dans self.scores)
+PROVEN_DRAW = "draw"
+
+
+class FastPathGame(ABC):
+    """
+    Fast path optionnel des moteurs, auquel un jeu adhère en héritant de cette classe en plus de Game.
+
+    Les méthodes génériques (listes de coups, états copiés, scores par symbole) sont lentes dans les boucles internes des recherches.
+    Un jeu peut en plus exposer ses états sous forme d'entiers (bitboards...) :
+        - un état est un code entier (encode_state), les joueurs sont désignés par leur index dans self.players (side),
+        - les coups possibles forment un masque de bits (bit move à 1 si move est possible),
+        - jouer un coup est une opération sur l'entier (make_move),
+        - le vainqueur est un index (-1 : pas de vainqueur), scores, heuristique et résultats certains sont calculés sur le code.
+    Minimax, MCTS et perft le détectent par Game.has_fast_path et passent alors dans des boucles spécialisées ;
+    les autres jeux gardent les méthodes génériques.
+    Les valeurs du fast path doivent être celles des méthodes génériques (mêmes scores, même heuristique, mêmes résultats certains).
+    """
+    
+    @abstractmethod
+    def encode_state(self, state) -> int:
+        """
+        Retourne le code entier de l'état.
+        """
+        pass
+    
+    @abstractmethod
+    def legal_moves_mask(self, code: int) -> int:
+        """
+        Retourne le masque des coups possibles dans l'état code (bit move à 1 si move est possible, 0 si l'état est plein).
+        """
+        pass
+    
+    @abstractmethod
+    def make_move(self, code: int, move: Move, side: int) -> int:
+        """
+        Retourne le code de l'état après le coup move du joueur d'index side (sans vérifier qu'il est possible).
+        """
+        pass
+    
+    @abstractmethod
+    def get_winner_index(self, code: int) -> int:
+        """
+        Retourne l'index dans self.players du vainqueur de l'état code, ou -1 s'il n'y en a pas.
+        """
+        pass
+    
+    @abstractmethod
+    def get_fast_score(self, code: int, reference_side: int, depth: int) -> int:
+        """
+        Equivalent de get_score_by_symbol sur le code d'un état.
+        """
+        pass
+    
+    @abstractmethod
+    def get_fast_heuristic(self, code: int, reference_side: int, depth: int) -> int:
+        """
+        Equivalent de get_heuristic_by_symbol sur le code d'un état.
+        """
+        pass
+    
+    def get_fast_move_order(self) -> tuple:
+        """
+        Retourne tous les moves dans l'ordre où les boucles spécialisées les essaient (celui de get_possible_moves).
+        """
+        return tuple(range(self.ACTION_SIZE))
+    
+    def get_fast_hash(self, code: int, side: int) -> int:
+        """
+        Retourne un hash entier de l'état code et du joueur qui doit jouer (par défaut, le code lui-même : aucune collision).
+        """
+        return code << 1 | side
+    
+    def get_fast_proven_result(self, code: int) -> str | None:
+        """
+        Equivalent de get_proven_result sur le code d'un état (PROVEN_DRAW, index du vainqueur certain ou None).
+        """
+        return None
+    
+    def get_fast_proven_score(self, code: int, reference_side: int, depth: int, side: int = None) -> int | None:
+        """
+        Equivalent de get_proven_score sur le code d'un état (side : index du joueur qui doit jouer, s'il est connu).
+        """
+        if self.get_fast_proven_result(code) == PROVEN_DRAW:
+            return self.get_fast_score(code, reference_side, depth)
+        return None
+
 
 
 class Game(ABC, Generic[StateType]): #signifie que la classe Game est générique sur le type StateType
     
+    DEFAULT_SYMBOLS = ()                       # symboles des joueurs créés par défaut (utilisés par create_headless)
+    ACTION_SIZE = None                         # nb de moves distincts si les moves sont les entiers 0..ACTION_SIZE-1 (self-play, réseaux de neurones)
+    HEURISTIC_WEIGHTS = None                   # poids par défaut de l'heuristique et des scores {nom : poids}, None si le jeu n'est pas paramétré (cf. tuning.py)
+    HEURISTIC_FEATURES = ()                    # noms des poids qui multiplient les colonnes de get_heuristic_features (ajustement de Texel)
+    HEURISTIC_BOUNDS = {}                      # {nom : (min, max)} : bornes des poids pendant l'optimisation
+    USE_PROVEN_RESULTS = False                 # True : Minimax traite les états au résultat certain comme terminaux (get_proven_score),
+                                               # à n'activer que si le test coûte moins que les sous-arbres qu'il évite (cf. search_check.py)
+    ASPIRATION_WINDOW = None                   # demi-largeur de la fenêtre d'aspiration de Minimax.get_best_move_pvs, dans l'unité des scores du jeu
+                                               # (None : chaque itération en fenêtre complète)
+    
     def __init__(self, initial_state: StateType, all_against_ref_player: bool):
         """
         Initialise une nouvelle instance de jeu.
@@ -80,9 +186,27 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         self.bot_move_fns= {}                # Dictionnaire des functions utiles pour créer des bots {fn_name : fn}
         self.managerUI = PlayerManagerUI(self)     # Objet permettant le management des joueurs (création, modification, suppression...)
         self.minimax = Minimax(self)
-        
+        self.proof_number = ProofNumberSearch(self, node_budget=200_000)     # solveur df-pn (jeux à 2 joueurs), budget borné pour garder le bot réactif
+        self.mcts = MCTS(self)                 # recherche Monte-Carlo sur un graphe de positions (transpositions partagées)
+        self.opening_book = None               # OpeningBook optionnel (cf. opening_book.py), consulté par les moteurs avant toute recherche
+        self.profiler = None                   # MoveProfiler optionnel (cf. profiling.py), initialisé par start() ou run_headless()
+        self.time_control = None               # TimeControl optionnel (cf. clock.py), initialisé par start() ou run_headless()
+        self.clocks = None                     # pendules de la partie en cours {symbole : Clock} si time_control est défini
+        self.time_loser = None                 # joueur ayant perdu la partie en cours au temps
+        self.ponder = False                    # True : les bots Minimax réfléchissent pendant le temps de leur adversaire humain (cf. pondering.py)
+        self.ponderers = {}                    # {symbole du bot : Ponderer}, créés à la demande
+        self.renderer = AnsiRenderer()         # affichage des plateaux et messages de run_1_vs_1 (cf. renderer.py), initialisé par start()
+        self._colored_symbols = {}             # cache des symboles colorisés {couleurs des joueurs : {symbole : symbole colorisé}}
+        self.heuristic_weights = self.load_heuristic_weights()     # poids optimisés par tuning.py s'ils ont été sauvegardés, sinon HEURISTIC_WEIGHTS
+        self._weights_fingerprint = None       # (poids, empreinte) des derniers poids (cf. get_heuristic_weights_fingerprint)
+        self.player_heuristic_weights = {}     # {symbole : poids} des joueurs qui ont leurs propres poids (matchs entre poids, cf. tuning.py)
+
         #créé les 2 bots best et random et les ajoute à la liste de bots
         self.bot_move_fns["minimax_best_move"] = self.minimax.get_best_move  #ajoute best_move
+        self.bot_move_fns["alphabeta_best_move"] = self.minimax.get_best_move_ab  #ajoute best_move avec élagage alpha-beta
+        self.bot_move_fns["pvs_best_move"] = self.minimax.get_best_move_pvs  #ajoute best_move en PVS avec approfondissement itératif
+        self.bot_move_fns["proof_number_move"] = self.proof_number.get_best_move  #ajoute le solveur par nombres de preuve (df-pn)
+        self.bot_move_fns["mcts_move"] = self.mcts.get_best_move  #ajoute la recherche Monte-Carlo (graphe de positions)
         self.bot_move_fns["random_move"] = self.get_random_move  #ajoute random_bot
         
 
@@ -99,13 +223,17 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         ]
         return "\n".join(info)
     
-    def start(self, max_depth: int = None, log: bool = False, nb_players: int = None):
+    def start(self, max_depth: int = None, log: bool = False, nb_players: int = None, profiler=None, time_control=None, ponder: bool = False, renderer=None):
         """
         Fonction lancée juste après l'initialisation
         Permet de définir certains paramètres optionnels spécifiques à la partie :
             -max_depth
             -log
             -nb_players
+            -profiler : MoveProfiler (cf. profiling.py) pour profiler les coups des bots, écrit à côté du log par save_log
+            -time_control : TimeControl (cf. clock.py) pour jouer avec une pendule par joueur (un joueur dont le temps est écoulé perd)
+            -ponder : si True, les bots Minimax réfléchissent en arrière-plan pendant que leur adversaire humain joue (cf. pondering.py)
+            -renderer : AnsiRenderer (éventuellement throttled) ou NullRenderer (cf. renderer.py), par défaut AnsiRenderer()
         Permet de créer les players et executer run()
         Par défaut: 
             - affiche un message de bienvenue et le message issu de print_help
@@ -119,6 +247,10 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         
         self.max_depth = max_depth
         self.log = log
+        self.profiler = profiler
+        self.time_control = time_control
+        self.ponder = ponder
+        self.renderer = renderer if renderer is not None else AnsiRenderer()
         
         self.print_help()
         print("")
@@ -156,26 +288,72 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         #run !
         self.run()
     
+    @classmethod
+    def create_headless(cls, bot_fn_names: List[str], symbols: List[str] = None, **kwargs) -> "Game":
+        """
+        Crée une instance du jeu sans interface (ni fenêtre de création des joueurs, ni input), avec un bot par nom de bot_move_fns.
+        Utile pour les traitements batch : self-play, tournois, analyses...
+        
+        Paramètres :
+        - bot_fn_names : noms des fonctions de bot_move_fns utilisées par chaque joueur (dans l'ordre de jeu).
+        - symbols : symboles des joueurs (par défaut DEFAULT_SYMBOLS, sinon les symboles par défaut des bots).
+        - kwargs : paramètres passés au constructeur du jeu.
+        
+        NB : les sous-classes qui créent leurs joueurs dans __init__ doivent accepter le paramètre players_ui.
+        """
+        
+        game = cls(players_ui=False, **kwargs)
+        symbols = symbols or cls.DEFAULT_SYMBOLS or [None] * len(bot_fn_names)
+        for fn_name, symbol in zip(bot_fn_names, symbols):
+            bot = Bot(game, game.bot_move_fns[fn_name], name=f"{fn_name}_{symbol}" if symbol else None, symbol=symbol)
+            game.players.append(bot)
+        return game
+    
     @abstractmethod
     def state_to_str(self, state: StateType) -> str:
         """
         Retourne une représentation textuelle (string) de l'état du jeu donné.
         Cette méthode doit être implémentée par les sous-classes.
         """
+    
+    def str_to_state(self, state_str: str) -> StateType:
+        """
+        Retourne l'état correspondant à sa forme textuelle (celle de state_to_str), par exemple pour le protocole de engine_daemon.py.
+        Lève une ValueError si le texte ne correspond à aucun état.
+        A implémenter par les sous-classes qui veulent être pilotées à partir de positions textuelles.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement str_to_state.")
+    
+    def state_to_tensor(self, state: StateType, player):
+        """
+        Encode l'état du point de vue de player en un tableau NumPy de forme fixe (entrée des réseaux de neurones).
+        A implémenter par les sous-classes qui veulent produire des données d'entraînement (cf. selfplay.py).
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement state_to_tensor.")
         
     def symbol_to_colored_symbol(self, symbol: str, players: List[Any]) -> str:
         """ 
         Retourne le symbole colorisé du symbole selon les couleurs définies dans players
         Peut être utilisé pour définir print_colored_state
         """
-        sym_to_pla = {player.symbol : player for player in players}
-        
-        player = sym_to_pla.get(symbol, None)
-        
-        try:
-            return self.get_colored_symbol(player)
-        except:
-            return symbol
+        return self.get_colored_symbols(players).get(symbol, symbol)
+    
+    def get_colored_symbols(self, players: List[Any]) -> dict:
+        """
+        Retourne {symbole : symbole colorisé} des joueurs, calculé une seule fois par jeu de symboles et de couleurs.
+        A utiliser dans print_colored_state pour coloriser toutes les cases d'un plateau sans recalculer les codes ANSI.
+        """
+        key = tuple((player.symbol, player.color) for player in players)
+        colored_symbols = self._colored_symbols.get(key)
+        if colored_symbols is None:
+            colored_symbols = {}
+            for player in players:
+                try:
+                    colored_symbols[player.symbol] = self.get_colored_symbol(player)
+                except:
+                    colored_symbols[player.symbol] = player.symbol
+            self._colored_symbols[key] = colored_symbols
+        return colored_symbols
         
     def get_colored_symbol(self, player) -> str:
         """
@@ -278,17 +456,31 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         
 
     @abstractmethod
-    def get_possible_moves(self, state: StateType) -> List[str]:
+    def get_possible_moves(self, state: StateType) -> List[Move]:
         """
-        Retourne la liste des mouvements possibles dans l'état donné.
+        Retourne la liste des mouvements possibles (entiers) dans l'état donné.
         """
         
 
     @abstractmethod
-    def apply_move(self, state: StateType, move: str, player: str)-> StateType:
+    def apply_move(self, state: StateType, move: Move, player: str)-> StateType:
         """
         Applique le mouvement du joueur sur l'état du jeu et retourne le nouvel état.
         """
+
+    def move_to_str(self, move: Move) -> str:
+        """
+        Retourne la forme textuelle d'un move (affichage, logs).
+        Par défaut, l'entier lui-même. A surcharger si le jeu utilise une autre notation.
+        """
+        return str(move)
+
+    def str_to_move(self, move_str: str) -> Move:
+        """
+        Retourne le move correspondant à sa forme textuelle (saisie utilisateur, logs).
+        Lève une ValueError si le texte ne correspond à aucun move.
+        """
+        return int(move_str)
         
     
     def get_next_player(self, player):
@@ -321,7 +513,23 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         """
         symbol_to_player = {player.symbol : player for player in self.players}
         return symbol_to_player.get(symbol)
-    
+
+    def get_state_hash(self, state: StateType, player_symbol: str = None) -> int:
+        """
+        Retourne un hash entier sur 64 bits de l'état (combiné au symbole du joueur qui doit jouer si précisé).
+        Contrairement à hash(), ce hash est stable d'un process à l'autre : il peut donc servir de clé dans un fichier
+        (livre d'ouvertures, cache...).
+        Par défaut, il est calculé à partir de state_to_str. Peut être surchargé si le jeu dispose d'un encodage plus rapide.
+        """
+        return self.get_state_hash_from_str(self.state_to_str(state), player_symbol)
+
+    def get_state_hash_from_str(self, state_str: str, player_symbol: str = None) -> int:
+        """
+        Retourne le hash stable d'un état donné sous sa forme textuelle (celle de state_to_str, utilisée dans les logs).
+        """
+        text = state_str if player_symbol is None else f"{state_str}|{player_symbol}"
+        return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
     def early_pruning_hook(self, state, depth, value, max_depth=None, reference_player=None) -> bool:
         """
         Hook d’élagage précoce (early pruning) à surcharger si besoin selon la logique propre à chaque jeu.
@@ -351,7 +559,106 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         """
         return False
     
-    def get_random_move(self, state, **kwargs) -> str:
+    def get_move_hints(self, state, moves, player) -> dict:
+        """
+        Hook optionnel d'indices tactiques utilisés par MoveOrdering pour trier les coups (cf. move_ordering.py).
+        
+        Retourne un dictionnaire {move : priorité} pour les coups que le jeu sait reconnaître à moindre coût
+        (par exemple 2 pour un coup gagnant, 1 pour un coup qui bloque une victoire adverse).
+        Les coups absents du dictionnaire n'ont pas de priorité particulière.
+        Par défaut, aucun indice n'est fourni.
+        """
+        return {}
+    
+    def get_proven_result(self, state: StateType) -> str | None:
+        """
+        Hook optionnel de détection des résultats certains d'un état non terminal, sans recherche
+        (par exemple une position morte, où plus aucun alignement n'est possible : le match nul est certain).
+        
+        Retourne PROVEN_DRAW ("draw") pour un match nul certain, le symbole du vainqueur pour une victoire certaine,
+        ou None si le résultat n'est pas connu (par défaut).
+        Utilisé par Minimax (via get_proven_score) et ProofNumberSearch pour traiter ces états comme terminaux.
+        """
+        return None
+    
+    def get_proven_score(self, state: StateType, reference_player_symbol: str, depth: int, player_symbol: str = None) -> int | None:
+        """
+        Retourne le score d'un état non terminal dont le résultat est certain (cf. get_proven_result), ou None.
+        Ce score doit être celui qu'atteindrait une recherche complète depuis l'état, les adversaires jouant contre le joueur de référence
+        (player_symbol : joueur qui doit jouer, s'il est connu). Minimax ne l'utilise donc pas en mode selfish.
+        Par défaut, un match nul certain est évalué par get_score_by_symbol sur l'état courant : ce n'est juste que si le score d'un nul
+        ne dépend pas de la fin de la partie (0 par exemple). Les jeux dont le score de nul dépend des coups restants (cases occupées...)
+        doivent surcharger cette méthode, ou retourner None pour ne pas couper la recherche.
+        Le score d'une victoire certaine dépend du jeu (profondeur de la victoire) : les jeux qui en détectent doivent surcharger cette méthode.
+        """
+        if self.get_proven_result(state) == PROVEN_DRAW:
+            return self.get_score_by_symbol(state, reference_player_symbol, depth)
+        return None
+    
+    #Poids de l'heuristique : un jeu paramétré (HEURISTIC_WEIGHTS) calcule son heuristique et ses scores avec self.heuristic_weights.
+    #tuning.py les optimise et les sauvegarde dans game_logs/<NomClasse>/heuristic_weights.json, chargé à la création du jeu.
+    
+    def get_heuristic_weights_path(self) -> str:
+        return os.path.join("game_logs", self.__class__.__name__, "heuristic_weights.json")
+    
+    def load_heuristic_weights(self, path: str = None) -> dict | None:
+        """
+        Retourne les poids par défaut du jeu (HEURISTIC_WEIGHTS), remplacés par ceux du fichier path
+        (par défaut get_heuristic_weights_path) s'il existe. Les noms de poids inconnus du jeu sont ignorés.
+        """
+        if self.HEURISTIC_WEIGHTS is None:
+            return None
+        weights = dict(self.HEURISTIC_WEIGHTS)
+        path = path or self.get_heuristic_weights_path()
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)["weights"]
+            weights.update({name: value for name, value in saved.items() if name in weights})
+        return weights
+    
+    def save_heuristic_weights(self, weights: dict, path: str = None, infos: dict = None) -> str:
+        """
+        Sauvegarde les poids (et des infos sur leur optimisation) dans path (par défaut get_heuristic_weights_path),
+        en passant par un fichier temporaire, et retourne le chemin du fichier.
+        """
+        path = path or self.get_heuristic_weights_path()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"game_class": self.__class__.__name__, "weights": weights, **(infos or {})}, f, indent=2)
+        os.replace(path + ".tmp", path)
+        return path
+    
+    def get_heuristic_weights_fingerprint(self) -> int:
+        """
+        Retourne une empreinte stable sur 64 bits des poids courants (self.heuristic_weights), 0 pour un jeu non paramétré.
+        Les valeurs conservées hors de la recherche (cache persistant, livre d'ouvertures) en dépendent : elles sont associées
+        à l'empreinte des poids avec lesquels elles ont été calculées. L'empreinte est recalculée seulement si les poids changent.
+        """
+        weights = self.heuristic_weights
+        if weights is None:
+            return 0
+        cached = self._weights_fingerprint
+        if cached is None or cached[0] != weights:
+            text = json.dumps(weights, sort_keys=True)
+            cached = (dict(weights), int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little"))
+            self._weights_fingerprint = cached
+        return cached[1]
+    
+    def get_heuristic_features(self, states: list, reference_player_symbols: list):
+        """
+        Retourne le tableau NumPy (nb d'états, len(HEURISTIC_FEATURES)) des features de l'heuristique de chaque état
+        du point de vue du joueur de référence correspondant : l'heuristique vaut features @ poids de HEURISTIC_FEATURES.
+        A implémenter par les jeux dont l'heuristique est linéaire en ses poids (ajustement de Texel, cf. tuning.py) ; None par défaut.
+        """
+        return None
+    
+    def has_fast_path(self) -> bool:
+        """
+        Indique si le jeu implémente le fast path (cf. FastPathGame). Seuls les jeux à 2 joueurs sont concernés.
+        """
+        return isinstance(self, FastPathGame)
+    
+    def get_random_move(self, state, **kwargs) -> Move:
         """ 
         Retourne un move choisi au hasard parmi les moves possibles
         **kwargs permet de le rendre compatible avec best_move
@@ -360,7 +667,7 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         moves = self.get_possible_moves(state)
         return random.choice(moves)
     
-    def get_human_move(self, state, player, **kwargs) -> str:
+    def get_human_move(self, state, player, **kwargs) -> Move:
         """
         Demande le move du joueur en cours via input, vérifie et retourne le move
         **kwargs permet de le rendre compatible avec best_move
@@ -369,22 +676,143 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         
         current_colored_symbol = self.get_colored_symbol(player)
         
-        move = input(f"{player.name} : {current_colored_symbol} – Your turn ! Move or '?' for help ➤ ")
+        move_str = input(f"{player.name} : {current_colored_symbol} – Your turn ! Move or '?' for help ➤ ")
         
         moves = self.get_possible_moves(state)
             
-        if move == "?" or move == "help":
+        if move_str == "?" or move_str == "help":
             print("")
             self.print_help()
             print("")
             return self.get_human_move(state, player)
+        
+        try:
+            move = self.str_to_move(move_str)
+        except ValueError:
+            move = None
             
-        elif move not in moves:
-            print(f"'{move}' is not a valid move! Choose among: {', '.join(moves)}")
+        if move not in moves:
+            print(f"'{move_str}' is not a valid move! Choose among: {', '.join(self.move_to_str(move) for move in moves)}")
             return self.get_human_move(state, player)
         else:
             return move
     
+    def reset_clocks(self) -> None:
+        """
+        Remet les pendules à zéro au début d'une partie (si une cadence time_control est définie).
+        """
+        self.clocks = self.time_control.create_clocks(self.players) if self.time_control else None
+        self.time_loser = None
+    
+    def get_ponderer(self, player):
+        """
+        Retourne le Ponderer du joueur (créé à la demande) si le mode ponder est activé et que player est un bot Minimax, sinon None.
+        """
+        if not self.ponder or not player.is_bot or not Ponderer.can_ponder(player.move_fn):
+            return None
+        if player.symbol not in self.ponderers:
+            self.ponderers[player.symbol] = Ponderer(self, player.move_fn)
+        return self.ponderers[player.symbol]
+    
+    def notify_engines(self, event: str, *args) -> None:
+        """
+        Appelle la méthode event (on_new_game, on_move_played...) de chaque moteur des joueurs qui la définit,
+        une seule fois par moteur (deux bots peuvent partager le même moteur).
+        Permet aux moteurs de conserver leur arbre ou leurs statistiques d'un coup à l'autre au sein d'une partie.
+        """
+        notified = set()
+        for engine in [getattr(player.move_fn, "__self__", None) for player in self.players]:
+            if engine is None or engine is self or id(engine) in notified:
+                continue
+            notified.add(id(engine))
+            callback = getattr(engine, event, None)
+            if callback is not None:
+                callback(*args)
+    
+    def stop_pondering(self) -> None:
+        """
+        Arrête toutes les réflexions en arrière-plan (fin de partie).
+        """
+        for ponderer in self.ponderers.values():
+            ponderer.stop()
+    
+    def get_player_move(self, player) -> tuple:
+        """
+        Demande son move à player (via player.move_fn) dans l'état courant.
+        Si self.profiler est défini, le coup d'un bot est éventuellement profilé.
+        Si une cadence est définie, la pendule du joueur tourne pendant sa réflexion et move_fn reçoit en plus
+        clock (sa pendule) et deadline (l'échéance du coup selon time_control, au sens de time.perf_counter).
+        Si le temps du joueur est écoulé, self.time_loser est mis à jour : le move ne doit pas être joué.
+        En mode ponder, le coup d'un bot est repris de sa réflexion sur le temps de l'adversaire si elle a déjà analysé la position,
+        et une nouvelle réflexion est lancée après son coup si l'adversaire est humain.
+        
+        Retourne (move, infos) où infos est un dictionnaire d'informations à ajouter à l'événement move du log
+        (dont 'search' : infos de recherche du moteur, algorithme, pv, nodes, memory..., si move_fn en fournit,
+        et 'clock' : état de la pendule du joueur après le coup).
+        """
+        
+        #attention à la signature des fonctions passés à player.move_fn car elles doivent être compatibles avec les kwargs ci-dessous
+        kwargs = dict(state = self.state, player= player, reference_player= player, all_against_ref_player= self.all_against_ref_player, max_depth=self.max_depth)
+        infos = {}
+        if player.symbol in self.player_heuristic_weights:
+            self.heuristic_weights = self.player_heuristic_weights[player.symbol]      # les joueurs partagent le jeu et son moteur
+        
+        clock = self.clocks[player.symbol] if self.clocks else None
+        if clock:
+            kwargs["clock"] = clock
+            kwargs["deadline"] = self.time_control.get_deadline(clock)
+            clock.start()
+        
+        ponderer = self.get_ponderer(player)
+        ponder_hit = None
+        if ponderer:
+            ponderer.stop()
+            ponder_hit = ponderer.get_move(self.state, player)
+        
+        if ponder_hit:
+            move, search_info = ponder_hit
+            search_info = {**search_info, "ponder_hit": True}
+        elif self.profiler and player.is_bot:
+            move, profiled = self.profiler.profile_move(player.move_fn, self.game_number, player.symbol, **kwargs)
+            if profiled: infos["profiled"] = True
+            search_info = getattr(getattr(player.move_fn, "__self__", None), "last_search", None)
+        else:
+            move = player.move_fn(**kwargs)
+            search_info = getattr(getattr(player.move_fn, "__self__", None), "last_search", None)
+        
+        if clock:
+            clock.stop()
+            infos["clock"] = clock.to_dict()
+            if clock.flagged:
+                self.time_loser = player
+        
+        #réflexion sur le temps de l'adversaire (seulement s'il est humain : un bot adverse serait ralenti par le GIL)
+        if ponderer and self.time_loser is None:
+            next_state = self.apply_move(self.state, move, player)
+            opponent = self.get_next_player(player)
+            if not self.is_terminal(next_state) and not opponent.is_bot and self.get_next_player(opponent) == player:
+                pv = (search_info or {}).get("pv") or []
+                ponderer.start(next_state, opponent, player, self.all_against_ref_player, self.max_depth, expected_reply=pv[1] if len(pv) > 1 else None)
+        
+        if search_info:
+            infos["search"] = dict(search_info)
+            if "pv" in search_info:
+                infos["search"]["pv"] = [self.move_to_str(pv_move) for pv_move in search_info["pv"]]
+            if "move_values" in search_info:
+                infos["search"]["move_values"] = {self.move_to_str(root_move): value for root_move, value in search_info["move_values"].items()}
+        
+        return move, infos
+    
+    def get_game_winner_symbol(self) -> str | None:
+        """
+        Retourne le symbole du vainqueur de la partie en cours : le vainqueur de l'état final,
+        ou l'adversaire du joueur ayant perdu au temps (parties à 2 joueurs).
+        """
+        if self.time_loser is not None:
+            opponents = [player for player in self.players if player.in_game and player != self.time_loser]
+            return opponents[0].symbol if len(opponents) == 1 else None
+        return self.get_winner_by_symbol(self.state)
+    
     def run(self, max_depth: int = None):
         if len(self.players)==1: 
             self.run_solo(max_depth)
@@ -395,6 +823,88 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         else:
             self.run_multi(max_depth)
     
+    def run_headless(self, nb_games: int = 1, max_depth: int = None, profiler=None, time_control=None, opening_plies: int = 0) -> List[str | None]:
+        """
+        Joue nb_games parties entre les joueurs (des bots) sans affichage ni input, en alternant le joueur qui commence.
+        Les scores sont mis à jour et, si self.log est activé, les parties sont ajoutées à self.games (même format que run_1_vs_1).
+        Si profiler est précisé, il remplace self.profiler (les profils s'accumulent d'un appel à l'autre avec le même profiler).
+        Si time_control est précisé, il remplace self.time_control : chaque partie se joue à la pendule.
+        Les opening_plies premiers coups de chaque partie sont joués au hasard (diversité des parties entre bots déterministes) :
+        ils sont notifiés aux moteurs comme les autres coups et marqués "opening" dans le log, hors pendule.
+        
+        Retourne la liste des symboles des vainqueurs (None pour un match nul).
+        """
+        
+        self.max_depth = max_depth
+        if profiler is not None:
+            self.profiler = profiler
+        if time_control is not None:
+            self.time_control = time_control
+        if self.starting_player is None:
+            self.starting_player = self.players[0]
+        
+        winners = []
+        for _ in range(nb_games):
+            self.state = deepcopy(self.initial_state)
+            self.current_player = self.starting_player
+            self.reset_clocks()
+            self.notify_engines("on_new_game")
+            if self.log:
+                start_time = datetime.datetime.now()
+                self.game = [{"event": "start", "datetime": start_time.isoformat(timespec='milliseconds')}]
+            
+            ply = 0
+            while not self.is_terminal(self.state):
+                if self.log: t_start = time()
+                if ply < opening_plies:
+                    move, infos = random.choice(self.get_possible_moves(self.state)), {"opening": True}
+                else:
+                    move, infos = self.get_player_move(self.current_player)
+                if self.time_loser is not None:
+                    break                                               # temps écoulé : le coup n'est pas joué
+                ply += 1
+                self.notify_engines("on_move_played", self.state, move, self.current_player)
+                self.state = self.apply_move(self.state, move, self.current_player)
+                if self.log:
+                    self.game.append({
+                        "event": "move",
+                        "player": self.current_player.symbol,
+                        "action": self.move_to_str(move),
+                        "state": self.state_to_str(self.state),
+                        "duration_ms": int(1000 * (time() - t_start)),
+                        **infos
+                    })
+                self.current_player = self.get_next_player(self.current_player)
+            
+            self.stop_pondering()
+            winner_symbol = self.get_game_winner_symbol()
+            score_key = winner_symbol if winner_symbol else "draw"
+            self.scores[score_key] = self.scores.get(score_key, 0) + 1
+            winners.append(winner_symbol)
+            
+            if self.log:
+                end_time = datetime.datetime.now()
+                self.game.append({
+                    "event": "end",
+                    "winner": winner_symbol,
+                    "status": "win" if winner_symbol else "draw",
+                    "datetime": end_time.isoformat(timespec='milliseconds'),
+                    **self.get_time_end_infos()
+                })
+                self.games.append({
+                    "game_number": self.game_number,
+                    "starting_player": self.starting_player.symbol,
+                    "duration_ms": int((end_time - start_time).total_seconds() * 1000),
+                    "score": self.scores.copy(),
+                    "events": self.game
+                })
+                self.game = []
+            
+            self.starting_player = self.get_next_player(self.starting_player)
+            self.game_number += 1
+        
+        return winners
+    
     def run_1_vs_1(self, max_depth: int = None):
         
         """
@@ -412,40 +922,51 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
             
             if self.log: t_start = time()
             
-            #get move (attention à la signature des fonctions passés à player.move_fn car elles doivent être compatibles avec les kwargs ci-dessous
-            move = self.current_player.move_fn(state = self.state, player= self.current_player, reference_player= self.current_player, all_against_ref_player= self.all_against_ref_player, max_depth=self.max_depth)
+            #get move
+            move, infos = self.get_player_move(self.current_player)
+            
+            #temps écoulé : le joueur perd et son coup n'est pas joué
+            if self.time_loser is not None:
+                self.renderer.message(f"{self.get_colored_name(self.current_player)} ran out of time !")
+                return
             
             #Affiche le bot si move
-            if self.current_player.is_bot: print(self.get_colored_name(self.current_player), "plays", move)
+            if self.current_player.is_bot: self.renderer.message(f"{self.get_colored_name(self.current_player)} plays {self.move_to_str(move)}")
 
             
             
             
-            #apply move
+            #apply move (et notification des moteurs, qui peuvent avancer la racine de leur arbre)
+            self.notify_engines("on_move_played", self.state, move, self.current_player)
             self.state = self.apply_move(self.state, move, self.current_player)
-            self.print_colored_state(self.state, self.players)
+            #affichage forcé (même en mode throttled) en fin de partie et avant le tour d'un humain
+            force = self.is_terminal(self.state) or not self.get_next_player(self.current_player).is_bot
+            self.renderer.draw(self, self.state, self.players, force=force)
             #log move
             if self.log:
                 duration = int(1000 * (time() - t_start))
-                self.game.append({
+                event = {
                 "event": "move",
                 "player": self.current_player.symbol,
-                "action": move,
+                "action": self.move_to_str(move),
                 "state": self.state_to_str(self.state),
-                "duration_ms": duration
-            })
+                "duration_ms": duration,
+                **infos
+                }
+                self.game.append(event)
             #next player to current
             self.current_player = self.get_next_player(self.current_player)
         
     
         def handle_end_of_game(start_time):
-            winner_symbol = self.get_winner_by_symbol(self.state)
+            self.stop_pondering()
+            winner_symbol = self.get_game_winner_symbol()
             if winner_symbol:
                 winner = self.get_player_by_symbol(winner_symbol)
-                print(f"{self.get_colored_name(winner)} wins !")
+                self.renderer.message(f"{self.get_colored_name(winner)} wins !")
                 self.scores[winner_symbol] = self.scores.get(winner_symbol, 0) + 1
             else:
-                print("It's a draw !")
+                self.renderer.message("It's a draw !")
                 self.scores["draw"] = self.scores.get("draw", 0) + 1
                 
                  
@@ -457,7 +978,8 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
                     "event": "end",
                     "winner": winner_symbol,
                     "status": "win" if winner_symbol else "draw",
-                    "datetime": end_time.isoformat(timespec='milliseconds')
+                    "datetime": end_time.isoformat(timespec='milliseconds'),
+                    **self.get_time_end_infos()
                 })
                 #ajoute game dans games
                 self.games.append({
@@ -471,12 +993,13 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
                 self.game = []
     
             #print scores
-            print("\nScore :")
+            self.renderer.message("\nScore :")
             for player in self.players:
-                print(f"\t{self.get_colored_name(player)} : {self.scores.get(player.symbol, 0)}")
+                self.renderer.message(f"\t{self.get_colored_name(player)} : {self.scores.get(player.symbol, 0)}")
             
             if self.scores.get('draw',0) != 0:
-                print(f"\tdraws : {self.scores.get('draw',0)}")   #et on termine par draws si il y en a
+                self.renderer.message(f"\tdraws : {self.scores.get('draw',0)}")   #et on termine par draws si il y en a
+            self.renderer.flush()
         
         
         
@@ -485,6 +1008,8 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         
         while True:   #boucle infinie sur les nouvelles parties (tant que l'utilisateur ne quitte pas)
             
+            self.reset_clocks()
+            self.notify_engines("on_new_game")
             start_time=None
             #log l'event start
             if self.log:
@@ -495,12 +1020,12 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
                 })
             
             #print le début de partie
-            print("Game", self.game_number)
-            print(f"{self.current_player.name} : {self.get_colored_symbol(self.current_player)} starts")
-            self.print_colored_state(self.state, self.players)
+            self.renderer.message(f"Game {self.game_number}")
+            self.renderer.message(f"{self.current_player.name} : {self.get_colored_symbol(self.current_player)} starts")
+            self.renderer.draw(self, self.state, self.players, force=True)
             
-            #boucle sur chaque tour d'une partie jusqu'à un état terminal
-            while not self.is_terminal(self.state): 
+            #boucle sur chaque tour d'une partie jusqu'à un état terminal (ou la perte au temps d'un joueur)
+            while not self.is_terminal(self.state) and self.time_loser is None: 
                 play_turn()
                
             #atteinte de l'état terminal => fonction dédiée   
@@ -530,6 +1055,18 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
                 print("\nGood bye !")
                 return
     
+    def get_time_end_infos(self) -> dict:
+        """
+        Retourne les infos de pendule à ajouter à l'événement end du log (vide si la partie n'est pas jouée à la pendule).
+        """
+        if not self.clocks:
+            return {}
+        infos = {"clocks": {symbol: clock.to_dict() for symbol, clock in self.clocks.items()}}
+        if self.time_loser is not None:
+            infos["reason"] = "time"
+            infos["time_loser"] = self.time_loser.symbol
+        return infos
+    
     def get_final_winner_symbols(self)-> str:
         """
         Retourne le symbole du joueur ayant le score le + plus élevé
@@ -546,10 +1083,12 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
     
         return " & ".join(sorted(winners_symbols)) # Si plusieurs gagnants, on les joint avec " & "               
     
-    def save_log(self, max_depth, final_winner):
+    def save_log(self, max_depth, final_winner) -> str:
         """
-        Sauvegarde les données de la session dans un fichier JSON.
+        Sauvegarde les données de la session dans un fichier JSON et retourne son chemin.
         Le fichier est nommé selon le nom de la classe et l’horodatage de fin de partie.
+        Si un profiler est actif, les profils agrégés sont écrits à côté (<log>.prof et <log>_profile.txt)
+        et leur résumé est ajouté au log (clé 'profile').
         """
         
         start_iso_datetime = self.games[0]["events"][0]["datetime"]
@@ -567,6 +1106,7 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
             "all_against_ref_player": self.all_against_ref_player,
             "total_games": len(self.games),
             "max_depth": max_depth,
+            "time_control": self.time_control.to_dict() if self.time_control else None,
             "initial_state": self.state_to_str(self.initial_state),
             "players": players_list,
             "final_winner": final_winner,
@@ -588,12 +1128,17 @@ class Game(ABC, Generic[StateType]): #signifie que la classe Game est génériqu
         timestamp = datetime.datetime.now().isoformat(timespec='seconds').replace(":", "-")
         filename = f"{class_name}_{timestamp}.json"
         filepath = os.path.join(folder_path, filename)
+        
+        # Profils des coups de bots, écrits à côté du log
+        if self.profiler:
+            session_info["profile"] = self.profiler.save(os.path.splitext(filepath)[0])
     
         # Sauvegarde JSON
         with open(filepath, "w") as f:
             json.dump(session_info, f, indent=2)
             
         print(f"💾 Game successfully saved to '{filename}'")
+        return filepath
         
     def replay(self, file_path: str = None) -> None:
         
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Jun 20 10:14:37 2025
+
+@author: did
+
+Résolution complète de TicTacToe par couches, en NumPy : table des valeurs exactes de toutes les positions atteignables.
+
+Une recherche récursive visite les positions une par une en Python. Ici, chaque couche (positions à ply coups de l'état
+initial) est un tableau de clés entières, traité en bloc :
+    - clé d'une position : code du fast path (bitboard du 1er joueur | bitboard du 2nd << 9) << 1 | index du joueur au trait,
+    - expansion : pour chacun des 9 coups, les enfants des positions non terminales où la case est vide sont calculés
+      en une opération sur le tableau, puis la couche suivante est dédupliquée par np.unique (transpositions),
+    - positions terminales : masques de victoire (table winning_boards du jeu indexée par les bitboards) et grille pleine,
+    - remontée des valeurs de la dernière couche à la première : chaque position prend la meilleure valeur de ses enfants
+      pour le joueur au trait (recherche des enfants par np.searchsorted dans la couche suivante, triée par np.unique).
+Les deux joueurs sont résolus comme premier joueur (la partie peut commencer par l'un ou l'autre).
+
+Valeur d'une position, du point de vue du 1er joueur de game.players :
+    10 - d pour une victoire en d coups (parties parfaites, le perdant retardant la fin), -(10 - d) pour une défaite, 0 pour un nul.
+Pour une victoire, c'est le score de TicTacToe.get_score_by_symbol divisé par 10 (profondeur d) : les moteurs peuvent
+reprendre la table telle quelle. La table (clés triées, valeurs) se sauvegarde en .npz.
+
+Exemple :
+    from tictactoe import TicTacToe
+    my_game = TicTacToe.create_headless(["random_move", "random_move"])
+    solver = LayeredSolver(my_game)
+    solver.solve()                                              # quelques millisecondes
+    my_game.bot_move_fns["solver_move"] = solver.get_best_move  # bot parfait
+"""
+
+import os
+from time import perf_counter
+import numpy as np
+
+
+WIN_VALUE = 10                               # valeur d'une victoire immédiate (position terminale gagnée)
+
+
+class LayeredSolver:
+    """
+    Solveur par couches d'un jeu TicTacToe à 2 joueurs sur le fast path (TicTacToe et sous-classes qui gardent ses règles).
+
+    Paramètres :
+    - game : le jeu (has_fast_path doit être vrai : m,n,k et Ultimate Tic-Tac-Toe ne sont pas concernés).
+    """
+
+    def __init__(self, game):
+        if not game.has_fast_path() or not hasattr(game, "winning_boards"):
+            raise ValueError(f"{game.__class__.__name__} is not supported by the layered solver (TicTacToe fast path required).")
+        if len(game.players) != 2:
+            raise ValueError("the layered solver needs the 2 players of the game (cf. create_headless).")
+        self.game = game
+        self.winning_boards = np.frombuffer(game.winning_boards, dtype=np.uint8).astype(bool)
+        self.keys = None                     # clés de toutes les positions, triées (np.int64)
+        self.values = None                   # valeur de chaque position du point de vue du 1er joueur (np.int8)
+        self.layer_sizes = []                # nb de positions de chaque couche
+        self.last_search = {}                # infos de la dernière recherche de get_best_move, loguées par run_1_vs_1
+
+    def is_solved(self) -> bool:
+        return self.keys is not None
+
+    def get_terminal_values(self, codes):
+        """
+        Retourne (masque des positions terminales, valeur des positions terminales) pour un tableau de codes.
+        """
+        wins_0 = self.winning_boards[codes & 0x1FF]
+        wins_1 = self.winning_boards[codes >> 9]
+        full = (codes | codes >> 9) & 0x1FF == 0x1FF
+        values = np.where(wins_0, WIN_VALUE, np.where(wins_1, -WIN_VALUE, 0)).astype(np.int8)
+        return wins_0 | wins_1 | full, values
+
+    def solve(self) -> dict:
+        """
+        Enumère toutes les positions atteignables depuis l'état initial du jeu (chaque joueur commençant),
+        calcule leur valeur et retourne les infos de la résolution (nb de positions, temps).
+        """
+
+        t_start = perf_counter()
+        root = self.game.encode_state(self.game.initial_state)
+        layer = np.array([root << 1, root << 1 | 1], dtype=np.int64)
+
+        #expansion couche par couche
+        layers, terminals = [], []
+        while layer.size:
+            codes, sides = layer >> 1, layer & 1
+            terminal, _ = self.get_terminal_values(codes)
+            layers.append(layer)
+            terminals.append(terminal)
+            children = []
+            for move in range(9):
+                expand = ~terminal & ((codes | codes >> 9) >> move & 1 == 0)
+                child_codes = codes[expand] | np.left_shift(1, move + 9 * sides[expand])
+                children.append(child_codes << 1 | (1 - sides[expand]))
+            layer = np.unique(np.concatenate(children))
+
+        #remontée des valeurs, de la dernière couche à la première
+        all_values = [None] * len(layers)
+        next_layer = next_values = None
+        for index in range(len(layers) - 1, -1, -1):
+            layer, terminal = layers[index], terminals[index]
+            codes, sides = layer >> 1, layer & 1
+            _, values = self.get_terminal_values(codes)
+            values = values.astype(np.int16)
+            if next_layer is not None:
+                best = np.where(sides == 0, -WIN_VALUE - 1, WIN_VALUE + 1).astype(np.int16)
+                for move in range(9):
+                    expand = ~terminal & ((codes | codes >> 9) >> move & 1 == 0)
+                    child_keys = (codes[expand] | np.left_shift(1, move + 9 * sides[expand])) << 1 | (1 - sides[expand])
+                    child_values = next_values[np.searchsorted(next_layer, child_keys)]
+                    child_values = child_values - np.sign(child_values)          # une victoire plus lointaine vaut un point de moins
+                    best[expand] = np.where(sides[expand] == 0, np.maximum(best[expand], child_values), np.minimum(best[expand], child_values))
+                values = np.where(terminal, values, best)
+            all_values[index] = values.astype(np.int8)
+            next_layer, next_values = layer, all_values[index]
+
+        keys = np.concatenate(layers)
+        order = np.argsort(keys)
+        self.keys, self.values = keys[order], np.concatenate(all_values)[order]
+        self.layer_sizes = [len(layer) for layer in layers]
+        return {"positions": len(self.keys), "layers": self.layer_sizes, "time_ms": round(1000 * (perf_counter() - t_start), 1)}
+
+    def get_key(self, state, player) -> int:
+        game = self.game
+        return game.encode_state(state) << 1 | game.players.index(player)
+
+    def get_value(self, state, player, reference_player=None) -> int:
+        """
+        Valeur exacte de state, player ayant le trait, du point de vue de reference_player (par défaut player).
+        Lève une KeyError si la position n'est pas atteignable depuis l'état initial du jeu.
+        """
+        if not self.is_solved():
+            self.solve()
+        key = self.get_key(state, player)
+        index = int(np.searchsorted(self.keys, key))
+        if index == len(self.keys) or self.keys[index] != key:
+            raise KeyError(f"position '{self.game.state_to_str(state)}' is not reachable from the initial state.")
+        value = int(self.values[index])
+        reference_player = reference_player or player
+        return value if self.game.players.index(reference_player) == 0 else -value
+
+    def get_move_values(self, state, player) -> dict:
+        """
+        Retourne {coup : valeur de l'enfant du point de vue de player}.
+        """
+        game = self.game
+        next_player = game.get_next_player(player)
+        return {move: self.get_value(game.apply_move(state, move, player), next_player, player) for move in game.get_possible_moves(state)}
+
+    def get_best_move(self, state, player, reference_player=None, all_against_ref_player=True, max_depth: int = None, **kwargs):
+        """
+        move_fn de bot parfait : joue le coup de meilleure valeur (victoire la plus rapide, défaite la plus lente).
+        La table est calculée au premier appel. max_depth n'est pas utilisé.
+        """
+        t_start = perf_counter()
+        if not self.is_solved():
+            self.solve()
+        move_values = self.get_move_values(state, player)
+        best_move = max(move_values, key=move_values.get)
+        self.last_search = {
+            "algorithm": "layered_solver",
+            "value": move_values[best_move],
+            "move_values": move_values,
+            "nodes": len(move_values),
+            "time_ms": round(1000 * (perf_counter() - t_start), 1)
+        }
+        return best_move
+
+    def get_solution_path(self) -> str:
+        return os.path.join("game_logs", self.game.__class__.__name__, "layered_solution.npz")
+
+    def save(self, path: str = None) -> str:
+        """
+        Sauvegarde la table (clés et valeurs) dans path (par défaut game_logs/<NomClasse>/layered_solution.npz).
+        """
+        if not self.is_solved():
+            self.solve()
+        path = path or self.get_solution_path()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, keys=self.keys, values=self.values, symbols=np.array([player.symbol for player in self.game.players]))
+        return path
+
+    def load(self, path: str = None) -> None:
+        """
+        Charge une table sauvegardée par save (les symboles des joueurs doivent être les mêmes, dans le même ordre).
+        """
+        with np.load(path or self.get_solution_path()) as data:
+            if list(data["symbols"]) != [player.symbol for player in self.game.players]:
+                raise ValueError(f"the saved table was solved for players {list(data['symbols'])}.")
+            self.keys, self.values = data["keys"], data["values"]
+
+
+if __name__ == "__main__":
+    from tictactoe import TicTacToe
+    solver = LayeredSolver(TicTacToe.create_headless(["random_move", "random_move"]))
+    print(solver.solve())
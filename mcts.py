@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Jun 18 10:27:44 2025
+
+@author: did
+
+Recherche Monte-Carlo (MCTS, UCT) sous forme de graphe : les noeuds sont indexés par le hash de l'état et du joueur au trait.
+
+Dans un arbre MCTS classique, une position atteinte par plusieurs ordres de coups (transposition, très fréquente au TicTacToe)
+a un noeud par chemin : ses statistiques sont dupliquées et chaque copie doit être réévaluée par ses propres simulations.
+Ici (Monte-Carlo Graph Search), une position n'a qu'un noeud, partagé par tous les chemins :
+    - le noeud porte les statistiques de la position (nb de visites, somme des résultats du point de vue du joueur qui vient d'y jouer),
+    - chaque arête (coup) de son parent porte son propre nb de visites, qui sert au terme d'exploration d'UCT,
+    - la rétropropagation suit le chemin réellement parcouru par la simulation : noeuds et arêtes de ce chemin seulement.
+La sélection utilise donc la valeur partagée de l'enfant (toutes transpositions confondues) et l'exploration propre au chemin.
+
+La table des noeuds est bornée (max_nodes) : quand elle est pleine, le noeud utilisé le moins récemment est effacé (LRU).
+Un noeud effacé qui est de nouveau atteint repart de zéro. Les noeuds du chemin de la simulation en cours sont les plus récents :
+ils ne sont pas effacés tant que max_nodes dépasse la longueur d'une partie.
+Avec transpositions=False, les noeuds sont indexés par le chemin depuis la racine : c'est l'arbre MCTS classique (comparaisons).
+
+Les simulations finissent par une partie aléatoire (rollout), sur le fast path du jeu s'il en a un (cf. Game.has_fast_path).
+Avec un évaluateur (ex : ValueNetwork, cf. value_network.py), les feuilles sont évaluées par lui à la place des parties aléatoires,
+par lots de batch_size simulations : chaque simulation du lot descend jusqu'à sa feuille en comptant déjà ses visites
+(visites virtuelles, qui orientent les suivantes vers d'autres branches), puis toutes les feuilles sont évaluées en un seul appel
+d'evaluate et les valeurs sont rétropropagées.
+La table est conservée d'un coup à l'autre (les positions déjà explorées sont retrouvées par leur hash) et vidée à chaque nouvelle partie.
+
+Exemple :
+    my_game.mcts.nb_simulations = 2000
+    my_game.mcts.get_best_move(state, player, player, True)
+"""
+
+import math
+import random
+from collections import OrderedDict
+from time import perf_counter
+from minimax import SearchTimeout
+
+
+class MCTSNode:
+    """
+    Noeud du graphe : statistiques d'une position et arêtes vers ses enfants.
+
+    Attributs :
+    - visits : nb de simulations passées par le noeud.
+    - value_sum : somme de leurs résultats (1 victoire, 0 nul, -1 défaite) du point de vue du joueur qui vient de jouer.
+    - edges : {move : [nb de visites de l'arête, clé de l'enfant]} des coups déjà essayés.
+    - untried : coups pas encore essayés (None tant que le noeud n'a pas été développé).
+    """
+
+    __slots__ = ("visits", "value_sum", "edges", "untried")
+
+    def __init__(self):
+        self.visits = 0
+        self.value_sum = 0.0
+        self.edges = {}
+        self.untried = None
+
+
+class MCTS:
+    """
+    Moteur MCTS (UCT) sur un graphe de positions.
+
+    Paramètres :
+    - game : le jeu (les joueurs jouent à tour de rôle, get_next_player).
+    - nb_simulations : nb de simulations par coup (borne aussi par deadline).
+    - exploration : constante c d'UCT (valeur + c * sqrt(ln(N parent) / N arête)).
+    - max_nodes : nb maximal de noeuds de la table (éviction LRU au-delà).
+    - transpositions : True pour partager les noeuds entre transpositions (graphe), False pour un arbre classique.
+    - evaluator : évaluateur optionnel des feuilles à la place des parties aléatoires (evaluate par lots, valeurs ramenées
+      entre -1 et 1 par son value_scale), par exemple un ValueNetwork.
+    - batch_size : nb de simulations dont les feuilles sont évaluées ensemble par l'évaluateur.
+    """
+
+    def __init__(self, game, nb_simulations: int = 1000, exploration: float = 1.4, max_nodes: int = 1 << 16, transpositions: bool = True,
+                 evaluator=None, batch_size: int = 16):
+        self.game = game
+        self.nb_simulations = nb_simulations
+        self.exploration = exploration
+        self.max_nodes = max_nodes
+        self.transpositions = transpositions
+        self.evaluator = evaluator
+        self.batch_size = batch_size
+        self.fast_path = game.has_fast_path()   # True : hash et parties aléatoires sur le fast path du jeu (jeux à 2 joueurs)
+        self.nodes = OrderedDict()           # {clé : MCTSNode}, du moins récemment utilisé au plus récent
+        self.nb_evictions = 0
+        self.deadline = None                 # échéance de la recherche en cours (time.perf_counter)
+        self.stop_event = None               # threading.Event optionnel : une fois levé, la recherche en cours s'arrête (cf. engine_daemon.py)
+        self.last_search = {}                # infos de la dernière recherche de get_best_move, loguées par run_1_vs_1
+
+    def clear(self) -> None:
+        self.nodes.clear()
+
+    def on_new_game(self) -> None:
+        """
+        Notification de la boucle de jeu en début de partie : la table est vidée.
+        """
+        self.clear()
+
+    def get_key(self, state, player, parent_key=None, move=None) -> int:
+        """
+        Clé d'un noeud : hash de l'état et du joueur au trait (graphe), ou du chemin depuis la racine (arbre : parent_key et move).
+        """
+        if not self.transpositions and parent_key is not None:
+            return hash((parent_key, move))
+        game = self.game
+        if self.use_fast_path():
+            return game.get_fast_hash(game.encode_state(state), game.players.index(player))
+        return game.get_state_hash(state, player.symbol)
+
+    def get_node(self, key) -> MCTSNode:
+        """
+        Retourne le noeud de clé key (créé s'il n'existe pas) en le marquant comme le plus récemment utilisé,
+        et efface le noeud le moins récemment utilisé si la table est pleine.
+        """
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = MCTSNode()
+            if len(self.nodes) > self.max_nodes:
+                self.nodes.popitem(last=False)
+                self.nb_evictions += 1
+        else:
+            self.nodes.move_to_end(key)
+        return node
+
+    def use_fast_path(self) -> bool:
+        return self.fast_path and len(self.game.players) == 2
+
+    def get_best_move(self, state, player, reference_player=None, all_against_ref_player=True, max_depth: int = None, deadline: float = None, **kwargs):
+        """
+        move_fn de bot : lance nb_simulations simulations (ou jusqu'à deadline) depuis state et joue le coup le plus visité.
+        max_depth n'est pas utilisé (les simulations vont jusqu'à la fin de la partie ou jusqu'à une feuille évaluée).
+        """
+
+        t_start = perf_counter()
+        self.deadline = deadline
+        root_key = self.get_key(state, player)
+        nb_simulations = 0
+        timeout = False
+        try:
+            while nb_simulations < self.nb_simulations:
+                if self.evaluator is None:
+                    self.simulate(state, player, root_key)
+                    nb_simulations += 1
+                else:
+                    batch_size = min(self.batch_size, self.nb_simulations - nb_simulations)
+                    self.simulate_batch(state, player, root_key, batch_size)
+                    nb_simulations += batch_size
+                if self.evaluator is not None or nb_simulations % 64 == 0:
+                    if (self.deadline is not None and perf_counter() > self.deadline) or (self.stop_event is not None and self.stop_event.is_set()):
+                        raise SearchTimeout()
+        except SearchTimeout:
+            timeout = True
+        finally:
+            self.deadline = None
+
+        root = self.get_node(root_key)
+        best_move = max(root.edges, key=lambda move: root.edges[move][0]) if root.edges else random.choice(self.game.get_possible_moves(state))
+        pv = self.get_principal_variation(root_key)
+        self.last_search = {
+            "algorithm": "mcgs" if self.transpositions else "mcts",
+            "simulations": nb_simulations,
+            "value": round(self.get_value(root.edges[best_move][1]), 3) if root.edges else None,
+            "pv": pv or [best_move],
+            "visits": {move: edge[0] for move, edge in root.edges.items()},
+            "nodes": len(self.nodes),
+            "evictions": self.nb_evictions,
+            "evaluator": self.evaluator is not None,
+            "time_ms": round(1000 * (perf_counter() - t_start), 1)
+        }
+        if timeout:
+            self.last_search["timeout"] = True
+        return best_move
+
+    def get_value(self, key) -> float:
+        """
+        Valeur moyenne d'un noeud du point de vue du joueur qui vient d'y jouer (0 s'il n'a pas de statistiques).
+        """
+        node = self.nodes.get(key)
+        return node.value_sum / node.visits if node is not None and node.visits else 0.0
+
+    def get_principal_variation(self, key, max_length: int = 20) -> list:
+        """
+        Suit les arêtes les plus visitées depuis le noeud key.
+        """
+        pv = []
+        node = self.nodes.get(key)
+        while node is not None and node.edges and len(pv) < max_length:
+            move, (_, child_key) = max(node.edges.items(), key=lambda item: item[1][0])
+            pv.append(move)
+            node = self.nodes.get(child_key)
+        return pv
+
+    def simulate(self, state, player, root_key) -> None:
+        """
+        Une simulation : sélection et développement (descend), partie aléatoire, puis rétropropagation le long du chemin parcouru.
+        """
+        path, state, player = self.descend(state, player, root_key)
+        winner = self.rollout(state, player)
+        self.backpropagate(path, winner, 0 if winner is None else 1)
+
+    def simulate_batch(self, state, player, root_key, batch_size: int) -> None:
+        """
+        batch_size simulations dont les feuilles non terminales sont évaluées en un seul appel de self.evaluator.evaluate.
+        Les visites de chaque chemin sont comptées dès la descente (visites virtuelles) : les descentes suivantes du lot
+        voient ces branches plus explorées et se répartissent sur d'autres feuilles.
+        """
+
+        game = self.game
+        pending = []                         # (chemin, état, joueur au trait) des feuilles non terminales
+        for _ in range(batch_size):
+            path, leaf_state, leaf_player = self.descend(state, player, root_key)
+            for node, edge, _ in path:
+                node.visits += 1
+                if edge is not None:
+                    edge[0] += 1
+            if game.is_terminal(leaf_state):
+                winner = game.get_winner_by_symbol(leaf_state)
+                self.backpropagate(path, winner, 0 if winner is None else 1, visit=False)
+            else:
+                pending.append((path, leaf_state, leaf_player))
+
+        if pending:
+            values = self.evaluator.evaluate(game, [leaf_state for _, leaf_state, _ in pending], [leaf_player for _, _, leaf_player in pending], player)
+            scale = getattr(self.evaluator, "value_scale", 1)
+            for (path, _, _), value in zip(pending, values):
+                self.backpropagate(path, player.symbol, max(-1.0, min(1.0, float(value) / scale)), visit=False)
+
+    def descend(self, state, player, root_key) -> tuple:
+        """
+        Sélection (UCT) depuis la racine jusqu'à un coup non essayé ou un noeud sans statistiques, et développement.
+        Retourne (chemin, état atteint, joueur au trait), le chemin étant la liste des (noeud, arête du parent qui y mène,
+        symbole du joueur qui y a joué).
+        """
+
+        game = self.game
+        key = root_key
+        node = self.get_node(key)
+        path = [(node, None, None)]          # (noeud, arête du parent qui y mène, symbole du joueur qui y a joué)
+        while not game.is_terminal(state):
+            if node.untried is None:
+                node.untried = game.get_possible_moves(state)
+                random.shuffle(node.untried)
+
+            if node.untried:
+                move = node.untried.pop()
+                edge = None
+            else:
+                move, edge = self.select(node)
+
+            next_state = game.apply_move(state, move, player)
+            next_player = game.get_next_player(player)
+            if edge is None:
+                edge = node.edges[move] = [0, self.get_key(next_state, next_player, key, move)]
+            key = edge[1]
+            child = self.get_node(key)
+            path.append((child, edge, player.symbol))
+            state, player, node = next_state, next_player, child
+            if child.visits == 0:
+                break                                       # nouveau noeud (ou effacé puis retrouvé) : à évaluer
+        return path, state, player
+
+    def backpropagate(self, path, symbol, value: float, visit: bool = True) -> None:
+        """
+        Rétropropagation d'un résultat le long du chemin : value (entre -1 et 1) du point de vue du joueur symbol, l'opposé
+        pour les autres joueurs (symbol None : nul). visit=False si les visites du chemin ont déjà été comptées (simulate_batch).
+        """
+        for node, edge, node_symbol in path:
+            if visit:
+                node.visits += 1
+                if edge is not None:
+                    edge[0] += 1
+            if node_symbol is not None and symbol is not None:
+                node.value_sum += value if node_symbol == symbol else -value
+
+    def select(self, node: MCTSNode) -> tuple:
+        """
+        Choisit l'arête qui maximise UCT : valeur partagée de l'enfant + c * sqrt(ln(visites du noeud) / visites de l'arête).
+        Un enfant sans statistiques (effacé de la table) est choisi en priorité.
+        """
+        log_visits = math.log(node.visits or 1)
+        best_score, best = -float('inf'), None
+        for move, edge in node.edges.items():
+            child = self.nodes.get(edge[1])
+            if child is None or child.visits == 0:
+                return move, edge
+            score = child.value_sum / child.visits + self.exploration * math.sqrt(log_visits / edge[0])
+            if score > best_score:
+                best_score, best = score, (move, edge)
+        return best
+
+    def rollout(self, state, player) -> str | None:
+        """
+        Termine la partie au hasard et retourne le symbole du vainqueur (None pour un nul).
+        """
+        game = self.game
+        if self.use_fast_path():
+            code, side = game.encode_state(state), game.players.index(player)
+            while True:
+                winner = game.get_winner_index(code)
+                if winner >= 0:
+                    return game.players[winner].symbol
+                legal = game.legal_moves_mask(code)
+                if not legal:
+                    return None
+                moves = [move for move in game.get_fast_move_order() if legal >> move & 1]
+                code = game.make_move(code, random.choice(moves), side)
+                side = 1 - side
+        while not game.is_terminal(state):
+            state = game.apply_move(state, random.choice(game.get_possible_moves(state)), player)
+            player = game.get_next_player(player)
+        return game.get_winner_by_symbol(state)
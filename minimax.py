@@ -9,14 +9,70 @@ exemple : https://www.codingame.com/multiplayer/bot-programming/tic-tac-toe
 """
 
 #TODO: DRY (Don’t Repeat Yourself) factoriser minimax_classique et selfish : code long et bcp de redondance dans les 2 méthodes
-#TODO: créer version alpha beta du minimax: minimax_ab()
+
+from time import perf_counter
+from functools import wraps
+from move_ordering import MoveOrdering
+from search_cache import PersistentCache, EXACT, LOWER, UPPER
+from profiling import SearchMemoryTracker
+
+
+def tracked_search(get_best_move_fn):
+    """
+    Décorateur des méthodes get_best_move... de Minimax : si self.track_memory est activé, la recherche est instrumentée
+    par SearchMemoryTracker (tracemalloc) et le résultat est ajouté à self.last_search["memory"] (et donc aux logs).
+    """
+
+    @wraps(get_best_move_fn)
+    def wrapper(self, *args, **kwargs):
+        if not self.track_memory or self._memory_tracker is not None:     # pas d'instrumentation imbriquée (délégation au Minimax selfish...)
+            return get_best_move_fn(self, *args, **kwargs)
+        self._memory_tracker = SearchMemoryTracker(top=self.memory_top_sites)
+        try:
+            with self._memory_tracker:
+                best_move = get_best_move_fn(self, *args, **kwargs)
+            self.last_search["memory"] = self._memory_tracker.result
+        finally:
+            self._memory_tracker = None
+        return best_move
+
+    return wrapper
+
+
+class SearchTimeout(Exception):
+    """
+    Levée par Minimax.count_node quand l'échéance (deadline) de la recherche en cours est dépassée.
+    """
 
 
 class Minimax:
-    def __init__(self, game):
+    def __init__(self, game, aspiration_window: int = None):
         self.game = game
-        
-    def get_best_move(self, state, player, reference_player, all_against_ref_player, max_depth: int) -> str:
+        self.aspiration_window = game.ASPIRATION_WINDOW if aspiration_window is None else aspiration_window  # demi-largeur de la fenêtre d'aspiration de get_best_move_pvs (None : fenêtre complète)
+        self.nodes = 0                              # nb de noeuds visités par la dernière recherche
+        self.last_search = {}                       # infos de la dernière recherche (algorithme, profondeur, valeur, pv, nodes), loguées par run_1_vs_1
+        self._pv_table = []                         # variation principale de l'itération précédente (ordonnancement des coups)
+        self._horizon_reached = False               # True si la recherche en cours a été coupée par max_depth
+        self.move_ordering = MoveOrdering(game)     # killers et historique utilisés par les recherches bornées (alpha-beta, PVS)
+        self.cache = None                           # PersistentCache optionnel (cf. search_cache.py) : valeurs déjà calculées, partagées entre exécutions
+        self.evaluator = None                       # évaluateur optionnel des feuilles (ex : ValueNetwork, cf. value_network.py) à la place de get_heuristic_by_symbol
+        self.track_memory = False                   # True : mesure la mémoire de chaque recherche (pic, blocs, sites d'allocation) dans last_search["memory"]
+        self.memory_top_sites = 10                  # nb de sites d'allocation retenus quand track_memory est activé
+        self._memory_tracker = None                 # SearchMemoryTracker de la recherche en cours
+        self.deadline = None                        # échéance de la recherche en cours (time.perf_counter), cf. clock.py
+        self.deadline_check_nodes = 256             # l'échéance est vérifiée tous les deadline_check_nodes noeuds
+        self.stop_event = None                      # threading.Event optionnel : une fois levé, la recherche en cours s'arrête (cf. pondering.py)
+        self.reuse_tree = True                      # True : les meilleurs coups trouvés sont conservés d'un coup à l'autre (ordonnancement des recherches bornées)
+        self.best_moves = {}                        # {clé du noeud : (meilleur coup, ply de la position, ply de la racine quand il a été trouvé)}
+        self.best_moves_size = 1 << 18              # nb maximal d'entrées de best_moves (cf. evict_best_moves)
+        self.root_ply = 0                           # nb de coups joués dans la partie en cours (cf. on_move_played)
+        self.root_move_values = False               # True : alpha-beta et PVS donnent aussi la valeur exacte de chaque coup de la racine (last_search["move_values"], cf. selfplay.py)
+        self.use_proven_results = game.USE_PROVEN_RESULTS   # True : les états au résultat certain (Game.get_proven_score : positions mortes...) sont traités comme terminaux
+        self.fast_path = game.has_fast_path()       # True : les recherches passent par le fast path du jeu (codes entiers) quand c'est possible (cf. can_use_fast_path)
+        self._fast_killers = []                     # killer de chaque profondeur du fast path alpha-beta
+
+    @tracked_search
+    def get_best_move(self, state, player, reference_player, all_against_ref_player, max_depth: int, deadline: float = None, **kwargs) -> int:
         """
         Fonction qui détermine le meilleur coup à jouer pour un joueur donné en fonction de l'algorithme Minimax.
         
@@ -28,39 +84,231 @@ class Minimax:
         - reference_player : Le joueur de référence (utilisé si `all_against_ref_player` est True).
         - max_depth : La profondeur maximale pour l'algorithme Minimax (utiliser None pour ne pas limiter Minimax en profondeur).
         - all_against_ref_player : Un booléen qui indique si tous les joueurs sont contre le joueur de référence (True) ou si chaque joueur maximise son propre score indépendamment (False).
+        - deadline : échéance optionnelle (time.perf_counter) transmise par la boucle de jeu si une cadence est définie (cf. clock.py).
+                     Une fois dépassée, la recherche s'arrête et le meilleur des coups déjà évalués est joué.
+        **kwargs permet de le rendre compatible avec les autres move_fn (clock...)
         
         Returns:
         - Le meilleur coup pour le joueur donné.
+
+        Si le jeu dispose d'un livre d'ouvertures (game.opening_book) qui connaît l'état, le coup du livre est joué sans recherche.
         """
-        
+
+        self.nodes = 0
+        book_move = self.get_book_move(state, player, reference_player, all_against_ref_player)
+        if book_move is not None:
+            return book_move
+
         best_move = None
         if all_against_ref_player:
             best_value = -float('inf') if player == reference_player else float('inf')
         else:
             best_value = -float('inf')
+        move_values = {}
+        moves = self.game.get_possible_moves(state)
+        timeout = False
+        fast = all_against_ref_player and self.can_use_fast_path(player, reference_player)
+        if fast:
+            next_side, reference_side = self.game.players.index(self.game.get_next_player(player)), self.game.players.index(reference_player)
     
         # Calcul du value pour chaque move possible
-        for move in self.game.get_possible_moves(state):
-            next_state = self.game.apply_move(state, move, player)
-            value = self.minimax(next_state, self.game.get_next_player(player), reference_player, all_against_ref_player, 1, max_depth)  # depth initialisé à 1, sera incrémenté à chaque appel de minimax
-    
-            # Mise à jour de best_value et best_move selon all_against_ref_player et le player
-            if all_against_ref_player:    
-                if player == reference_player:
-                    if value > best_value:
-                        best_value = value
-                        best_move = move
+        self.deadline = deadline
+        try:
+            for move in moves:
+                next_state = self.game.apply_move(state, move, player)
+                if fast:
+                    value = self.minimax_fast(self.game.encode_state(next_state), next_side, reference_side, 1, max_depth)
                 else:
-                    if value < best_value:
+                    value = self.minimax(next_state, self.game.get_next_player(player), reference_player, all_against_ref_player, 1, max_depth)  # depth initialisé à 1, sera incrémenté à chaque appel de minimax
+                move_values[move] = value
+        
+                # Mise à jour de best_value et best_move selon all_against_ref_player et le player
+                if all_against_ref_player:    
+                    if player == reference_player:
+                        if value > best_value:
+                            best_value = value
+                            best_move = move
+                    else:
+                        if value < best_value:
+                            best_value = value
+                            best_move = move
+                else:
+                    if value > best_value:
                         best_value = value
                         best_move = move
-            else:
-                if value > best_value:
-                    best_value = value
-                    best_move = move
-    
-        return best_move    
+        except SearchTimeout:
+            timeout = True
+            if best_move is None:
+                best_move = moves[0]          # aucun coup évalué à temps
+        finally:
+            self.deadline = None
     
+        self.last_search = {"algorithm": "minimax", "value": best_value, "nodes": self.nodes, "move_values": move_values}
+        if fast:
+            self.last_search["fast_path"] = True
+        if timeout:
+            self.last_search["timeout"] = True
+        return best_move
+
+    def get_book_move(self, state, player, reference_player, all_against_ref_player) -> int | None:
+        """
+        Retourne le coup du livre d'ouvertures du jeu pour cet état, ou None si le jeu n'a pas de livre ou si l'état est inconnu.
+        Le livre étant construit du point de vue du joueur qui joue, il n'est consulté que si player maximise sa propre valeur.
+        """
+
+        self.last_search = {}
+        book = self.game.opening_book
+        if book is None or (all_against_ref_player and player != reference_player):
+            return None
+        book_move = book.get_move(state, player)
+        if book_move is not None:
+            self.last_search = {"algorithm": "book"}
+        return book_move
+
+    def get_proven_score(self, state, reference_player_symbol: str, depth: int, player_symbol: str = None) -> int | None:
+        """
+        Retourne le score d'un état non terminal dont le résultat est certain (Game.get_proven_score), sinon None.
+        player_symbol : symbole du joueur qui doit jouer dans state.
+        La racine (depth 0) n'est jamais concernée : la recherche doit toujours y choisir un coup.
+        """
+        if depth == 0 or not self.use_proven_results:
+            return None
+        return self.game.get_proven_score(state, reference_player_symbol, depth, player_symbol)
+
+    def count_node(self) -> None:
+        """
+        Compte un noeud visité et lève SearchTimeout si l'échéance de la recherche est dépassée ou si stop_event est levé
+        (vérifiés tous les deadline_check_nodes noeuds pour limiter le coût des appels à l'horloge).
+        """
+        self.nodes += 1
+        if self.nodes % self.deadline_check_nodes == 0:
+            if self.deadline is not None and perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+    def on_new_game(self) -> None:
+        """
+        Notification de la boucle de jeu en début de partie : les informations conservées d'un coup à l'autre sont oubliées.
+        """
+        self.root_ply = 0
+        self.best_moves.clear()
+        self.move_ordering.clear()
+
+    def on_move_played(self, state, move, player) -> None:
+        """
+        Notification de la boucle de jeu après chaque coup joué (par n'importe quel joueur) : la racine des prochaines recherches
+        avance d'un ply et les meilleurs coups des positions antérieures, devenues inaccessibles, sont libérés (cf. advance_root).
+        """
+        self.advance_root(self.root_ply + 1)
+
+    def advance_root(self, ply: int) -> None:
+        """
+        Place la racine des prochaines recherches au ply donné (nb de coups joués depuis le début de la partie)
+        et libère les meilleurs coups des positions antérieures (un parcours de la table, négligeable devant une recherche).
+        Revenir en arrière équivaut à une nouvelle partie. Quand la table est pleine, les entrées des recherches précédentes
+        sont remplacées en priorité (cf. evict_best_moves).
+        """
+        if ply < self.root_ply:
+            self.on_new_game()
+        self.root_ply = ply
+        for key in [key for key, entry in self.best_moves.items() if entry[1] < ply]:
+            del self.best_moves[key]
+
+    def evict_best_moves(self) -> None:
+        """
+        Remplacement par âge de best_moves plein : les positions antérieures à la racine (inaccessibles) sont libérées, puis,
+        s'il en reste plus des 3/4 de best_moves_size, seules sont gardées les entrées des recherches les plus récentes,
+        les positions proches de la racine d'abord (celles qui ordonnent le plus de noeuds). Le quart libéré rend le coût
+        du tri négligeable par entrée stockée.
+        """
+        keep = self.best_moves_size * 3 // 4
+        entries = [(key, entry) for key, entry in self.best_moves.items() if entry[1] >= self.root_ply]
+        if len(entries) > keep:
+            entries.sort(key=lambda item: (-item[1][2], item[1][1]))
+            del entries[keep:]
+        self.best_moves = dict(entries)
+
+    def get_node_key(self, state, player):
+        """
+        Retourne la clé d'un noeud dans best_moves (None si reuse_tree est désactivé).
+        La table restant en mémoire, la forme textuelle de l'état suffit : inutile de calculer le hash stable get_state_hash.
+        """
+        return (self.game.state_to_str(state), player.symbol) if self.reuse_tree else None
+
+    def get_hash_move(self, node_key):
+        """
+        Retourne le meilleur coup trouvé pour ce noeud par une recherche précédente (de ce coup ou d'un coup précédent), ou None.
+        """
+        entry = self.best_moves.get(node_key) if node_key is not None else None
+        return entry[0] if entry else None
+
+    def store_best_move(self, node_key, depth: int, move) -> None:
+        """
+        Conserve le meilleur coup (ou le coup de coupure) d'un noeud situé à depth plies de la racine, pour ordonner les recherches suivantes.
+        """
+        if node_key is None or move is None:
+            return
+        if node_key not in self.best_moves and len(self.best_moves) >= self.best_moves_size:
+            self.evict_best_moves()
+        self.best_moves[node_key] = (move, self.root_ply + depth, self.root_ply)
+
+    def get_heuristic(self, state, player, reference_player_symbol: str, depth: int):
+        """
+        Evalue une feuille non terminale (profondeur max atteinte) : par self.evaluator s'il est défini,
+        sinon par l'heuristique du jeu (get_heuristic_by_symbol). player est le joueur qui doit jouer dans state.
+        """
+        if self.evaluator is not None:
+            return self.evaluator.get_heuristic_by_symbol(self.game, state, player, reference_player_symbol)
+        return self.game.get_heuristic_by_symbol(state, reference_player_symbol, depth)
+
+    def evaluate_frontier(self, state, player, reference_player, depth: int) -> list:
+        """
+        Evalue tous les enfants d'un noeud situé juste avant l'horizon (depth + 1 == max_depth) :
+        les enfants terminaux par get_score_by_symbol, les autres en un seul lot par self.evaluator.evaluate,
+        pour amortir le coût de l'interpréteur sur tout le lot.
+        
+        Returns:
+        - la liste des (move, valeur) du point de vue de reference_player.
+        """
+        
+        next_player = self.game.get_next_player(player)
+        children = [(move, self.game.apply_move(state, move, player)) for move in self.game.get_possible_moves(state)]
+        self.nodes += len(children)
+        
+        values = {}
+        pending = []
+        for move, next_state in children:
+            if self.game.is_terminal(next_state):
+                values[move] = self.game.get_score_by_symbol(next_state, reference_player.symbol, depth + 1)
+            elif (proven_score := self.get_proven_score(next_state, reference_player.symbol, depth + 1, next_player.symbol)) is not None:
+                values[move] = proven_score
+            else:
+                pending.append((move, next_state))
+        
+        if pending:
+            self._horizon_reached = True
+            batch_values = self.evaluator.evaluate(self.game, [next_state for _, next_state in pending], [next_player] * len(pending), reference_player)
+            for (move, _), value in zip(pending, batch_values):
+                values[move] = float(value)
+        
+        return [(move, values[move]) for move, _ in children]
+
+    def use_batched_frontier(self, depth: int, max_depth) -> bool:
+        """
+        True si les enfants du noeud sont tous à l'horizon et doivent être évalués en lot par self.evaluator.
+        """
+        return self.evaluator is not None and max_depth is not None and depth + 1 >= max_depth
+
+    def get_cache_key(self, state, player, depth, mode: str) -> int:
+        """
+        Retourne la clé de l'état dans le cache persistant : hash de l'état et du joueur qui doit jouer,
+        profondeur (les scores en dépendent), mode de score (stratégie, joueur de référence, max_depth)
+        et empreinte des poids de l'heuristique (des valeurs calculées avec d'autres poids ne sont pas reprises).
+        """
+        mode = f"{mode}|{self.game.get_heuristic_weights_fingerprint():x}"
+        return PersistentCache.make_key(self.game.get_state_hash(state, player.symbol), depth, mode)
+
 
     def minimax(self, state, player, reference_player, all_against_ref_player, depth, max_depth=None):
         """
@@ -116,13 +364,30 @@ class Minimax:
         - Le score estimé optimal à partir de cet état.
         """
         
+        self.count_node()
         if self.game.is_terminal(state):                                         #si le state est terminal, on renvoie le score de state
             return self.game.get_score_by_symbol(state, reference_player.symbol, depth)           #get_score et arrêt de l'exploration de la branche
+        
+        proven_score = self.get_proven_score(state, reference_player.symbol, depth, player.symbol)  #résultat certain (position morte...) : comme un état terminal
+        if proven_score is not None:
+            return proven_score
                 
         if max_depth is not None and depth >= max_depth:                    #si max_depth est définie et atteinte (ou dépassée)
-                return self.game.get_heuristic_by_symbol(state, reference_player.symbol, depth)   #get_heuristic et arrêt de l'exploration de la branche   
+                return self.get_heuristic(state, player, reference_player.symbol, depth)   #get_heuristic et arrêt de l'exploration de la branche   
         
     
+        # Valeur déjà calculée (lors de cette exécution ou d'une précédente) : inutile de réexplorer la branche
+        if self.cache is not None:
+            key = self.get_cache_key(state, player, depth, f"classic|{reference_player.symbol}|{max_depth}")
+            cached = self.cache.get(key)
+            if cached is not None and cached[1] == EXACT:
+                return cached[0]
+    
+        # Tous les enfants sont à l'horizon : évaluation en un seul lot par l'évaluateur
+        if self.use_batched_frontier(depth, max_depth):
+            values = [value for _, value in self.evaluate_frontier(state, player, reference_player, depth)]
+            return max(values) if player == reference_player else min(values)
+    
         # Initialisation du best_score si le joueur maximise ou minimise en fonction de la référence
         best_value = -float('inf') if player == reference_player else float('inf')
     
@@ -140,6 +405,8 @@ class Minimax:
             if self.game.early_pruning_hook(next_state, depth + 1, value, max_depth, reference_player):
                 break # Arrêt précoce si la condition d'élagage est remplie
     
+        if self.cache is not None:
+            self.cache.put(key, best_value, EXACT, horizon=max_depth is not None)  # par prudence, l'horizon est supposé atteint dès que max_depth est défini
         return best_value
     
 
@@ -171,13 +438,24 @@ class Minimax:
         
         # contrairement au minimax classique, on calcule ici le score de chaque état pour le player en cours (qu'il va chercher a maximiser) et non le score de ref_player (qui sera miner ou maxer selon le player en cours)
         
+        self.count_node()
+
         # Si l'état est terminal, on retourne le score du joueur actif
         if self.game.is_terminal(state):
             return self.game.get_score_by_symbol(state, player.symbol, depth)
         
+        # Pas de coupure par get_proven_score : son score suppose que les adversaires jouent contre le joueur de référence,
+        # alors qu'ici chacun maximise son propre score (le score d'un nul certain peut donc différer)
+        
         # Si on atteint la profondeur maximale, on retourne l'heuristique
         if max_depth is not None and depth >= max_depth:
-            return self.game.get_heuristic_by_symbol(state, player.symbol, depth)
+            return self.get_heuristic(state, player, player.symbol, depth)
+    
+        if self.cache is not None:
+            key = self.get_cache_key(state, player, depth, f"selfish|{max_depth}")
+            cached = self.cache.get(key)
+            if cached is not None and cached[1] == EXACT:
+                return cached[0]
     
         # Chaque joueur cherche à maximiser son propre score
         best_value = -float('inf')
@@ -190,8 +468,429 @@ class Minimax:
             if self.game.early_pruning_hook(next_state, depth + 1, value, max_depth, reference_player=None):
                 break  # Arrêt précoce si la condition d'élagage est remplie
     
+        if self.cache is not None:
+            self.cache.put(key, best_value, EXACT, horizon=max_depth is not None)  # par prudence, l'horizon est supposé atteint dès que max_depth est défini
         return best_value
-    
-    
-    
-    
+
+    @tracked_search
+    def get_best_move_ab(self, state, player, reference_player, all_against_ref_player, max_depth: int, deadline: float = None, **kwargs) -> int:
+        """
+        Version alpha-beta de get_best_move : même résultat que le Minimax classique, en visitant beaucoup moins de noeuds.
+        L'élagage alpha-beta n'étant valable que si tous les joueurs s'opposent à reference_player,
+        la stratégie selfish est déléguée à get_best_move.
+        Si l'échéance deadline est dépassée, le meilleur des coups déjà évalués est joué.
+        Avec root_move_values, chaque coup de la racine est cherché en fenêtre complète : sa valeur exacte est donnée dans
+        last_search["move_values"] (plus de noeuds visités).
+        **kwargs permet de le rendre compatible avec les autres move_fn
+        """
+
+        if not all_against_ref_player:
+            return self.get_best_move(state, player, reference_player, all_against_ref_player, max_depth, deadline)
+
+        self.nodes = 0
+        book_move = self.get_book_move(state, player, reference_player, all_against_ref_player)
+        if book_move is not None:
+            return book_move
+
+        self.move_ordering.new_search()
+        maximizing = player == reference_player
+        alpha, beta = -float('inf'), float('inf')
+        best_move = None
+        best_value = -float('inf') if maximizing else float('inf')
+        move_values = {}
+
+        node_key = self.get_node_key(state, player)
+        moves = self.move_ordering.order_moves(state, self.game.get_possible_moves(state), 0, player, self.get_hash_move(node_key))
+        timeout = False
+        fast = self.can_use_fast_path(player, reference_player)
+        if fast:
+            next_side, reference_side = self.game.players.index(self.game.get_next_player(player)), self.game.players.index(reference_player)
+            self._fast_killers.clear()
+        self.deadline = deadline
+        try:
+            for move in moves:
+                next_state = self.game.apply_move(state, move, player)
+                if fast:
+                    value = self.minimax_ab_fast(self.game.encode_state(next_state), next_side, reference_side, 1, max_depth, alpha, beta)
+                else:
+                    value = self.minimax_ab(next_state, self.game.get_next_player(player), reference_player, 1, max_depth, alpha, beta)
+
+                if self.root_move_values:
+                    move_values[move] = value           # fenêtre jamais resserrée : valeur exacte
+                if maximizing and value > best_value:
+                    best_value, best_move = value, move
+                    if not self.root_move_values:
+                        alpha = max(alpha, value)
+                elif not maximizing and value < best_value:
+                    best_value, best_move = value, move
+                    if not self.root_move_values:
+                        beta = min(beta, value)
+        except SearchTimeout:
+            timeout = True
+            if best_move is None:
+                best_move = moves[0]          # aucun coup évalué à temps : le premier coup dans l'ordre des coups est le plus prometteur
+        finally:
+            self.deadline = None
+
+        if not timeout:
+            self.store_best_move(node_key, 0, best_move)
+        self.last_search = {"algorithm": "alphabeta", "value": best_value, "nodes": self.nodes}
+        if move_values and not timeout:
+            self.last_search["move_values"] = move_values
+        if fast:
+            self.last_search["fast_path"] = True
+        if timeout:
+            self.last_search["timeout"] = True
+        return best_move
+
+    def minimax_ab(self, state, player, reference_player, depth, max_depth=None, alpha=-float('inf'), beta=float('inf')) -> int:
+        """
+        Minimax classique avec élagage alpha-beta (recherche bornée, "fail-soft").
+
+        Parameters:
+        - state, player, reference_player, depth, max_depth : comme minimax_classic.
+        - alpha : valeur minimale déjà garantie à reference_player par un autre chemin.
+        - beta : valeur maximale que l'adversaire laissera atteindre à reference_player.
+
+        Returns:
+        - La valeur exacte de l'état si alpha < valeur < beta,
+          sinon une borne (<= alpha ou >= beta) suffisante pour couper la branche.
+        """
+
+        self.count_node()
+        if self.game.is_terminal(state):
+            return self.game.get_score_by_symbol(state, reference_player.symbol, depth)
+
+        proven_score = self.get_proven_score(state, reference_player.symbol, depth, player.symbol)
+        if proven_score is not None:
+            return proven_score
+
+        if max_depth is not None and depth >= max_depth:
+            self._horizon_reached = True
+            return self.get_heuristic(state, player, reference_player.symbol, depth)
+
+        cached, key = self.probe_bounded_cache(state, player, reference_player, depth, max_depth, alpha, beta)
+        if cached is not None:
+            return cached
+
+        if self.use_batched_frontier(depth, max_depth):
+            values = [value for _, value in self.evaluate_frontier(state, player, reference_player, depth)]
+            return max(values) if player == reference_player else min(values)
+
+        alpha_orig, beta_orig = alpha, beta
+        horizon_before, self._horizon_reached = self._horizon_reached, False
+        maximizing = player == reference_player
+        best_value = -float('inf') if maximizing else float('inf')
+        best_move = None
+        next_player = self.game.get_next_player(player)
+
+        node_key = self.get_node_key(state, player)
+        moves = self.move_ordering.order_moves(state, self.game.get_possible_moves(state), depth, player, self.get_hash_move(node_key))
+        for move in moves:
+            next_state = self.game.apply_move(state, move, player)
+            value = self.minimax_ab(next_state, next_player, reference_player, depth + 1, max_depth, alpha, beta)
+
+            if (maximizing and value > best_value) or (not maximizing and value < best_value):
+                best_value, best_move = value, move
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                remaining_depth = max_depth - depth if max_depth is not None else len(moves)
+                self.move_ordering.record_cutoff(move, depth, player, remaining_depth)
+                break  # coupure alpha-beta : l'autre joueur ne laissera jamais atteindre cette branche
+
+            if self.game.early_pruning_hook(next_state, depth + 1, value, max_depth, reference_player):
+                break
+
+        self.store_bounded_cache(key, best_value, alpha_orig, beta_orig)
+        self.store_best_move(node_key, depth, best_move)
+        self._horizon_reached = self._horizon_reached or horizon_before
+        return best_value
+
+    def can_use_fast_path(self, player, reference_player) -> bool:
+        """
+        Indique si la recherche peut passer par le fast path du jeu (cf. Game.has_fast_path) : il faut un jeu à 2 joueurs qui l'implémente,
+        ni cache persistant ni évaluateur (qui travaillent sur les états génériques), et des joueurs de la partie (side = index dans game.players).
+        """
+        players = self.game.players
+        return (self.fast_path and self.cache is None and self.evaluator is None
+                and len(players) == 2 and player in players and reference_player in players)
+
+    def minimax_fast(self, code: int, side: int, reference_side: int, depth: int, max_depth=None) -> int:
+        """
+        minimax_classic sur le fast path du jeu : l'état est un code entier, le joueur qui doit jouer est l'index side.
+        Mêmes valeurs que minimax_classic, sans copie d'état ni liste de coups.
+        """
+
+        game = self.game
+        self.count_node()
+        legal = game.legal_moves_mask(code)
+        if not legal or game.get_winner_index(code) >= 0:
+            return game.get_fast_score(code, reference_side, depth)
+
+        if self.use_proven_results:
+            proven_score = game.get_fast_proven_score(code, reference_side, depth, side)
+            if proven_score is not None:
+                return proven_score
+
+        if max_depth is not None and depth >= max_depth:
+            return game.get_fast_heuristic(code, reference_side, depth)
+
+        maximizing = side == reference_side
+        best_value = -float('inf') if maximizing else float('inf')
+        for move in game.get_fast_move_order():
+            if legal >> move & 1:
+                value = self.minimax_fast(game.make_move(code, move, side), 1 - side, reference_side, depth + 1, max_depth)
+                if maximizing:
+                    best_value = max(best_value, value)
+                else:
+                    best_value = min(best_value, value)
+        return best_value
+
+    def minimax_ab_fast(self, code: int, side: int, reference_side: int, depth: int, max_depth=None, alpha=-float('inf'), beta=float('inf')) -> int:
+        """
+        minimax_ab sur le fast path du jeu (fail-soft) : même valeur exacte dans la fenêtre ]alpha, beta[.
+        Les coups sont essayés dans l'ordre de game.get_fast_move_order, précédés du dernier coup ayant provoqué une coupure
+        à la même profondeur (killer) : le nb de noeuds peut différer de celui de minimax_ab.
+        """
+
+        game = self.game
+        self.count_node()
+        legal = game.legal_moves_mask(code)
+        if not legal or game.get_winner_index(code) >= 0:
+            return game.get_fast_score(code, reference_side, depth)
+
+        if self.use_proven_results:
+            proven_score = game.get_fast_proven_score(code, reference_side, depth, side)
+            if proven_score is not None:
+                return proven_score
+
+        if max_depth is not None and depth >= max_depth:
+            self._horizon_reached = True
+            return game.get_fast_heuristic(code, reference_side, depth)
+
+        maximizing = side == reference_side
+        best_value = -float('inf') if maximizing else float('inf')
+        killers = self._fast_killers
+        if len(killers) <= depth:
+            killers.extend([None] * (depth + 1 - len(killers)))
+        killer = killers[depth]
+        moves = game.get_fast_move_order()
+        if killer is not None and legal >> killer & 1:
+            moves = (killer,) + moves                   # le coup qui a provoqué la dernière coupure à cette profondeur d'abord
+        for move in moves:
+            if legal >> move & 1:
+                legal &= ~(1 << move)                   # chaque coup n'est joué qu'une fois (killer en tête)
+                value = self.minimax_ab_fast(game.make_move(code, move, side), 1 - side, reference_side, depth + 1, max_depth, alpha, beta)
+                if maximizing:
+                    if value > best_value:
+                        best_value = value
+                    if value > alpha:
+                        alpha = value
+                else:
+                    if value < best_value:
+                        best_value = value
+                    if value < beta:
+                        beta = value
+                if alpha >= beta:
+                    killers[depth] = move
+                    break                           # coupure alpha-beta
+        return best_value
+
+    def probe_bounded_cache(self, state, player, reference_player, depth, max_depth, alpha, beta):
+        """
+        Consulte le cache pour un noeud de recherche bornée (alpha-beta, PVS).
+
+        Returns:
+        - (valeur, clé) si le cache contient la valeur exacte ou une borne suffisante pour la fenêtre ]alpha, beta[,
+        - (None, clé) sinon (clé = None s'il n'y a pas de cache).
+        """
+
+        if self.cache is None:
+            return None, None
+
+        key = self.get_cache_key(state, player, depth, f"classic|{reference_player.symbol}|{max_depth}")
+        cached = self.cache.get(key)
+        if cached is not None:
+            value, flag, horizon = cached
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                self._horizon_reached = self._horizon_reached or horizon
+                return value, key
+        return None, key
+
+    def store_bounded_cache(self, key, value, alpha, beta) -> None:
+        """
+        Enregistre dans le cache le résultat d'un noeud de recherche bornée cherché dans la fenêtre ]alpha, beta[ :
+        borne supérieure si value <= alpha, borne inférieure si value >= beta, valeur exacte sinon.
+        """
+
+        if key is None:
+            return
+        flag = UPPER if value <= alpha else LOWER if value >= beta else EXACT
+        self.cache.put(key, value, flag, self._horizon_reached)
+
+    @tracked_search
+    def get_best_move_pvs(self, state, player, reference_player, all_against_ref_player, max_depth: int, deadline: float = None, **kwargs) -> int:
+        """
+        Recherche PVS (Principal Variation Search / NegaScout) en approfondissement itératif avec fenêtres d'aspiration.
+
+        - A chaque itération (profondeur 1, 2, ... max_depth, au moins une itération même si max_depth vaut 0), le premier coup de chaque noeud est cherché avec la fenêtre complète,
+          les suivants avec une fenêtre nulle : ils ne sont recherchés à nouveau que s'ils s'avèrent meilleurs.
+        - Les coups de la variation principale (PV) de l'itération précédente sont essayés en premier.
+        - Chaque itération est d'abord lancée dans une fenêtre [valeur précédente ± aspiration_window],
+          puis relancée en fenêtre complète si la valeur tombe en dehors. La largeur dépend de l'échelle des scores du jeu (Game.ASPIRATION_WINDOW) :
+          trop étroite, les relances coûtent plus que la fenêtre n'économise ; sans fenêtre (None), chaque itération est cherchée en fenêtre complète.
+        - Si max_depth est None, l'approfondissement s'arrête dès qu'une itération n'a plus été coupée par l'horizon.
+        - Si l'échéance deadline est dépassée, l'itération en cours est abandonnée et le coup de la dernière itération complète est joué.
+        - Avec root_move_values, chaque coup de la racine est ensuite cherché en fenêtre complète à la profondeur de la dernière itération :
+          sa valeur exacte est donnée dans last_search["move_values"].
+
+        La PV, la valeur, la profondeur atteinte et le nb de noeuds sont disponibles dans self.last_search (et dans les logs).
+        La stratégie selfish est déléguée à get_best_move.
+        **kwargs permet de le rendre compatible avec les autres move_fn
+        """
+
+        if not all_against_ref_player:
+            return self.get_best_move(state, player, reference_player, all_against_ref_player, max_depth, deadline)
+
+        self.nodes = 0
+        book_move = self.get_book_move(state, player, reference_player, all_against_ref_player)
+        if book_move is not None:
+            return book_move
+
+        self._pv_table = []
+        self.move_ordering.new_search()
+        value, pv, depth = None, [], 0
+        move_values = {}
+        iteration_nodes = []                        # nb de noeuds de chaque itération (comparable à une recherche alpha-beta de même profondeur)
+        timeout = False
+
+        self.deadline = deadline
+        try:
+            while max_depth is None or depth < max(max_depth, 1):
+                self._horizon_reached = False
+                nodes_before = self.nodes
+
+                if value is None or self.aspiration_window is None:
+                    alpha, beta = -float('inf'), float('inf')
+                else:
+                    alpha, beta = value - self.aspiration_window, value + self.aspiration_window
+
+                new_value, new_pv = self.pvs(state, player, reference_player, 0, depth + 1, alpha, beta)
+                if new_value <= alpha or new_value >= beta:
+                    # hors de la fenêtre d'aspiration : la valeur n'est qu'une borne, on relance en fenêtre complète
+                    new_value, new_pv = self.pvs(state, player, reference_player, 0, depth + 1, -float('inf'), float('inf'))
+
+                depth += 1                          # profondeur de la dernière itération complète
+                value, pv = new_value, new_pv
+                self._pv_table = pv
+                iteration_nodes.append(self.nodes - nodes_before)
+
+                if not self._horizon_reached:
+                    break  # l'arbre a été entièrement exploré : approfondir ne changerait plus rien
+
+            if self.root_move_values:
+                next_player = self.game.get_next_player(player)
+                for move in self.game.get_possible_moves(state):
+                    next_state = self.game.apply_move(state, move, player)
+                    move_values[move] = self.pvs(next_state, next_player, reference_player, 1, depth, -float('inf'), float('inf'))[0]
+        except SearchTimeout:
+            timeout = True
+            move_values.clear()                     # valeurs incomplètes
+            if not pv:
+                pv = self.move_ordering.order_moves(state, self.game.get_possible_moves(state), 0, player)[:1]   # aucune itération complète
+        finally:
+            self.deadline = None
+
+        self.last_search = {"algorithm": "pvs", "depth": depth, "value": value, "pv": pv, "nodes": self.nodes, "iteration_nodes": iteration_nodes}
+        if move_values:
+            self.last_search["move_values"] = move_values
+        if timeout:
+            self.last_search["timeout"] = True
+        return pv[0] if pv else None
+
+    def pvs(self, state, player, reference_player, depth, max_depth, alpha, beta):
+        """
+        Noeud de la recherche PVS (cf. get_best_move_pvs).
+
+        Returns:
+        - (valeur, pv) : la valeur de l'état (ou une borne si elle sort de ]alpha, beta[)
+          et la suite de coups de la variation principale à partir de cet état.
+        """
+
+        self.count_node()
+        if self.game.is_terminal(state):
+            return self.game.get_score_by_symbol(state, reference_player.symbol, depth), []
+
+        proven_score = self.get_proven_score(state, reference_player.symbol, depth, player.symbol)
+        if proven_score is not None:
+            return proven_score, []
+
+        if max_depth is not None and depth >= max_depth:
+            self._horizon_reached = True
+            return self.get_heuristic(state, player, reference_player.symbol, depth), []
+
+        # la racine (depth 0) n'est jamais lue dans le cache pour que la PV contienne au moins le coup à jouer
+        key = None
+        if depth > 0:
+            cached, key = self.probe_bounded_cache(state, player, reference_player, depth, max_depth, alpha, beta)
+            if cached is not None:
+                return cached, []
+
+        if self.use_batched_frontier(depth, max_depth):
+            children = self.evaluate_frontier(state, player, reference_player, depth)
+            best_move, best_value = (max if player == reference_player else min)(children, key=lambda child: child[1])
+            return best_value, [best_move]
+
+        alpha_orig, beta_orig = alpha, beta
+        horizon_before, self._horizon_reached = self._horizon_reached, False
+        maximizing = player == reference_player
+        next_player = self.game.get_next_player(player)
+
+        node_key = self.get_node_key(state, player)
+        pv_move = self._pv_table[depth] if depth < len(self._pv_table) else self.get_hash_move(node_key)
+        moves = self.move_ordering.order_moves(state, self.game.get_possible_moves(state), depth, player, pv_move)
+
+        best_value = -float('inf') if maximizing else float('inf')
+        best_pv = []
+
+        for i, move in enumerate(moves):
+            next_state = self.game.apply_move(state, move, player)
+
+            if i == 0:
+                value, child_pv = self.pvs(next_state, next_player, reference_player, depth + 1, max_depth, alpha, beta)
+            elif maximizing:
+                # fenêtre nulle : on vérifie seulement que le coup ne dépasse pas alpha
+                value, child_pv = self.pvs(next_state, next_player, reference_player, depth + 1, max_depth, alpha, alpha + 1)
+                if alpha < value < beta:
+                    value, child_pv = self.pvs(next_state, next_player, reference_player, depth + 1, max_depth, value, beta)
+            else:
+                # fenêtre nulle : on vérifie seulement que le coup ne descend pas sous beta
+                value, child_pv = self.pvs(next_state, next_player, reference_player, depth + 1, max_depth, beta - 1, beta)
+                if alpha < value < beta:
+                    value, child_pv = self.pvs(next_state, next_player, reference_player, depth + 1, max_depth, alpha, value)
+
+            if (maximizing and value > best_value) or (not maximizing and value < best_value):
+                best_value = value
+                best_pv = [move] + child_pv
+
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+
+            if alpha >= beta:
+                remaining_depth = max_depth - depth if max_depth is not None else len(moves)
+                self.move_ordering.record_cutoff(move, depth, player, remaining_depth)
+                break
+
+            if self.game.early_pruning_hook(next_state, depth + 1, value, max_depth, reference_player):
+                break
+
+        self.store_bounded_cache(key, best_value, alpha_orig, beta_orig)
+        self.store_best_move(node_key, depth, best_pv[0] if best_pv else None)
+        self._horizon_reached = self._horizon_reached or horizon_before
+        return best_value, best_pv
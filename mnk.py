@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Jun 11 10:27:35 2025
+
+@author: did
+
+Jeux m,n,k : plateau de m lignes et n colonnes, le premier joueur qui aligne k symboles (ligne, colonne ou diagonale) gagne.
+TicTacToe est le jeu 3,3,3 ; les plateaux plus grands (4,4,4, 5,5,4...) sont hors de portée d'un Minimax complet
+mais peuvent être résolus par ProofNumberSearch (cf. proof_number.py).
+
+Comme dans TicTacToe, l'état est une liste de m * n symboles et un move est l'index d'une case (ligne par ligne).
+"""
+
+from operator import itemgetter
+from game import Game
+from tictactoe import TicTacToe, StateType, Move, get_line_masks
+from typing import List
+
+
+class MNKGame(TicTacToe):
+
+    HEURISTIC_WEIGHTS = None              # heuristique et scores propres, non paramétrés
+
+    def __init__(self, m: int = 4, n: int = 4, k: int = 4, all_against_ref_player = True, players_ui: bool = True):
+        self.m, self.n, self.k = m, n, k
+        self.ACTION_SIZE = m * n
+        self.WINNING_COMBINATIONS = self.get_winning_combinations(m, n, k)
+        self.line_masks = get_line_masks(self.WINNING_COMBINATIONS)
+        self._line_getters = [itemgetter(*combo) for combo in self.WINNING_COMBINATIONS]     # lecture d'un alignement en un appel C
+        super().__init__([' '] * (m * n), all_against_ref_player, players_ui)
+
+    @staticmethod
+    def get_winning_combinations(m: int, n: int, k: int) -> List[List[int]]:
+        """
+        Retourne la liste des alignements gagnants (listes de k index de cases) d'un plateau m x n.
+        """
+        combinations = []
+        for row in range(m):
+            for col in range(n):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col = row + (k - 1) * d_row, col + (k - 1) * d_col
+                    if 0 <= end_row < m and 0 <= end_col < n:
+                        combinations.append([(row + i * d_row) * n + col + i * d_col for i in range(k)])
+        return combinations
+
+    def print_help(self):
+        print("How to play:")
+        print(f"- Align {self.k} symbols in a row, a column or a diagonal of the {self.m}x{self.n} board to win.")
+        print(f"- Choose a move by entering the number of a cell, from 0 (top-left) to {self.m * self.n - 1} (bottom-right), row by row.")
+        print("- Type '?' or 'help' to display these instructions again.")
+
+    def get_winner_by_symbol(self, state: StateType) -> str | None:
+        k = self.k
+        for line_getter in self._line_getters:
+            line = line_getter(state)
+            if line[0] != ' ' and line.count(line[0]) == k:
+                return line[0]
+        return None
+
+    def get_score_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        Victoire : 10 * (nb de cases + 1 - depth) (une victoire rapide vaut plus), défaite : l'opposé, match nul : 0.
+        """
+        winner_symbol = self.get_winner_by_symbol(state)
+        if winner_symbol is None:
+            return 0
+        score = 10 * (self.m * self.n + 1 - depth)
+        return score if winner_symbol == reference_player_symbol else -score
+
+    def get_proven_score(self, state: StateType, reference_player_symbol: str, depth: int, player_symbol: str = None) -> int | None:
+        # un nul vaut 0 quelles que soient les cases occupées : le score par défaut de Game est exact
+        return Game.get_proven_score(self, state, reference_player_symbol, depth, player_symbol)
+
+    def get_heuristic_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        +1 pour chaque alignement où il ne manque qu'un symbole au joueur de référence, -1 pour l'adversaire.
+        """
+        opponent_symbol = self.get_next_player_by_symbol(reference_player_symbol)
+        score = 0
+        for combo in self.WINNING_COMBINATIONS:
+            line = [state[i] for i in combo]
+            if line.count(' ') == 1:
+                if line.count(reference_player_symbol) == self.k - 1:
+                    score += 1
+                elif line.count(opponent_symbol) == self.k - 1:
+                    score -= 1
+        return score
+
+    def get_possible_moves(self, state: StateType) -> List[Move]:
+        return [i for i in range(self.m * self.n) if state[i] == ' ']
+
+    def get_move_hints(self, state: StateType, moves: List[Move], player) -> dict:
+        """
+        2 pour un coup qui complète un alignement du joueur (victoire), 1 pour un coup qui bloque un alignement adverse.
+        """
+        hints = {}
+        for combo in self.WINNING_COMBINATIONS:
+            line = [state[i] for i in combo]
+            if line.count(' ') != 1:
+                continue
+            symbols = set(line) - {' '}
+            if len(symbols) != 1:
+                continue
+            move = combo[line.index(' ')]
+            priority = 2 if player.symbol in symbols else 1
+            hints[move] = max(hints.get(move, 0), priority)
+        return hints
+
+    def apply_move(self, state: StateType, move: Move, player) -> StateType:
+        new_state = list(state)                         # l'état est une liste plate de symboles : une copie superficielle suffit (pas de deepcopy)
+        new_state[move] = player.symbol
+        return new_state
+
+    def state_to_tensor(self, state: StateType, player):
+        """
+        Encode l'état du point de vue de player en un tableau NumPy int8 de forme (3, m, n) :
+        plan 0 = cases de player, plan 1 = cases de l'adversaire, plan 2 = cases vides.
+        """
+        import numpy as np                              # import local : NumPy n'est nécessaire que pour les réseaux de neurones
+
+        cells = np.array(state).reshape(self.m, self.n)
+        mine = cells == player.symbol
+        empty = cells == ' '
+        return np.stack([mine, ~mine & ~empty, empty]).astype(np.int8)
+
+    def print_state_from_str(self, state) -> None:
+        width = max(len(str(self.m * self.n - 1)), 1)
+        separator = "═" * (width + 2)
+        print("\t╔" + "╦".join([separator] * self.n) + "╗")
+        for row in range(self.m):
+            print("\t║" + "║".join(f" {str(state[row * self.n + col]):^{width}} " for col in range(self.n)) + "║")
+            if row < self.m - 1:
+                print("\t╠" + "╬".join([separator] * self.n) + "╣")
+        print("\t╚" + "╩".join([separator] * self.n) + "╝")
+
+
+if __name__ == "__main__":
+    my_game = MNKGame(4, 4, 3)
+    my_game.start(max_depth=4, log=True)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Jun  3 09:41:18 2025
+
+@author: did
+
+Ordonnancement des coups réutilisable par tous les moteurs de recherche bornée (alpha-beta, PVS...).
+
+Plus les bons coups sont essayés tôt, plus les coupures arrivent tôt. Les coups candidats sont triés par :
+    1. le coup de la variation principale (s'il est fourni),
+    2. les indices tactiques fournis par le jeu (Game.get_move_hints : coup gagnant, coup qui bloque...),
+    3. les coups "killer" : coups ayant provoqué une coupure au même ply dans une autre branche,
+    4. la table d'historique : somme des coupures provoquées par le coup, pondérée par la profondeur restante.
+"""
+
+
+class MoveOrdering:
+    """
+    Service d'ordonnancement des coups : killers par ply et table d'historique.
+
+    Usage dans un moteur :
+        moves = ordering.order_moves(state, moves, ply, player)
+        ...
+        if alpha >= beta:
+            ordering.record_cutoff(move, ply, player, remaining_depth)
+    """
+
+    PV_BONUS = 1 << 40               # le coup de la PV passe toujours en premier
+    HINT_BONUS = 1 << 30             # puis les indices tactiques du jeu (multipliés par leur valeur)
+    KILLER_BONUS = 1 << 20           # puis les killers (le plus récent d'abord)
+
+    def __init__(self, game, nb_killers: int = 2):
+        self.game = game
+        self.nb_killers = nb_killers
+        self.killers = []            # self.killers[ply] = liste des derniers coups ayant provoqué une coupure à ce ply
+        self.history = {}            # {(symbole du joueur, move) : score d'historique}
+
+    def clear(self) -> None:
+        """
+        Oublie les killers et l'historique (par exemple en début de partie).
+        """
+        self.killers = []
+        self.history = {}
+
+    def new_search(self) -> None:
+        """
+        A appeler au début de chaque recherche : les killers (liés aux plies de la recherche précédente) sont oubliés
+        et l'historique est divisé par 2 pour que les coupures récentes pèsent davantage.
+        """
+        self.killers = []
+        self.history = {key: score // 2 for key, score in self.history.items() if score > 1}
+
+    def record_cutoff(self, move, ply: int, player, remaining_depth: int) -> None:
+        """
+        Enregistre un coup ayant provoqué une coupure au ply donné.
+        """
+
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.nb_killers:]
+
+        key = (player.symbol, move)
+        self.history[key] = self.history.get(key, 0) + remaining_depth * remaining_depth
+
+    def order_moves(self, state, moves, ply: int, player, pv_move=None) -> list:
+        """
+        Retourne les coups triés du plus prometteur au moins prometteur (tri stable : à score égal, l'ordre du jeu est conservé).
+        """
+
+        hints = self.game.get_move_hints(state, moves, player)
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history
+        symbol = player.symbol
+
+        def score(move):
+            value = history.get((symbol, move), 0)
+            if move == pv_move:
+                value += self.PV_BONUS
+            if move in hints:
+                value += self.HINT_BONUS * hints[move]
+            if move in killers:
+                value += self.KILLER_BONUS * (self.nb_killers - killers.index(move))
+            return value
+
+        return sorted(moves, key=score, reverse=True)
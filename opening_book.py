@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Jun  2 10:12:37 2025
+
+@author: did
+
+Bibliothèque d'ouvertures générique, utilisable par n'importe quelle sous-classe de Game.
+
+Le livre est construit hors ligne :
+    - à partir de recherches profondes (build_from_search) : chaque coup des premières positions est évalué par Minimax,
+    - à partir des statistiques de victoire des parties enregistrées dans game_logs (build_from_logs).
+
+Il est sauvegardé dans un fichier binaire compact dont les enregistrements sont triés par hash d'état,
+puis consulté par les moteurs (Minimax.get_best_move...) avant toute recherche.
+Les valeurs des recherches dépendant des poids de l'heuristique (cf. tuning.py), le fichier garde l'empreinte des poids
+du jeu au moment de la sauvegarde : un livre construit avec d'autres poids est refusé au chargement.
+
+Exemple :
+    book = OpeningBook(my_game)
+    book.build_from_search(max_plies=2)
+    book.build_from_logs()
+    book.save()
+
+    my_game.opening_book = OpeningBook.load(my_game)
+"""
+
+import os
+import json
+import glob
+import random
+import struct
+from array import array
+from bisect import bisect_left
+
+
+class OpeningBook:
+    """
+    Livre d'ouvertures : associe au hash d'un état (et du joueur qui doit jouer) la liste des coups connus,
+    chacun avec une valeur (plus elle est élevée, meilleur est le coup pour le joueur qui joue) et un poids.
+
+    Parmi les coups de meilleure valeur, le coup joué est tiré au hasard proportionnellement aux poids.
+    """
+
+    MAGIC = b"AIGB"
+    VERSION = 3
+    HEADER = struct.Struct("<4sHIQ")         # magic, version, nb d'enregistrements, empreinte des poids de l'heuristique
+    RECORD = struct.Struct("<Qiii")          # hash d'état, move, valeur, poids
+
+    def __init__(self, game):
+        self.game = game
+        self.entries = {}                    # {hash : {move : [value, weight]}}, utilisé pendant la construction
+        self.keys = array("Q")               # hashes triés (un par enregistrement), utilisés pour la recherche dichotomique
+        self.records = []                    # (move, value, weight) dans le même ordre que self.keys
+
+    def __len__(self):
+        return len(self.keys) if self.keys else sum(len(moves) for moves in self.entries.values())
+
+    @staticmethod
+    def get_default_path(game) -> str:
+        """
+        Retourne le chemin par défaut du livre : opening_books/<NomClasse>.book
+        """
+        class_name = game.__class__.__name__
+        return os.path.join("opening_books", f"{class_name}.book")
+
+    def add(self, key: int, move: int, value: int, weight: int = 1) -> None:
+        """
+        Ajoute (ou remplace) un coup pour l'état de hash key.
+        """
+        self.entries.setdefault(key, {})[move] = [int(value), int(weight)]
+
+    def build_from_search(self, max_plies: int = 2, max_depth: int = None) -> None:
+        """
+        Construit le livre en évaluant par Minimax tous les coups des positions atteignables
+        en moins de max_plies coups depuis l'état initial, pour chaque joueur de départ possible.
+
+        Paramètres :
+        - max_plies : nombre de demi-coups couverts par le livre (2 => 1er et 2ème coups).
+        - max_depth : profondeur maximale de la recherche (None = recherche complète).
+        """
+
+        minimax = self.game.minimax
+        all_against_ref_player = self.game.all_against_ref_player
+
+        for starting_player in self.game.players:
+            frontier = [(self.game.initial_state, starting_player)]
+            for ply in range(max_plies):
+                next_frontier = []
+                for state, player in frontier:
+                    key = self.game.get_state_hash(state, player.symbol)
+                    if key in self.entries or self.game.is_terminal(state):
+                        continue
+                    next_player = self.game.get_next_player(player)
+                    for move in self.game.get_possible_moves(state):
+                        next_state = self.game.apply_move(state, move, player)
+                        # même évaluation que get_best_move : le joueur qui joue est le joueur de référence
+                        value = minimax.minimax(next_state, next_player, player, all_against_ref_player, 1, max_depth)
+                        self.add(key, move, value)
+                        next_frontier.append((next_state, next_player))
+                frontier = next_frontier
+
+    def build_from_logs(self, folder: str = None) -> None:
+        """
+        Complète le livre à partir des parties enregistrées par save_log (game_logs/<NomClasse> par défaut).
+
+        - Si un état est déjà connu par la recherche, les victoires observées s'ajoutent au poids du coup joué :
+          parmi les coups de même valeur, ceux qui gagnent le plus souvent seront joués plus souvent.
+        - Sinon, la valeur du coup est son bilan (victoires - défaites) et son poids le nombre de parties.
+        """
+
+        if folder is None:
+            folder = os.path.join("game_logs", self.game.__class__.__name__)
+
+        stats = {}                                  # {(hash, move) : [parties, victoires, défaites]}
+
+        for path in sorted(glob.glob(os.path.join(folder, "*.json"))):
+            with open(path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+            for game in log["games"]:
+                events = game["events"]
+                winner = events[-1].get("winner")
+                state_str = log["initial_state"]
+                for event in events[1:-1]:
+                    key = self.game.get_state_hash_from_str(state_str, event["player"])
+                    move = self.game.str_to_move(event["action"])        # les logs contiennent la forme textuelle des moves
+                    stat = stats.setdefault((key, move), [0, 0, 0])
+                    stat[0] += 1
+                    if winner == event["player"]:
+                        stat[1] += 1
+                    elif winner is not None:
+                        stat[2] += 1
+                    state_str = event["state"]
+
+        searched_keys = set(self.entries)
+
+        for (key, move), (games, wins, losses) in stats.items():
+            if key in searched_keys:
+                entry = self.entries[key].get(move)
+                if entry is not None:
+                    entry[1] += wins
+            else:
+                self.add(key, move, wins - losses, games)
+
+    def save(self, path: str = None) -> str:
+        """
+        Sauvegarde le livre dans un fichier binaire trié par hash d'état et retourne son chemin.
+        """
+
+        if path is None:
+            path = self.get_default_path(self.game)
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        records = sorted(
+            (key, move, value, weight)
+            for key, moves in self.entries.items()
+            for move, (value, weight) in moves.items()
+        )
+
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, len(records), self.game.get_heuristic_weights_fingerprint()))
+            for key, move, value, weight in records:
+                f.write(self.RECORD.pack(key, move, value, weight))
+
+        return path
+
+    @classmethod
+    def load(cls, game, path: str = None) -> "OpeningBook":
+        """
+        Charge un livre sauvegardé par save(), avec les mêmes poids de l'heuristique que le jeu.
+        """
+
+        if path is None:
+            path = cls.get_default_path(game)
+
+        book = cls(game)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, count, fingerprint = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"'{path}' is not a valid opening book (version {cls.VERSION}).")
+        if fingerprint != game.get_heuristic_weights_fingerprint():
+            raise ValueError(f"'{path}' was built with other heuristic weights: rebuild it.")
+
+        offset = cls.HEADER.size
+        for _ in range(count):
+            key, move, value, weight = cls.RECORD.unpack_from(data, offset)
+            book.keys.append(key)
+            book.records.append((move, value, weight))
+            offset += cls.RECORD.size
+
+        return book
+
+    def probe(self, state, player) -> list:
+        """
+        Retourne la liste des (move, value, weight) connus pour cet état et ce joueur (liste vide si inconnu).
+        """
+
+        key = self.game.get_state_hash(state, player.symbol)
+
+        if key in self.entries:
+            return [(move, value, weight) for move, (value, weight) in self.entries[key].items()]
+
+        i = bisect_left(self.keys, key)
+        found = []
+        while i < len(self.keys) and self.keys[i] == key:
+            found.append(self.records[i])
+            i += 1
+        return found
+
+    def get_move(self, state, player) -> int | None:
+        """
+        Retourne un coup du livre pour cet état, ou None si l'état n'est pas dans le livre.
+        Parmi les coups de meilleure valeur, le choix est aléatoire et pondéré par les poids.
+        """
+
+        candidates = self.probe(state, player)
+        if not candidates:
+            return None
+
+        best_value = max(value for _, value, _ in candidates)
+        best = [(move, weight) for move, value, weight in candidates if value == best_value]
+        moves, weights = zip(*best)
+        return random.choices(moves, weights=[max(weight, 1) for weight in weights])[0]
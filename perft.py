@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Jun 21 09:32:18 2025
+
+@author: did
+
+Perft : comptage exhaustif des positions à chaque profondeur de l'arbre de jeu, pour vérifier la génération des coups
+(get_possible_moves, apply_move, is_terminal) et la représentation des états après chaque optimisation, et en mesurer le débit.
+
+perft(d) est le nb de positions atteintes après exactement d coups depuis la position de départ (une position terminale
+n'a pas d'enfant). Les comptes sont comparés aux références connues du jeu (REFERENCE_COUNTS, depuis l'état initial et
+le premier joueur) : toute différence signale une règle cassée. En mode divide, chaque compte est détaillé par coup de la racine,
+pour retrouver la branche fautive en comparant avec un outil de référence.
+
+Options :
+    - move_generator : nom d'une autre méthode de génération de coups du jeu (ex : get_possible_moves_faster de TicTacToePlus).
+      Un générateur qui élague (coups choisis parmi les coups légaux) ne peut pas reproduire les références :
+      en mode strict, on vérifie alors que ses coups sont des coups légaux distincts (et qu'il en propose au moins un).
+    - fast_path : comptage sur le fast path du jeu (encode_state, legal_moves_mask, make_move, get_winner_index),
+      qui doit redonner les comptes des méthodes génériques.
+    - strict : vérifie aussi à chaque position que apply_move ne modifie pas l'état d'origine.
+Le débit est donné en coups générés par seconde (les feuilles sont comptées sans être jouées, comme dans un perft classique).
+
+Exemple :
+    python perft.py tictactoe:TicTacToe --depth 9
+    python perft.py connect_four:ConnectFour --depth 8 --fast-path --divide
+    python perft.py tictactoe:TicTacToePlus --move-generator get_possible_moves_faster --strict
+"""
+
+import sys
+import argparse
+from time import perf_counter
+from engine_daemon import load_game_class
+
+
+#perft(1), perft(2)... depuis l'état initial, le premier joueur ayant le trait (clé : cf. get_reference_key)
+REFERENCE_COUNTS = {
+    "TicTacToe": (9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872),
+    "TicTacToePlus": (9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872),
+    "MNKGame(3,3,3)": (9, 72, 504, 3024, 15120, 54720, 148176, 200448, 127872),
+    "MNKGame(4,4,4)": (16, 240, 3360, 43680, 524160, 5765760),
+    "ConnectFour": (7, 49, 343, 2401, 16807, 117649, 823536, 5673234),
+    "UltimateTicTacToe": (81, 720, 6336, 55080, 473256, 4020960),
+}
+
+
+class PerftError(Exception):
+    """
+    Erreur de génération de coups détectée en mode strict.
+    """
+
+
+def get_reference_key(game) -> str:
+    """
+    Clé du jeu dans REFERENCE_COUNTS : nom de la classe, suivi des dimensions pour les jeux m,n,k.
+    """
+    name = game.__class__.__name__
+    if all(hasattr(game, attribute) for attribute in ("m", "n", "k")):
+        name += f"({game.m},{game.n},{game.k})"
+    return name
+
+
+class Perft:
+    """
+    Comptage perft d'un jeu.
+
+    Paramètres :
+    - game : le jeu, avec ses joueurs (cf. create_headless).
+    - move_generator : nom de la méthode du jeu qui génère les coups d'un état (par défaut get_possible_moves).
+    - fast_path : True pour compter sur le fast path du jeu (jeux à 2 joueurs, cf. Game.has_fast_path).
+    - strict : True pour vérifier les coups générés et l'immuabilité des états (plus lent).
+    """
+
+    def __init__(self, game, move_generator: str = "get_possible_moves", fast_path: bool = False, strict: bool = False):
+        if fast_path and not (game.has_fast_path() and len(game.players) == 2):
+            raise ValueError(f"{game.__class__.__name__} has no fast path.")
+        if fast_path and move_generator != "get_possible_moves":
+            raise ValueError("the fast path generates its own moves (legal_moves_mask).")
+        self.game = game
+        self.move_generator = move_generator
+        self.generate_moves = getattr(game, move_generator)
+        self.fast_path = fast_path
+        self.strict = strict
+        self.nb_moves = 0                    # nb de coups générés par le dernier comptage
+
+    def get_reference_counts(self) -> tuple:
+        """
+        Retourne les comptes de référence du jeu, ou () si le jeu n'en a pas ou si le générateur de coups élague.
+        """
+        if self.move_generator != "get_possible_moves":
+            return ()
+        return REFERENCE_COUNTS.get(get_reference_key(self.game), ())
+
+    def get_moves(self, state) -> list:
+        moves = self.generate_moves(state)
+        if self.strict and self.generate_moves != self.game.get_possible_moves:
+            legal_moves = self.game.get_possible_moves(state)
+            if not moves or len(set(moves)) != len(moves) or not set(moves) <= set(legal_moves):
+                raise PerftError(f"{self.move_generator} returned {moves} in '{self.game.state_to_str(state)}' (legal moves : {legal_moves}).")
+        return moves
+
+    def count(self, state, player, depth: int) -> int:
+        """
+        perft(depth) depuis state, player ayant le trait, avec les méthodes génériques du jeu.
+        """
+        game = self.game
+        if game.is_terminal(state):
+            return 0
+        moves = self.get_moves(state)
+        self.nb_moves += len(moves)
+        if depth == 1:
+            return len(moves)
+
+        next_player = game.get_next_player(player)
+        total = 0
+        for move in moves:
+            if self.strict:
+                state_str = game.state_to_str(state)
+                next_state = game.apply_move(state, move, player)
+                if game.state_to_str(state) != state_str:
+                    raise PerftError(f"apply_move({game.move_to_str(move)}) modified the state '{state_str}'.")
+            else:
+                next_state = game.apply_move(state, move, player)
+            total += self.count(next_state, next_player, depth - 1)
+        return total
+
+    def count_fast(self, code: int, side: int, depth: int) -> int:
+        """
+        perft(depth) sur le fast path, depuis le code d'un état, le joueur d'index side ayant le trait.
+        """
+        game = self.game
+        if game.get_winner_index(code) >= 0:
+            return 0
+        legal = game.legal_moves_mask(code)
+        if depth == 1:
+            nb_moves = legal.bit_count()
+            self.nb_moves += nb_moves
+            return nb_moves
+
+        total = 0
+        for move in game.get_fast_move_order():
+            if legal >> move & 1:
+                self.nb_moves += 1
+                total += self.count_fast(game.make_move(code, move, side), 1 - side, depth - 1)
+        return total
+
+    def divide(self, depth: int, state=None, player=None) -> dict:
+        """
+        Retourne {coup de la racine (move_to_str) : perft(depth - 1) de son enfant}, dont la somme est perft(depth).
+        Par défaut depuis l'état initial du jeu, le premier joueur ayant le trait.
+        """
+        game = self.game
+        state = game.initial_state if state is None else state
+        player = player or game.players[0]
+        self.nb_moves = 0
+        if game.is_terminal(state):
+            return {}
+        counts = {}
+        for move in self.get_moves(state):
+            self.nb_moves += 1
+            next_state, next_player = game.apply_move(state, move, player), game.get_next_player(player)
+            if depth == 1:
+                counts[game.move_to_str(move)] = 1
+            elif self.fast_path:
+                counts[game.move_to_str(move)] = self.count_fast(game.encode_state(next_state), game.players.index(next_player), depth - 1)
+            else:
+                counts[game.move_to_str(move)] = self.count(next_state, next_player, depth - 1)
+        return counts
+
+    def perft(self, depth: int, state=None, player=None) -> int:
+        """
+        Retourne perft(depth), par défaut depuis l'état initial du jeu, le premier joueur ayant le trait.
+        """
+        game = self.game
+        state = game.initial_state if state is None else state
+        player = player or game.players[0]
+        self.nb_moves = 0
+        if self.fast_path:
+            return self.count_fast(game.encode_state(state), game.players.index(player), depth)
+        return self.count(state, player, depth)
+
+    def run(self, max_depth: int, divide: bool = False) -> list:
+        """
+        Calcule perft(1) à perft(max_depth) depuis l'état initial, les compare aux références et affiche chaque ligne :
+        profondeur, compte, référence, temps et débit (coups générés / s). Avec divide, la dernière profondeur est détaillée par coup.
+        Retourne la liste des résultats [{"depth", "nodes", "expected", "ok", "time_ms", "moves_per_s"}].
+        """
+
+        references = self.get_reference_counts()
+        results = []
+        for depth in range(1, max_depth + 1):
+            t_start = perf_counter()
+            nodes = self.perft(depth)
+            elapsed = perf_counter() - t_start
+            expected = references[depth - 1] if depth <= len(references) else None
+            results.append({
+                "depth": depth,
+                "nodes": nodes,
+                "expected": expected,
+                "ok": expected is None or nodes == expected,
+                "time_ms": round(1000 * elapsed, 1),
+                "moves_per_s": int(self.nb_moves / elapsed) if elapsed else None,
+            })
+            self.print_result(results[-1])
+
+        if divide:
+            for move_str, nodes in self.divide(max_depth).items():
+                print(f"  {move_str} : {nodes}")
+        return results
+
+    @staticmethod
+    def print_result(result: dict) -> None:
+        if result["expected"] is None:
+            status = "(no reference)"
+        else:
+            status = "ok" if result["ok"] else f"MISMATCH (expected {result['expected']})"
+        print(f"perft({result['depth']}) = {result['nodes']}  {status}  {result['time_ms']} ms  {result['moves_per_s']} moves/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count the positions of the game tree at each depth and compare them with references.")
+    parser.add_argument("game", help="game class, as <module>:<Class> (e.g. tictactoe:TicTacToe)")
+    parser.add_argument("--depth", type=int, default=None, help="maximal depth (default: depth of the references, or 4)")
+    parser.add_argument("--divide", action="store_true", help="split the count of the maximal depth by root move")
+    parser.add_argument("--move-generator", default="get_possible_moves", help="name of the move generation method to check")
+    parser.add_argument("--fast-path", action="store_true", help="count with the fast path of the game")
+    parser.add_argument("--strict", action="store_true", help="also check the generated moves and that apply_move does not modify states")
+    args = parser.parse_args()
+
+    game_class = load_game_class(args.game)
+    game = game_class.create_headless(["random_move"] * (len(game_class.DEFAULT_SYMBOLS) or 2))
+    perft = Perft(game, args.move_generator, args.fast_path, args.strict)
+    results = perft.run(args.depth or len(perft.get_reference_counts()) or 4, args.divide)
+    sys.exit(0 if all(result["ok"] for result in results) else 1)
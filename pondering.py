@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Jun  9 15:44:10 2025
+
+@author: did
+
+Réflexion sur le temps de l'adversaire ("pondering").
+
+Après avoir joué, un bot dont move_fn est un moteur Minimax continue à chercher dans un thread d'arrière-plan :
+pour chaque réponse probable de l'adversaire (d'abord celle prévue par la variation principale, puis dans l'ordre de MoveOrdering),
+il calcule son propre meilleur coup dans la position qui en résulterait et le garde en mémoire.
+
+Quand le coup réel de l'adversaire arrive, la réflexion est arrêtée proprement (Minimax.stop_event) :
+si la position a déjà été analysée, le coup est joué sans nouvelle recherche.
+
+Le thread tourne sur un moteur Minimax distinct de celui du bot (les recherches ne partagent ni compteurs ni killers),
+mais avec le même cache persistant et le même évaluateur éventuels.
+A cause du GIL, la réflexion n'est utile que si l'adversaire n'occupe pas le processeur : Game ne l'active que contre un humain
+(get_human_move attend sur input()).
+
+Exemple :
+    my_game.start(log=True, ponder=True)
+"""
+
+import threading
+from minimax import Minimax
+
+
+class Ponderer:
+    """
+    Réflexion en arrière-plan d'un bot sur le temps de son adversaire.
+
+    Paramètres :
+    - game : le jeu.
+    - move_fn : move_fn du bot, méthode d'un moteur Minimax (get_best_move, get_best_move_ab, get_best_move_pvs...).
+    """
+
+    def __init__(self, game, move_fn):
+        bot_engine = move_fn.__self__
+        self.game = game
+        self.bot_engine = bot_engine
+        self.engine = Minimax(game, bot_engine.aspiration_window)
+        self.engine.cache = bot_engine.cache
+        self.engine.evaluator = bot_engine.evaluator
+        self.engine.stop_event = threading.Event()
+        self.search_fn = getattr(self.engine, move_fn.__name__)
+        self.results = {}                    # {hash de l'état et du joueur : (move, last_search)} des positions analysées
+        self.nb_hits = 0
+        self.nb_misses = 0
+        self._thread = None
+
+    @staticmethod
+    def can_ponder(move_fn) -> bool:
+        """
+        Indique si move_fn est une recherche Minimax (seuls les moteurs Minimax savent réfléchir en arrière-plan).
+        """
+        return isinstance(getattr(move_fn, "__self__", None), Minimax)
+
+    def start(self, state, opponent, player, all_against_ref_player, max_depth, expected_reply=None) -> None:
+        """
+        Lance la réflexion dans l'état state, où opponent doit jouer, pour préparer le prochain coup de player.
+        expected_reply : réponse attendue de l'adversaire (2ème coup de la PV du bot), analysée en premier.
+        """
+        self.stop()
+        self.results = {}
+        self.engine.advance_root(self.bot_engine.root_ply + 2)      # positions cherchées : après le coup du bot (pas encore notifié) et la réponse
+        self.engine.stop_event.clear()
+        self._thread = threading.Thread(target=self._ponder, args=(state, opponent, player, all_against_ref_player, max_depth, expected_reply), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Arrête la réflexion en cours et attend la fin du thread (la recherche interrompue est abandonnée).
+        """
+        if self._thread is not None:
+            self.engine.stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def get_move(self, state, player):
+        """
+        Retourne (move, last_search) si la position a été analysée pendant la réflexion, sinon None.
+        """
+        result = self.results.get(self.game.get_state_hash(state, player.symbol))
+        if result is None:
+            self.nb_misses += 1
+        else:
+            self.nb_hits += 1
+        return result
+
+    def _ponder(self, state, opponent, player, all_against_ref_player, max_depth, expected_reply) -> None:
+        stop_event = self.engine.stop_event
+        replies = self.engine.move_ordering.order_moves(state, self.game.get_possible_moves(state), 0, opponent, pv_move=expected_reply)
+
+        for reply in replies:
+            if stop_event.is_set():
+                return
+            next_state = self.game.apply_move(state, reply, opponent)
+            if self.game.is_terminal(next_state):
+                continue
+            move = self.search_fn(state=next_state, player=player, reference_player=player, all_against_ref_player=all_against_ref_player, max_depth=max_depth)
+            if self.engine.last_search.get("timeout"):
+                return                                    # recherche interrompue par stop() : son résultat est partiel
+            self.results[self.game.get_state_hash(next_state, player.symbol)] = (move, dict(self.engine.last_search))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Jun  7 09:21:06 2025
+
+@author: did
+
+Profilage des coups des bots pendant une session (run_1_vs_1, run_headless...).
+
+Le profileur déterministe de la bibliothèque standard (cProfile) est activé autour de move_fn :
+    - soit tous les every coups de bot (every=1 : tous les coups),
+    - soit sur tous les coups, en ne conservant que ceux qui ont duré au moins threshold_ms (coups lents).
+
+Les profils conservés sont agrégés sur toute la session (pstats) puis écrits à côté du log JSON par save_log :
+    - <log>.prof : profil agrégé, lisible par pstats ou snakeviz,
+    - <log>_profile.txt : fonctions les plus coûteuses (temps cumulé et temps propre).
+
+Exemple :
+    my_game.start(max_depth=4, log=True, profiler=MoveProfiler(every=5))
+    my_game.start(log=True, profiler=MoveProfiler(threshold_ms=200))
+
+Le module fournit aussi SearchMemoryTracker, qui mesure la mémoire allouée par une recherche (tracemalloc) :
+cf. Minimax.track_memory.
+"""
+
+import io
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from time import perf_counter
+
+
+class MoveProfiler:
+    """
+    Profileur des coups de bots, agrégé sur une session.
+
+    Paramètres :
+    - every : profile un coup de bot sur every (1 = tous les coups).
+    - threshold_ms : si précisé, tous les coups sont profilés mais seuls ceux d'au moins threshold_ms ms sont conservés.
+                     NB : la durée mesurée inclut le surcoût du profileur.
+    - top : nb de fonctions listées dans le résumé et le rapport texte.
+    """
+
+    def __init__(self, every: int = None, threshold_ms: float = None, top: int = 30):
+        if every is None and threshold_ms is None:
+            every = 1
+        self.every = every
+        self.threshold_ms = threshold_ms
+        self.top = top
+        self.stats = None                    # pstats.Stats agrégé des coups conservés
+        self.moves = []                      # coups conservés : {"game_number", "player", "move_index", "duration_ms"}
+        self.nb_bot_moves = 0
+
+    def should_profile(self) -> bool:
+        """
+        Indique si le prochain coup de bot doit être profilé.
+        """
+        if self.threshold_ms is not None:
+            return True
+        return self.nb_bot_moves % self.every == 0
+
+    def profile_move(self, move_fn, game_number: int, player_symbol: str, **kwargs):
+        """
+        Appelle move_fn(**kwargs) et retourne (move, profiled) où profiled indique si le profil du coup a été conservé.
+        """
+
+        move_index = self.nb_bot_moves
+        if not self.should_profile():
+            self.nb_bot_moves += 1
+            return move_fn(**kwargs), False
+        self.nb_bot_moves += 1
+
+        profile = cProfile.Profile()
+        t_start = perf_counter()
+        profile.enable()
+        try:
+            move = move_fn(**kwargs)
+        finally:
+            profile.disable()
+        duration_ms = 1000 * (perf_counter() - t_start)
+
+        if self.threshold_ms is not None and duration_ms < self.threshold_ms:
+            return move, False
+
+        profile.create_stats()
+        if self.stats is None:
+            self.stats = pstats.Stats(profile)
+        else:
+            self.stats.add(profile)
+        self.moves.append({
+            "game_number": game_number,
+            "player": player_symbol,
+            "move_index": move_index,
+            "duration_ms": round(duration_ms, 1)
+        })
+        return move, True
+
+    def get_hot_functions(self) -> list:
+        """
+        Retourne les top fonctions agrégées, triées par temps cumulé décroissant.
+        """
+        if self.stats is None:
+            return []
+        hot = []
+        for (filename, line, name), (_, nb_calls, own_time, cumulative_time, _) in self.stats.stats.items():
+            hot.append({
+                "function": f"{filename}:{line}({name})",
+                "calls": nb_calls,
+                "own_s": round(own_time, 4),
+                "cumulative_s": round(cumulative_time, 4)
+            })
+        hot.sort(key=lambda item: item["cumulative_s"], reverse=True)
+        return hot[:self.top]
+
+    def save(self, base_path: str) -> dict:
+        """
+        Ecrit <base_path>.prof et <base_path>_profile.txt et retourne le résumé à inclure dans le log JSON.
+        """
+
+        summary = {
+            "mode": f"threshold_ms={self.threshold_ms}" if self.threshold_ms is not None else f"every={self.every}",
+            "bot_moves": self.nb_bot_moves,
+            "profiled_moves": self.moves,
+            "hot_functions": self.get_hot_functions()
+        }
+        if self.stats is None:
+            return summary
+
+        prof_path = base_path + ".prof"
+        report_path = base_path + "_profile.txt"
+        self.stats.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(prof_path, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(stream.getvalue())
+
+        summary["prof_file"] = prof_path
+        summary["report_file"] = report_path
+        return summary
+
+
+class SearchMemoryTracker:
+    """
+    Mesure la mémoire allouée pendant une recherche (bloc with), à l'aide de tracemalloc.
+
+    Un thread échantillonne la mémoire tracée toutes les interval secondes et prend un instantané à chaque nouveau pic
+    (d'au moins 10 %) : les sites d'allocation retournés sont ceux des blocs vivants au pic, comparés à l'état avant la recherche.
+    Les allocations temporaires (listes de coups, copies d'états...) y apparaissent donc, pas seulement la mémoire conservée.
+
+    Paramètres :
+    - top : nb de sites d'allocation retournés.
+    - interval : période d'échantillonnage en secondes.
+
+    Après le bloc with, self.result contient :
+    - peak_kb : pic de mémoire allouée pendant la recherche (au-delà de la mémoire déjà allouée au départ),
+    - net_kb, net_blocks : mémoire et nb de blocs encore alloués à la fin (caches, tables...),
+    - peak_blocks : nb de blocs alloués par la recherche au dernier instantané de pic,
+    - top_sites : [{"site": "fichier:ligne", "kb", "blocks"}] des blocs alloués par la recherche au pic.
+    """
+
+    def __init__(self, top: int = 10, interval: float = 0.005):
+        self.top = top
+        self.interval = interval
+        self.result = None
+        self._started_tracing = False
+        self._baseline = None
+        self._peak_snapshot = None
+        self._peak_snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot()
+        self._start_size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            current = tracemalloc.get_traced_memory()[0] - self._start_size
+            if current > 1.1 * self._peak_snapshot_size:
+                self._peak_snapshot = tracemalloc.take_snapshot()
+                self._peak_snapshot_size = current
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        current, peak = tracemalloc.get_traced_memory()
+        end_snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        filters = [tracemalloc.Filter(False, path) for path in (tracemalloc.__file__, threading.__file__, __file__)]     # hors instrumentation elle-même
+        baseline = self._baseline.filter_traces(filters)
+        end_diff = end_snapshot.filter_traces(filters).compare_to(baseline, "lineno")
+        peak_diff = self._peak_snapshot.filter_traces(filters).compare_to(baseline, "lineno") if self._peak_snapshot else end_diff
+        peak_diff = [stat for stat in peak_diff if stat.size_diff > 0]
+        peak_diff.sort(key=lambda stat: stat.size_diff, reverse=True)
+
+        self.result = {
+            "peak_kb": round((peak - self._start_size) / 1024, 1),
+            "net_kb": round((current - self._start_size) / 1024, 1),
+            "net_blocks": sum(stat.count_diff for stat in end_diff),
+            "peak_blocks": sum(stat.count_diff for stat in peak_diff),
+            "top_sites": [
+                {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "kb": round(stat.size_diff / 1024, 1), "blocks": stat.count_diff}
+                for stat in peak_diff[:self.top]
+            ]
+        }
+        self._baseline = self._peak_snapshot = None
+        return False
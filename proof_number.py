@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Jun 12 09:05:17 2025
+
+@author: did
+
+Recherche par nombres de preuve en profondeur d'abord (df-pn) : résout des questions oui/non ("ce joueur a-t-il une victoire forcée ?")
+sans calculer de score exact, contrairement à Minimax.
+
+Pour chaque noeud, proof number (pn) = nb minimal de feuilles à prouver pour démontrer la victoire de l'attaquant,
+disproof number (dn) = nb minimal de feuilles à réfuter pour démontrer qu'il n'a pas de victoire forcée.
+- Noeud OU (l'attaquant joue) : pn = min des pn des enfants, dn = somme des dn.
+- Noeud ET (le défenseur joue) : pn = somme des pn des enfants, dn = min des dn.
+df-pn descend toujours vers l'enfant le plus prometteur (most-proving node) avec des seuils, en gardant pn et dn dans une table.
+
+La recherche est bornée :
+- en mémoire : la table est limitée à max_table_size entrées ; quand elle est pleine, la moitié des entrées
+  ayant demandé le moins de travail (nb de noeuds développés sous elles) est effacée (elles sont recalculées si besoin),
+- en temps : node_budget (nb de noeuds développés par question) et deadline (échéance au sens de time.perf_counter).
+
+Une question dépassant ses bornes reste non résolue (None). Le match nul est obtenu par deux questions :
+ni le joueur au trait ni son adversaire n'ont de victoire forcée.
+
+Ne s'applique qu'aux jeux à 2 joueurs qui alternent (get_next_player), sans cycle de positions (TicTacToe, MNKGame...).
+
+Exemple :
+    pns = ProofNumberSearch(MNKGame(4, 4, 3, players_ui=False))
+    pns.solve(state, player)                              # "win", "loss", "draw" ou None
+    pns.get_proof_tree(state, player, attacker=player)    # arbre de preuve {move : sous-arbre}
+"""
+
+from time import perf_counter
+from minimax import SearchTimeout
+
+INFINITY = 10 ** 9                          # pn ou dn d'un noeud résolu (plafond des sommes)
+
+WIN, LOSS, DRAW = "win", "loss", "draw"
+
+
+class ProofNumberSearch:
+    """
+    Moteur df-pn sur l'API générique de Game.
+
+    Paramètres :
+    - game : le jeu (à 2 joueurs).
+    - max_table_size : nb maximal d'entrées de la table des nombres de preuve.
+    - node_budget : nb maximal de noeuds développés par question (None : illimité).
+    - epsilon : facteur "1 + epsilon" appliqué au seuil de l'enfant le plus prometteur (1 : df-pn classique).
+                Un seuil un peu plus large évite de changer d'enfant à chaque itération et les re-développements qui en découlent.
+    """
+
+    def __init__(self, game, max_table_size: int = 1 << 20, node_budget: int = None, epsilon: float = 1.25):
+        self.game = game
+        self.max_table_size = max_table_size
+        self.node_budget = node_budget
+        self.epsilon = epsilon
+        self.table = {}                      # {(état, joueur au trait, attaquant) : [pn, dn, travail]}
+        self.nodes = 0                       # nb de noeuds développés par la question en cours
+        self.nb_collections = 0              # nb de nettoyages de la table (mémoire pleine)
+        self.deadline = None                 # échéance de la question en cours (time.perf_counter)
+        self.stop_event = None               # threading.Event optionnel : une fois levé, la question en cours s'arrête (cf. engine_daemon.py)
+        self.last_search = {}                # infos de la dernière recherche de get_best_move, loguées par run_1_vs_1
+
+    def clear(self) -> None:
+        """
+        Vide la table des nombres de preuve.
+        """
+        self.table = {}
+
+    def get_key(self, state, player, attacker) -> tuple:
+        return (self.game.state_to_str(state), player.symbol, attacker.symbol)
+
+    def evaluate_leaf(self, state, player, attacker) -> tuple:
+        """
+        Retourne (pn, dn) initiaux d'un noeud non développé :
+        - position terminale ou au résultat certain (Game.get_proven_result) : (0, INFINITY) si l'attaquant a gagné, sinon (INFINITY, 0)
+          (défaite ou nul : pas de victoire),
+        - sinon, initialisation par la mobilité : il faut réfuter tous les coups d'un noeud OU, prouver tous ceux d'un noeud ET.
+        """
+        if self.game.is_terminal(state):
+            return (0, INFINITY) if self.game.get_winner_by_symbol(state) == attacker.symbol else (INFINITY, 0)
+        proven_result = self.game.get_proven_result(state)                 #résultat certain (position morte...) : comme un état terminal
+        if proven_result is not None:
+            return (0, INFINITY) if proven_result == attacker.symbol else (INFINITY, 0)
+        nb_moves = len(self.game.get_possible_moves(state))
+        return (1, nb_moves) if player == attacker else (nb_moves, 1)
+
+    def prove(self, state, player, attacker, deadline: float = None) -> bool | None:
+        """
+        Cherche si attacker a une victoire forcée dans state, où player doit jouer.
+        Retourne True (prouvé), False (réfuté : défaite ou nul) ou None (budget ou échéance dépassés).
+        """
+        self.nodes = 0
+        self.deadline = deadline
+        key = self.get_key(state, player, attacker)
+        try:
+            self.mid(state, player, attacker, key, INFINITY, INFINITY)
+        except SearchTimeout:
+            return None
+        finally:
+            self.deadline = None
+        pn, dn, _ = self.table[key]
+        if pn == 0:
+            return True
+        if dn == 0:
+            return False
+        return None
+
+    def solve(self, state, player, deadline: float = None) -> str | None:
+        """
+        Résout state du point de vue de player (qui doit jouer) : WIN, LOSS, DRAW ou None si non résolu.
+        """
+        opponent = self.game.get_next_player(player)
+        player_wins = self.prove(state, player, player, deadline)
+        if player_wins is None:
+            return None
+        if player_wins:
+            return WIN
+        opponent_wins = self.prove(state, player, opponent, deadline)
+        if opponent_wins is None:
+            return None
+        return LOSS if opponent_wins else DRAW
+
+    def count_node(self) -> None:
+        """
+        Compte un noeud développé et lève SearchTimeout si node_budget ou l'échéance sont dépassés, ou si stop_event est levé.
+        """
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SearchTimeout()
+        if self.nodes % 256 == 0:
+            if self.deadline is not None and perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+
+    def mid(self, state, player, attacker, key, threshold_pn: int, threshold_dn: int) -> None:
+        """
+        Développe le noeud (state, player) jusqu'à ce que pn >= threshold_pn ou dn >= threshold_dn (Multiple Iterative Deepening),
+        puis enregistre ses nombres de preuve dans la table.
+        """
+
+        entry = self.table.get(key)
+        if entry is not None and (entry[0] >= threshold_pn or entry[1] >= threshold_dn):
+            return
+        self.count_node()
+        nodes_before = self.nodes
+
+        is_or_node = player == attacker
+        next_player = self.game.get_next_player(player)
+        children = []                        # [(clé, état, (pn, dn) initiaux)]
+        for move in self.game.get_possible_moves(state):
+            child_state = self.game.apply_move(state, move, player)
+            child_key = self.get_key(child_state, next_player, attacker)
+            children.append((child_key, child_state, self.evaluate_leaf(child_state, next_player, attacker)))
+
+        table = self.table
+        while True:
+            #nombres de preuve du noeud d'après ses enfants, et enfant le plus prometteur (avec le 2ème meilleur pour son seuil)
+            pn, dn = (INFINITY, 0) if is_or_node else (0, INFINITY)
+            best_index, best_value, second_value = None, INFINITY + 1, INFINITY
+            for index, (child_key, _, initial) in enumerate(children):
+                child_entry = table.get(child_key)
+                child_pn, child_dn = (child_entry[0], child_entry[1]) if child_entry is not None else initial
+                if is_or_node:
+                    pn, dn = min(pn, child_pn), min(dn + child_dn, INFINITY)
+                    value = child_pn
+                else:
+                    pn, dn = min(pn + child_pn, INFINITY), min(dn, child_dn)
+                    value = child_dn
+                if value < best_value:
+                    second_value = min(best_value, INFINITY)
+                    best_index, best_value, best_child = index, value, (child_pn, child_dn)
+                elif value < second_value:
+                    second_value = value
+
+            if pn >= threshold_pn or dn >= threshold_dn:
+                break
+
+            child_key, child_state, _ = children[best_index]
+            child_pn, child_dn = best_child
+            if is_or_node:
+                child_threshold_pn = min(threshold_pn, int(second_value * self.epsilon) + 1)
+                child_threshold_dn = threshold_dn - dn + child_dn
+            else:
+                child_threshold_pn = threshold_pn - pn + child_pn
+                child_threshold_dn = min(threshold_dn, int(second_value * self.epsilon) + 1)
+            self.mid(child_state, next_player, attacker, child_key, child_threshold_pn, child_threshold_dn)
+
+        self.store(key, pn, dn, self.nodes - nodes_before + 1)
+
+    def store(self, key, pn: int, dn: int, work: int) -> None:
+        """
+        Enregistre les nombres de preuve d'un noeud et le travail (nb de noeuds développés) qu'ils ont coûté.
+        Si la table est pleine, efface la moitié des entrées les moins coûteuses à recalculer.
+        """
+        entry = self.table.get(key)
+        if entry is not None:
+            entry[0], entry[1], entry[2] = pn, dn, entry[2] + work
+            return
+        if len(self.table) >= self.max_table_size:
+            self.collect()
+        self.table[key] = [pn, dn, work]
+
+    def collect(self) -> None:
+        """
+        Libère la moitié de la table en effaçant les entrées de plus petit travail.
+        """
+        self.nb_collections += 1
+        works = sorted(entry[2] for entry in self.table.values())
+        min_work = works[len(works) // 2]
+        for key in [key for key, entry in self.table.items() if entry[2] <= min_work]:
+            del self.table[key]                  # en place : mid garde une référence locale à la table
+
+    def get_solved_children(self, state, player, attacker, proven: bool) -> list:
+        """
+        Retourne [(move, état, joueur suivant, travail)] des enfants de state prouvés (proven=True) ou réfutés (proven=False)
+        d'un noeud lui-même prouvé ou réfuté.
+        Si un seul enfant suffit (coup de l'attaquant dans une preuve, du défenseur dans une réfutation), seuls les enfants résolus
+        dans la table sont retournés ; sinon tous les enfants le sont. Les enfants qui ne sont plus dans la table (effacés par collect)
+        sont résolus à nouveau si nécessaire.
+        """
+        next_player = self.game.get_next_player(player)
+        solved_index = 0 if proven else 1
+        one_is_enough = (player == attacker) == proven
+        solved, unknown = [], []
+        for move in self.game.get_possible_moves(state):
+            child_state = self.game.apply_move(state, move, player)
+            child_entry = self.table.get(self.get_key(child_state, next_player, attacker))
+            if child_entry is None and self.is_leaf(child_state):
+                child_entry = list(self.evaluate_leaf(child_state, next_player, attacker)) + [0]
+            if child_entry is not None and child_entry[solved_index] == 0:
+                solved.append((move, child_state, next_player, child_entry[2]))
+            elif child_entry is None or (child_entry[0] != 0 and child_entry[1] != 0):
+                unknown.append((move, child_state))
+
+        if solved and one_is_enough:
+            return solved
+        for move, child_state in unknown:
+            child_key = self.get_key(child_state, next_player, attacker)
+            self.mid(child_state, next_player, attacker, child_key, INFINITY, INFINITY)
+            child_entry = self.table[child_key]
+            if child_entry[solved_index] == 0:
+                solved.append((move, child_state, next_player, child_entry[2]))
+                if one_is_enough:
+                    break
+        return solved
+
+    def get_proof_tree(self, state, player, attacker) -> dict | None:
+        """
+        Retourne l'arbre de preuve (si attacker a une victoire forcée) ou de réfutation (sinon) de state, où player doit jouer :
+        {move (move_to_str) : sous-arbre}, une feuille étant {} (position terminale ou au résultat certain).
+        - preuve : un coup gagnant à chaque noeud de l'attaquant, toutes les réponses du défenseur,
+        - réfutation : tous les coups de l'attaquant, une réponse suffisante du défenseur.
+        Retourne None si la question n'a pas pu être résolue dans le budget.
+        """
+        proven = self.prove(state, player, attacker)
+        if proven is None:
+            return None
+        try:
+            return self._build_tree(state, player, attacker, proven)
+        except SearchTimeout:
+            return None
+
+    def is_leaf(self, state) -> bool:
+        """
+        Indique si state est résolu sans être développé : position terminale ou au résultat certain.
+        """
+        return self.game.is_terminal(state) or self.game.get_proven_result(state) is not None
+
+    def _build_tree(self, state, player, attacker, proven: bool) -> dict:
+        if self.is_leaf(state):
+            return {}
+        children = self.get_solved_children(state, player, attacker, proven)
+        if (player == attacker) == proven:
+            #un seul coup suffit : celui qui a demandé le moins de travail (preuve la plus simple)
+            children = [min(children, key=lambda child: child[3])]
+        return {self.game.move_to_str(move): self._build_tree(child_state, next_player, attacker, proven) for move, child_state, next_player, _ in children}
+
+    def get_principal_line(self, state, player, attacker, proven: bool) -> list:
+        """
+        Retourne une ligne de l'arbre de preuve (ou de réfutation) : le coup le plus simple pour le camp qui l'emporte,
+        la défense la plus coûteuse à réfuter pour l'autre camp.
+        La ligne est tronquée si des positions effacées de la table ne peuvent être résolues à nouveau dans le budget.
+        """
+        line = []
+        self.nodes = 0
+        while not self.is_leaf(state):
+            try:
+                children = self.get_solved_children(state, player, attacker, proven)
+            except SearchTimeout:
+                break
+            if (player == attacker) == proven:
+                move, state, player, _ = min(children, key=lambda child: child[3])
+            else:
+                move, state, player, _ = max(children, key=lambda child: child[3])
+            line.append(move)
+        return line
+
+    def get_best_move(self, state, player, reference_player, all_against_ref_player, max_depth: int = None, deadline: float = None, **kwargs):
+        """
+        move_fn de bot : joue un coup gagnant si la victoire est prouvée, sinon un coup qui ne perd pas si le nul est prouvé,
+        sinon (défaite prouvée) la défense la plus longue à réfuter.
+        Si la position n'est pas résolue dans le budget, joue le coup le plus proche d'une preuve (plus petit pn).
+        max_depth n'est pas utilisé (la recherche n'a pas d'horizon).
+        """
+
+        t_start = perf_counter()
+        opponent = self.game.get_next_player(player)
+        result = self.solve(state, player, deadline)
+        nodes = self.nodes
+
+        if result == WIN:
+            line = self.get_principal_line(state, player, player, proven=True)
+        elif result is not None:
+            line = self.get_principal_line(state, player, opponent, proven=(result == LOSS))
+        else:
+            line = []
+        if not line:
+            line = [self.get_most_proving_move(state, player)]
+
+        self.last_search = {
+            "algorithm": "df-pn",
+            "result": result,
+            "pv": line,
+            "nodes": nodes,
+            "table_size": len(self.table),
+            "time_ms": round(1000 * (perf_counter() - t_start), 1)
+        }
+        if result is None:
+            self.last_search["timeout"] = True
+        return line[0]
+
+    def get_most_proving_move(self, state, player):
+        """
+        Retourne le coup de player dont l'enfant a le plus petit pn (victoire de player) dans la table.
+        """
+        next_player = self.game.get_next_player(player)
+        best_move, best_pn = None, None
+        for move in self.game.get_possible_moves(state):
+            child_state = self.game.apply_move(state, move, player)
+            entry = self.table.get(self.get_key(child_state, next_player, player))
+            pn = entry[0] if entry is not None else self.evaluate_leaf(child_state, next_player, player)[0]
+            if best_pn is None or pn < best_pn:
+                best_move, best_pn = move, pn
+        return best_move
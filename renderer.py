@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Jun 14 09:33:52 2025
+
+@author: did
+
+Affichage des parties jouées par Game.run_1_vs_1 (plateaux et messages).
+
+Les print_colored_state des jeux font un print par ligne du plateau : entre deux bots, l'écriture dans le terminal
+coûte alors une part notable du temps de la partie. Un renderer regroupe ces écritures :
+    - AnsiRenderer : capture le plateau et les messages en attente et les écrit en une seule chaîne par image (frame),
+                     éventuellement une image tous les every coups (mode throttled : les messages ne sont pas perdus),
+    - NullRenderer : n'affiche rien (traitements batch, benchmarks).
+
+Les symboles colorisés (codes ANSI colorama) sont calculés une fois par jeu de couleurs des joueurs (Game.get_colored_symbols).
+
+Exemple :
+    my_game.start(max_depth=4, renderer=AnsiRenderer(every=10))      # bot contre bot : un plateau tous les 10 coups
+    my_game.start(max_depth=4, renderer=NullRenderer())
+"""
+
+import io
+import sys
+from contextlib import redirect_stdout
+
+
+class NullRenderer:
+    """
+    Renderer qui n'affiche rien : ni plateaux ni messages.
+    """
+
+    def message(self, text: str) -> None:
+        """
+        Ajoute une ligne de texte à la prochaine image.
+        """
+
+    def draw(self, game, state, players, force: bool = False) -> None:
+        """
+        Affiche l'état state (si c'est son tour dans le mode throttled, ou si force est True), précédé des messages en attente.
+        """
+
+    def flush(self) -> None:
+        """
+        Ecrit les messages en attente sans plateau (avant un input(), en fin de partie...).
+        """
+
+
+class AnsiRenderer(NullRenderer):
+    """
+    Renderer bufferisé pour terminal ANSI.
+
+    Paramètres :
+    - every : n'affiche le plateau qu'un coup sur every (1 : à chaque coup). Les images forcées (début et fin de partie,
+              avant le tour d'un humain) sont toujours affichées.
+    - stream : flux de sortie (par défaut sys.stdout au moment de l'écriture).
+    """
+
+    def __init__(self, every: int = 1, stream=None):
+        self.every = every
+        self.stream = stream
+        self.pending = []                    # messages en attente de la prochaine image
+        self.nb_draws = 0                    # nb d'appels à draw (images affichées ou non)
+
+    def message(self, text: str) -> None:
+        self.pending.append(text + "\n")
+
+    def draw(self, game, state, players, force: bool = False) -> None:
+        self.nb_draws += 1
+        if not force and self.nb_draws % self.every != 0:
+            return
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):        # les print_colored_state des jeux écrivent dans le buffer
+            game.print_colored_state(state, players)
+        self.pending.append(buffer.getvalue())
+        self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        stream = self.stream or sys.stdout
+        stream.write("".join(self.pending))
+        stream.flush()
+        self.pending = []
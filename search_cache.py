@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Jun  4 14:03:52 2025
+
+@author: did
+
+Cache de recherche persistant, partagé entre les exécutions et entre les process.
+
+Le cache est un fichier de taille fixe projeté en mémoire (mmap) et organisé en table de hachage :
+    - chaque slot contient une clé 64 bits (hash de l'état, profondeur et mode de score) et une donnée 64 bits (valeur, type de borne...),
+    - un seul process écrit (verrou exclusif sur un fichier .lock), tous les autres lisent,
+    - pour qu'un lecteur ne puisse jamais utiliser un slot à moitié écrit, la clé est stockée XOR la donnée ("lockless hashing") :
+      un slot incohérent est simplement vu comme absent.
+
+Exemple :
+    my_game.minimax.cache = PersistentCache.open(my_game)     # game_logs/<NomClasse>/search_cache.bin
+"""
+
+import os
+import mmap
+import struct
+import hashlib
+
+try:
+    import fcntl
+except ImportError:                  # Windows : pas de verrou inter-process, le premier process à ouvrir le cache est l'écrivain
+    fcntl = None
+
+
+EXACT = 0                            # valeur exacte
+LOWER = 1                            # borne inférieure (coupure beta)
+UPPER = 2                            # borne supérieure (coupure alpha)
+
+
+class PersistentCache:
+    """
+    Table de transposition persistante, projetée en mémoire.
+
+    Paramètres :
+    - path : chemin du fichier de cache (créé s'il n'existe pas, cf. create).
+    - nb_slots : nombre de slots de la table (utilisé uniquement à la création du fichier).
+    - writer : True pour demander l'accès en écriture. Si un autre process écrit déjà, le cache est ouvert en lecture seule.
+    """
+
+    MAGIC = b"AIGC"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHQ")          # magic, version, nb de slots
+    SLOT = struct.Struct("<QQ")              # clé XOR donnée, donnée
+    BUCKET = 4                               # nb de slots consécutifs sondés pour une clé
+
+    def __init__(self, path: str, nb_slots: int = 1 << 20, writer: bool = True):
+        self.path = path
+        self.writable = False
+        self.hits = 0
+        self.misses = 0
+        self._lock_file = None
+
+        if writer:
+            self.writable = self._acquire_writer_lock()
+
+        self.create(path, nb_slots)
+
+        self._file = open(path, "r+b" if self.writable else "rb")
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+
+        magic, version, self.nb_slots = self.HEADER.unpack_from(self._mmap, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a valid search cache (version {self.VERSION}).")
+
+    @classmethod
+    def create(cls, path: str, nb_slots: int = 1 << 20) -> None:
+        """
+        Crée le fichier de cache vide (à sa taille définitive) s'il n'existe pas.
+        Le fichier est écrit sous un nom temporaire puis lié à path : un autre process voit soit aucun fichier, soit un fichier complet,
+        et si plusieurs process le créent en même temps, le premier lien l'emporte (un cache déjà rempli n'est jamais remplacé).
+        A appeler dans le process parent avant de lancer des process qui partagent le cache.
+        """
+        if os.path.isfile(path):
+            return
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, nb_slots))
+                f.truncate(cls.HEADER.size + nb_slots * cls.SLOT.size)
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                pass
+        finally:
+            os.remove(tmp_path)
+
+    @classmethod
+    def open(cls, game, path: str = None, **kwargs) -> "PersistentCache":
+        """
+        Ouvre le cache du jeu, par défaut game_logs/<NomClasse>/search_cache.bin
+        """
+        if path is None:
+            path = os.path.join("game_logs", game.__class__.__name__, "search_cache.bin")
+        return cls(path, **kwargs)
+
+    def _acquire_writer_lock(self) -> bool:
+        """
+        Tente de devenir l'unique écrivain du cache. Retourne False si un autre process l'est déjà.
+        """
+        if fcntl is None:
+            return True
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._lock_file = open(self.path + ".lock", "a")
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+        return True
+
+    def close(self) -> None:
+        """
+        Ecrit les modifications sur le disque et libère le fichier (et le verrou d'écriture).
+        """
+        if self._mmap is not None:
+            if self.writable:
+                self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+            self._file.close()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def make_key(state_hash: int, depth: int, mode: str) -> int:
+        """
+        Combine le hash d'un état, la profondeur à laquelle il est évalué et le mode de score (algorithme, joueur de référence,
+        max_depth...) en une clé 64 bits non nulle.
+        """
+        data = f"{state_hash}|{depth}|{mode}".encode("utf-8")
+        key = int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+        return key or 1
+
+    @staticmethod
+    def _pack(value: int, flag: int, horizon: bool) -> int:
+        # le bit 35 est toujours à 1 : une donnée nulle désigne un slot vide
+        return (value & 0xFFFFFFFF) | (flag << 32) | (int(horizon) << 34) | (1 << 35)
+
+    @staticmethod
+    def _unpack(data: int):
+        value = data & 0xFFFFFFFF
+        if value >= 1 << 31:
+            value -= 1 << 32
+        return value, (data >> 32) & 0b11, bool((data >> 34) & 1)
+
+    def get(self, key: int):
+        """
+        Retourne (valeur, type de borne, horizon_atteint) pour la clé, ou None si elle est absente.
+        """
+        start = key % self.nb_slots
+        for i in range(self.BUCKET):
+            offset = self.HEADER.size + ((start + i) % self.nb_slots) * self.SLOT.size
+            check, data = self.SLOT.unpack_from(self._mmap, offset)
+            if data and check ^ data == key:
+                self.hits += 1
+                return self._unpack(data)
+        self.misses += 1
+        return None
+
+    def put(self, key: int, value, flag: int = EXACT, horizon: bool = False) -> None:
+        """
+        Enregistre une valeur entière (les autres valeurs, par exemple infinies, sont ignorées).
+        Le slot de la même clé ou un slot vide du bucket est utilisé en priorité, sinon le premier slot du bucket est remplacé.
+        """
+        if not self.writable or not isinstance(value, int) or not -(1 << 31) <= value < (1 << 31):
+            return
+
+        start = key % self.nb_slots
+        target = None
+        for i in range(self.BUCKET):
+            offset = self.HEADER.size + ((start + i) % self.nb_slots) * self.SLOT.size
+            check, data = self.SLOT.unpack_from(self._mmap, offset)
+            if not data or check ^ data == key:
+                target = offset
+                break
+        if target is None:
+            target = self.HEADER.size + start * self.SLOT.size
+
+        data = self._pack(value, flag, horizon)
+        self.SLOT.pack_into(self._mmap, target, key ^ data, data)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Jun 22 10:05:41 2025
+
+@author: did
+
+Vérification des coupures de Minimax par les résultats certains (Minimax.use_proven_results, Game.get_proven_score) :
+une coupure ne doit jamais changer la valeur d'une recherche, seulement son coût.
+
+Toutes les positions non terminales atteignables depuis l'état initial (le premier joueur ayant le trait) et comptant au moins
+min_ply coups sont cherchées dans chaque mode, une fois avec use_proven_results et une fois sans :
+    - minimax : get_best_move en mode all_against_ref_player, valeur de chaque coup de la racine (move_values),
+    - selfish : get_best_move, chaque joueur maximisant son propre score (move_values),
+    - alphabeta : get_best_move_ab (valeur de la racine),
+    - pvs : get_best_move_pvs (valeur de la racine).
+Toute différence est une erreur du jeu (get_proven_result ou get_proven_score) ou du moteur.
+
+Exemple :
+    python search_check.py tictactoe:TicTacToe --min-ply 3
+    python search_check.py mnk:MNKGame --game-kwargs '{"m": 3, "n": 3, "k": 3}' --modes minimax,alphabeta
+"""
+
+import sys
+import json
+import argparse
+from engine_daemon import load_game_class
+
+
+MODES = ("minimax", "selfish", "alphabeta", "pvs")
+
+
+def get_positions(game, min_ply: int = 0, max_positions: int = None) -> list:
+    """
+    Retourne les positions non terminales atteignables depuis l'état initial, le premier joueur ayant le trait :
+    [(état, joueur au trait)] par ply croissant, sans doublon, à partir de min_ply coups joués.
+    """
+    positions = []
+    layer = {game.state_to_str(game.initial_state): (game.initial_state, game.players[0])}
+    ply = 0
+    while layer and (max_positions is None or len(positions) < max_positions):
+        next_layer = {}
+        for state, player in layer.values():
+            if game.is_terminal(state):
+                continue
+            if ply >= min_ply:
+                positions.append((state, player))
+            next_player = game.get_next_player(player)
+            for move in game.get_possible_moves(state):
+                next_state = game.apply_move(state, move, player)
+                next_layer.setdefault(game.state_to_str(next_state), (next_state, next_player))
+        layer, ply = next_layer, ply + 1
+    return positions[:max_positions]
+
+
+def search(game, state, player, mode: str, max_depth: int = None):
+    """
+    Retourne la valeur de la recherche du mode donné : {coup : valeur} pour minimax et selfish, la valeur de la racine sinon.
+    """
+    engine = game.minimax
+    engine.on_new_game()
+    if mode == "minimax":
+        engine.get_best_move(state, player, player, True, max_depth)
+        return engine.last_search["move_values"]
+    if mode == "selfish":
+        engine.get_best_move(state, player, player, False, max_depth)
+        return engine.last_search["move_values"]
+    if mode == "alphabeta":
+        engine.get_best_move_ab(state, player, player, True, max_depth)
+    else:
+        engine.get_best_move_pvs(state, player, player, True, max_depth)
+    return engine.last_search["value"]
+
+
+def check_proven_results(game, modes=MODES, min_ply: int = 0, max_positions: int = None, max_depth: int = None) -> dict:
+    """
+    Compare les recherches avec et sans use_proven_results sur les positions de get_positions.
+    Retourne {mode : [(état textuel, symbole du joueur au trait, valeur sans, valeur avec)]} des positions qui diffèrent.
+    """
+    game.opening_book = None                     # toutes les positions doivent être cherchées
+    engine = game.minimax
+    use_proven_results = engine.use_proven_results
+    mismatches = {mode: [] for mode in modes}
+    try:
+        for state, player in get_positions(game, min_ply, max_positions):
+            for mode in modes:
+                engine.use_proven_results = False
+                expected = search(game, state, player, mode, max_depth)
+                engine.use_proven_results = True
+                value = search(game, state, player, mode, max_depth)
+                if value != expected:
+                    mismatches[mode].append((game.state_to_str(state), player.symbol, expected, value))
+    finally:
+        engine.use_proven_results = use_proven_results
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that proven-result cuts never change the value of a search.")
+    parser.add_argument("game", help="game class, as <module>:<Class> (e.g. tictactoe:TicTacToe)")
+    parser.add_argument("--game-kwargs", default="{}", help="JSON parameters of the game constructor (e.g. '{\"m\": 3, \"n\": 3, \"k\": 3}')")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"comma-separated search modes among {', '.join(MODES)}")
+    parser.add_argument("--min-ply", type=int, default=0, help="only check positions with at least this many moves played")
+    parser.add_argument("--max-positions", type=int, default=None, help="maximal number of positions checked")
+    parser.add_argument("--depth", type=int, default=None, help="maximal search depth (default: full search)")
+    args = parser.parse_args()
+
+    game_class = load_game_class(args.game)
+    game = game_class.create_headless(["random_move"] * (len(game_class.DEFAULT_SYMBOLS) or 2), **json.loads(args.game_kwargs))
+    mismatches = check_proven_results(game, args.modes.split(","), args.min_ply, args.max_positions, args.depth)
+    for mode, positions in mismatches.items():
+        print(f"{mode} : {len(positions)} mismatch(es)")
+        for state_str, symbol, expected, value in positions[:10]:
+            print(f"  '{state_str}' {symbol} to move : {expected} without, {value} with proven results")
+    sys.exit(1 if any(mismatches.values()) else 0)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Jun  5 16:27:40 2025
+
+@author: did
+
+Génération de données d'entraînement par self-play (nécessite NumPy).
+
+Des bots de bot_move_fns jouent entre eux dans plusieurs process. Pour chaque position où un bot a cherché son coup,
+on enregistre :
+    - x  : l'état encodé du point de vue du joueur qui joue (Game.state_to_tensor), de forme fixe,
+    - pi : la distribution de coups issue de la recherche (taille Game.ACTION_SIZE),
+    - z  : le résultat final de la partie pour ce joueur (+1 victoire, 0 nul, -1 défaite).
+
+Les échantillons sont écrits dans des shards numérotés (shard_000000.npz, shard_000001.npz...) de shard_size positions au plus :
+chaque worker ne garde en mémoire qu'un shard à la fois. Un shard n'apparaît sous son nom définitif qu'une fois complet,
+si bien qu'une génération interrompue reprend simplement aux shards manquants.
+
+Exemple :
+    from tictactoe import TicTacToe
+    generator = SelfPlayGenerator(TicTacToe, ["alphabeta_best_move", "alphabeta_best_move"], "selfplay_data")
+    generator.run(nb_shards=100)
+"""
+
+import os
+import json
+import random
+import multiprocessing
+import numpy as np
+
+
+class SelfPlayGenerator:
+    """
+    Générateur de self-play parallèle et reprenable.
+
+    Paramètres :
+    - game_class : sous-classe de Game (doit implémenter state_to_tensor, ACTION_SIZE et accepter players_ui).
+    - bot_fn_names : noms des fonctions de bot_move_fns utilisées par chaque joueur.
+    - output_dir : dossier des shards.
+    - shard_size : nb maximal de positions par shard.
+    - max_depth : profondeur maximale de la recherche des bots.
+    - random_plies : nb de premiers coups joués au hasard pour diversifier les parties (non enregistrés).
+    - workers : nb de process (par défaut, le nb de CPU).
+    - seed : graine de base ; le shard i utilise seed + i, ce qui rend chaque shard reproductible.
+    - game_kwargs : paramètres passés au constructeur du jeu.
+    """
+
+    def __init__(self, game_class, bot_fn_names, output_dir: str, shard_size: int = 10000, max_depth: int = None,
+                 random_plies: int = 2, workers: int = None, seed: int = 0, game_kwargs: dict = None):
+        self.game_class = game_class
+        self.bot_fn_names = list(bot_fn_names)
+        self.output_dir = output_dir
+        self.shard_size = shard_size
+        self.max_depth = max_depth
+        self.random_plies = random_plies
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+        self.game_kwargs = game_kwargs or {}
+
+    @staticmethod
+    def get_shard_path(output_dir: str, index: int) -> str:
+        return os.path.join(output_dir, f"shard_{index:06d}.npz")
+
+    def run(self, nb_shards: int) -> list:
+        """
+        Génère les shards 0..nb_shards-1 qui n'existent pas encore et retourne la liste des chemins des shards produits.
+        Le fichier manifest.json du dossier résume la configuration et le nb de positions de chaque shard.
+        """
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        manifest_path = os.path.join(self.output_dir, "manifest.json")
+        manifest = {"shards": {}}
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        manifest["config"] = {
+            "game_class": self.game_class.__name__,
+            "bot_fn_names": self.bot_fn_names,
+            "shard_size": self.shard_size,
+            "max_depth": self.max_depth,
+            "random_plies": self.random_plies,
+            "seed": self.seed,
+        }
+
+        todo = [i for i in range(nb_shards) if not os.path.isfile(self.get_shard_path(self.output_dir, i))]
+        tasks = [(self.game_class, self.game_kwargs, self.bot_fn_names, self.output_dir, i, self.shard_size,
+                  self.max_depth, self.random_plies, self.seed + i) for i in todo]
+
+        produced = []
+        with multiprocessing.Pool(self.workers) as pool:
+            for index, path, nb_samples in pool.imap_unordered(_generate_shard, tasks):
+                produced.append(path)
+                manifest["shards"][os.path.basename(path)] = nb_samples
+                # le manifest est réécrit après chaque shard : il reste à jour même si la génération est interrompue
+                with open(manifest_path, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f, indent=2)
+                print(f"shard {index} : {nb_samples} positions")
+
+        return produced
+
+
+def get_search_policy(game, player, move, legal_moves, search_info: dict = None) -> np.ndarray:
+    """
+    Retourne la distribution de coups issue de la recherche de player (search_info : infos de recherche de l'événement move du log) :
+    uniforme sur les meilleurs coups si le moteur fournit la valeur de chaque coup (move_values : Minimax, et alpha-beta et PVS
+    avec Minimax.root_move_values), proportionnelle aux visites des coups de la racine pour MCTS (visits),
+    uniforme sur les coups possibles pour le bot aléatoire, sinon concentrée sur le coup joué.
+    """
+
+    policy = np.zeros(game.ACTION_SIZE, dtype=np.float32)
+    search_info = search_info or {}
+    move_values = search_info.get("move_values")
+    visits = search_info.get("visits")
+
+    if move_values:
+        best_value = max(move_values.values())
+        best_moves = [game.str_to_move(m) for m, value in move_values.items() if value == best_value]
+        policy[best_moves] = 1 / len(best_moves)
+    elif visits and sum(visits.values()):
+        total = sum(visits.values())
+        for m, nb_visits in visits.items():
+            policy[m] = nb_visits / total
+    elif player.move_fn == game.get_random_move:
+        policy[legal_moves] = 1 / len(legal_moves)
+    else:
+        policy[move] = 1
+    return policy
+
+
+def _generate_shard(task):
+    """
+    Worker : joue des parties jusqu'à remplir un shard puis l'écrit (d'abord sous un nom temporaire).
+    Les positions sont relues dans le log de chaque partie (événements move et infos de recherche des bots) :
+    les move_fn ne sont pas remplacées, les moteurs restent donc notifiés des coups joués.
+    """
+
+    game_class, game_kwargs, bot_fn_names, output_dir, index, shard_size, max_depth, random_plies, seed = task
+    random.seed(seed)
+
+    game = game_class.create_headless(bot_fn_names, **game_kwargs)
+    game.minimax.root_move_values = True                # alpha-beta et PVS donnent la valeur de chaque coup de la racine
+    game.log = True
+    xs, pis, zs = [], [], []
+
+    while len(xs) < shard_size:
+        winner = game.run_headless(nb_games=1, max_depth=max_depth, opening_plies=random_plies)[0]
+        state, samples = game.initial_state, []
+        for event in game.games.pop()["events"]:
+            if event["event"] != "move":
+                continue
+            player, move = game.get_player_by_symbol(event["player"]), game.str_to_move(event["action"])
+            if not event.get("opening"):                # premiers coups au hasard : non enregistrés
+                policy = get_search_policy(game, player, move, game.get_possible_moves(state), event.get("search"))
+                samples.append((game.state_to_tensor(state, player), policy, player.symbol))
+            state = game.apply_move(state, move, player)
+        for x, pi, symbol in samples[:shard_size - len(xs)]:
+            xs.append(x)
+            pis.append(pi)
+            zs.append(0 if winner is None else 1 if winner == symbol else -1)
+
+    path = SelfPlayGenerator.get_shard_path(output_dir, index)
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, x=np.stack(xs), pi=np.stack(pis), z=np.array(zs, dtype=np.int8))
+    os.replace(tmp_path, path)
+    return index, path, len(xs)
@@ -6,7 +6,7 @@ Created on Wed May 21 15:34:08 2025
 @author: did
 """
 
-from game import Game
+from game import Game, FastPathGame, Move, PROVEN_DRAW
 from typing import List, Any
 import random
 from time import time
@@ -15,7 +15,7 @@ from copy import deepcopy
 # State est une liste représentant les valeurs des 9 cases du board : 'X', 'O', ou ' ' 
 StateType = List[str]
 
-# Move est un string représentant l'index de la case jouée : de "0" à "8" selon la grille ci-dessous
+# Move est un entier représentant l'index de la case jouée : de 0 à 8 selon la grille ci-dessous
 
 #	╔═══╦═══╦═══╗
 #	║ 0 ║ 1 ║ 2 ║
@@ -25,21 +25,52 @@ StateType = List[str]
 #	║ 6 ║ 7 ║ 8 ║
 #	╚═══╩═══╩═══╝
 
-class TicTacToe(Game):
+def get_line_masks(combinations) -> list:
+    """
+    Retourne les alignements (listes d'index de cases) sous forme de masques de bits.
+    """
+    return [sum(1 << i for i in combo) for combo in combinations]
+
+
+def get_winning_boards(line_masks) -> bytes:
+    """
+    Retourne la table des 512 bitboards d'une grille 3x3 : 1 si le bitboard contient un alignement (fast path).
+    """
+    return bytes(any(board & line == line for line in line_masks) for board in range(1 << 9))
+
+
+class TicTacToe(Game, FastPathGame):
 
     WINNING_COMBINATIONS = [
         [0, 1, 2], [3, 4, 5], [6, 7, 8],  # lignes
         [0, 3, 6], [1, 4, 7], [2, 5, 8],  # colonnes
         [0, 4, 8], [2, 4, 6]              # diagonales
     ]
+    line_masks = get_line_masks(WINNING_COMBINATIONS)     # alignements en masques de bits (positions mortes, fast path)
+    winning_boards = get_winning_boards(line_masks)      # 1 si le bitboard contient un alignement (fast path)
     
-    def __init__(self, initial_state: StateType = [' '] * 9, all_against_ref_player = True):
+    DEFAULT_SYMBOLS = ("X", "O")
+    DEFAULT_COLORS = ("cyan", "red")
+    ACTION_SIZE = 9                       # nb de moves distincts (taille de la distribution de coups en self-play)
+    HEURISTIC_WEIGHTS = {                 # poids de l'heuristique et des nuls (cf. tuning.py), chargés dans self.heuristic_weights
+        "near_win": 1,                    # par alignement presque gagnant (2 cases sur 3, la 3e vide), compté en négatif pour l'adversaire
+        "center": 1,                      # contrôle du centre (en négatif pour l'adversaire)
+        "draw_center": 5,                 # match nul : centre occupé par le joueur de référence
+        "draw_corner": 1,                 # match nul : par coin occupé par le joueur de référence
+    }
+    HEURISTIC_FEATURES = ("near_win", "center")
+    HEURISTIC_BOUNDS = {"near_win": (0, 2), "center": (0, 2), "draw_center": (0, 5), "draw_corner": (0, 1)}    # nul <= 9 < victoire
+    ASPIRATION_WINDOW = 10                # un coup de plus avant la victoire coûte 10 points : une fenêtre plus étroite est relancée presque à chaque itération
+    
+    def __init__(self, initial_state: StateType = [' '] * 9, all_against_ref_player = True, players_ui: bool = True):
         super().__init__(initial_state, all_against_ref_player)
         
         #pre-start : création des 2 joueurs via UI sans demander le nb de joueurs et avec symboles par défaut
+        #(players_ui=False pour les jeux sans interface : self-play, tournois... les joueurs sont alors ajoutés par create_headless)
         self.nb_players = 2
-        self.managerUI.new_player(symbol = "X", color = "cyan")
-        self.managerUI.new_player(symbol = "O", color = "red")
+        if players_ui:
+            for symbol, color in zip(self.DEFAULT_SYMBOLS, self.DEFAULT_COLORS):
+                self.managerUI.new_player(symbol = symbol, color = color)
         
     def print_help(self):
         print("How to play:")
@@ -68,8 +99,8 @@ class TicTacToe(Game):
         - Si le joueur de référence a gagné, le score (entre 50 et 10) est élevé et dépend de la rapidité de la victoire (profondeur faible = score élevé).
         - Si le joueur de référence a perdu, le score est négatif (entre -50 et -10), avec une pénalité moins sévère à mesure que la profondeur augmente.
         - En cas de match nul, le score (0=<s<=9) est basé sur les cases occupées par le joueur de référence :
-          - Le centre est favorisé (+5 points),
-          - Les coins sont légèrement favorisés (+1 point),
+          - Le centre est favorisé (+5 points par défaut, poids draw_center),
+          - Les coins sont légèrement favorisés (+1 point par défaut, poids draw_corner),
           - Les bords ne sont pas privilégiés (score de 0).
     
         Le score retourné est conçu pour favoriser les victoires rapides et les positions stratégiques (centre, coins).
@@ -96,47 +127,271 @@ class TicTacToe(Game):
             return -10 * (10 - depth)  # Score entre -10 (défaite lente) et -50 (défaite rapide)
         
         else:                                               # match nul
+            weights = self.heuristic_weights
             score = 0
             for i in range(9):
                 if state[i]==reference_player_symbol:              #on balaie les cases du joueur de référence
-                    if i == 4 : score+=5                    # 5 points pour le centre (plus important)
-                    if i in [0,2,6,8]: score +=1            # 1 point pour les coins (moins important que le centre mais plus que les bords qui valent 0)
+                    if i == 4 : score+=weights["draw_center"]            # 5 points pour le centre (plus important)
+                    if i in [0,2,6,8]: score +=weights["draw_corner"]    # 1 point pour les coins (moins important que le centre mais plus que les bords qui valent 0)
             return score
         
     def get_heuristic_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
-        # Évaluation simple (peut être améliorée)
+        # Évaluation simple : somme pondérée des features (cf. get_heuristic_features et tuning.py)
+        weights = self.heuristic_weights
         score = 0
         
-        # Lignes presque gagnantes (2 cases sur 3) : +ou- 1 point
+        # Lignes presque gagnantes (2 cases sur 3) : +ou- near_win points
         for combo in self.WINNING_COMBINATIONS:
             line = [state[i] for i in combo]
             if line.count(reference_player_symbol) == 2 and line.count(' ') == 1:
-                score += 1
+                score += weights["near_win"]
             elif line.count(self.get_next_player_by_symbol(reference_player_symbol)) == 2 and line.count(' ') == 1:
-                score -= 1
+                score -= weights["near_win"]
                 
         # Le contrôle du centre est implicitement pris en compte car il appartient à 4 combos différents...
         # mais on peut l'accentuer pour forcer le minimax a prendre le centre si il manque de profondeur d'évaluation
-        # +ou- 1 point        
+        # +ou- center points
         if state[4] == reference_player_symbol:
-            score += 1
+            score += weights["center"]
         elif state[4] == self.get_next_player_by_symbol(reference_player_symbol):
-            score -= 1
+            score -= weights["center"]
         
         return score
     
-    def get_possible_moves(self, state: StateType) -> List[str]:
-        return [str(i) for i in range(9) if state[i] == ' ']
+    def get_heuristic_features(self, states: list, reference_player_symbols: list):
+        """
+        Features de get_heuristic_by_symbol calculées en bloc avec NumPy, colonnes dans l'ordre de HEURISTIC_FEATURES :
+        - near_win : alignements presque gagnants du joueur de référence - ceux de l'adversaire,
+        - center : 1 si le joueur de référence a le centre, -1 si c'est l'adversaire, 0 sinon.
+        """
+        import numpy as np                              # import local : NumPy n'est nécessaire que pour l'optimisation des poids
+
+        cells = np.array([list(state) for state in states]).reshape(-1, 9)
+        mine = cells == np.array(reference_player_symbols).reshape(-1, 1)
+        theirs = ~mine & (cells != ' ')
+        lines = np.array(self.WINNING_COMBINATIONS)
+        mine_counts, theirs_counts = mine[:, lines].sum(axis=2), theirs[:, lines].sum(axis=2)      # (nb d'états, 8)
+        near_win = ((mine_counts == 2) & (theirs_counts == 0)).sum(axis=1) - ((theirs_counts == 2) & (mine_counts == 0)).sum(axis=1)
+        center = mine[:, 4].astype(np.int64) - theirs[:, 4]
+        return np.stack([near_win, center], axis=1).astype(np.float64)
+    
+    def get_possible_moves(self, state: StateType) -> List[Move]:
+        return [i for i in range(9) if state[i] == ' ']
+    
+    def get_cell_masks(self, cells) -> tuple:
+        """
+        Retourne (masque de bits des cases vides, {symbole : masque de bits de ses cases}).
+        """
+        empty = 0
+        masks = {}
+        for index, cell in enumerate(cells):
+            if cell == ' ':
+                empty |= 1 << index
+            else:
+                masks[cell] = masks.get(cell, 0) | 1 << index
+        return empty, masks
+    
+    def has_open_line(self, cells, blocked: int = 0) -> bool:
+        """
+        Indique si un alignement ne contient encore les symboles que d'un seul joueur (ou aucun) et aucune case bloquée (masque blocked).
+        """
+        _, masks = self.get_cell_masks(cells)
+        for line in self.line_masks:
+            if not line & blocked and sum(1 for mask in masks.values() if line & mask) <= 1:
+                return True
+        return False
+    
+    def get_proven_result(self, state: StateType) -> str | None:
+        """
+        Match nul certain si plus aucun alignement n'est possible (position morte) : chaque alignement contient les 2 symboles,
+        ou il lui manque plus de cases que son propriétaire ne peut encore en jouer.
+        Le joueur qui a le moins de symboles joue le prochain coup et peut encore jouer la moitié des cases vides arrondie au-dessus,
+        son adversaire la moitié arrondie au-dessous (à égalité, le joueur au trait est inconnu : arrondi au-dessus pour les deux).
+        Les alignements sont testés par des ET binaires entre leurs masques et ceux des cases de chaque symbole.
+        """
+        empty, masks = self.get_cell_masks(state)
+        nb_empty = empty.bit_count()
+        counts = {symbol: mask.bit_count() for symbol, mask in masks.items()}
+        fewest = min(counts.values()) if len(counts) == self.nb_players else 0       # un joueur absent du plateau a 0 symbole
+        max_moves_next, max_moves_other = (nb_empty + 1) // 2, nb_empty // 2
+        
+        for line in self.line_masks:
+            owner = None
+            for symbol, mask in masks.items():
+                if line & mask:
+                    if owner is not None:
+                        break                               # alignement bloqué : il contient 2 symboles
+                    owner = symbol
+            else:
+                max_moves = max_moves_next if owner is None or counts[owner] == fewest else max_moves_other
+                if (line & empty).bit_count() <= max_moves:
+                    return None                             # alignement encore réalisable
+        return PROVEN_DRAW
+
+    def get_draw_cell_values(self) -> list:
+        """
+        Retourne la valeur de chaque case dans le score d'un nul : draw_center pour le centre, draw_corner pour les coins, 0 pour les bords.
+        """
+        weights = self.heuristic_weights
+        return [weights["draw_center"] if i == 4 else weights["draw_corner"] if i in (0, 2, 6, 8) else 0 for i in range(9)]
+
+    def get_proven_draw_score(self, mine: int, theirs: int, reference_moves_next: bool | None):
+        """
+        Score d'un nul certain (masques de bits des cases du joueur de référence et de l'adversaire), celui d'une recherche complète
+        où l'adversaire joue contre le joueur de référence (mode all_against_ref_player) :
+        les coups restants ne font plus que remplir la grille et chaque case prise est perdue pour l'autre joueur, donc chacun prend
+        la case libre de plus grande valeur. Le joueur de référence a ainsi ses cases plus une case libre sur deux, dans l'ordre
+        décroissant des valeurs, à partir de la 1ère s'il a le trait (reference_moves_next), de la 2nde sinon.
+        Joueur au trait inconnu (None) : c'est celui qui a le moins de symboles ; à égalité, None si les deux ordres donnent des scores différents.
+        """
+        values = self.get_draw_cell_values()
+        score = sum(values[i] for i in range(9) if mine >> i & 1)
+        free = sorted((values[i] for i in range(9) if not (mine | theirs) >> i & 1), reverse=True)
+        if reference_moves_next is None:
+            nb_mine, nb_theirs = mine.bit_count(), theirs.bit_count()
+            if nb_mine == nb_theirs:
+                first, second = sum(free[0::2]), sum(free[1::2])
+                return score + first if first == second else None
+            reference_moves_next = nb_mine < nb_theirs
+        return score + sum(free[0 if reference_moves_next else 1::2])
+
+    def get_proven_score(self, state: StateType, reference_player_symbol: str, depth: int, player_symbol: str = None) -> int | None:
+        """
+        Nul certain : score des cases occupées à la fin de la partie (cf. get_proven_draw_score), et non sur la grille courante.
+        """
+        if self.get_proven_result(state) != PROVEN_DRAW:
+            return None
+        _, masks = self.get_cell_masks(state)
+        theirs = 0
+        for symbol, mask in masks.items():
+            if symbol != reference_player_symbol:
+                theirs |= mask
+        return self.get_proven_draw_score(masks.get(reference_player_symbol, 0), theirs, None if player_symbol is None else player_symbol == reference_player_symbol)
+
+    #Fast path (cf. FastPathGame) : code = bitboard du 1er joueur de self.players (bits 0 à 8) | bitboard du 2nd << 9
+
+    def has_fast_path(self) -> bool:
+        """
+        Le fast path reproduit les règles et les scores de TicTacToe : il est désactivé pour les sous-classes qui les redéfinissent
+        (m,n,k, Ultimate Tic-Tac-Toe...).
+        """
+        cls = type(self)
+        return super().has_fast_path() and all(getattr(cls, name) is getattr(TicTacToe, name) for name in (
+            "is_terminal", "get_winner_by_symbol", "get_possible_moves", "apply_move", "get_score_by_symbol",
+            "get_heuristic_by_symbol", "get_proven_result", "get_proven_score", "early_pruning_hook"))
+
+    def encode_state(self, state: StateType) -> int:
+        symbols = [player.symbol for player in self.players]
+        code = 0
+        for index, cell in enumerate(state):
+            if cell != ' ':
+                code |= 1 << (index + 9 * symbols.index(cell))
+        return code
+
+    def legal_moves_mask(self, code: int) -> int:
+        return ~(code | code >> 9) & 0x1FF
+
+    def make_move(self, code: int, move: Move, side: int) -> int:
+        return code | 1 << (move + 9 * side)
+
+    def get_winner_index(self, code: int) -> int:
+        if self.winning_boards[code & 0x1FF]:
+            return 0
+        if self.winning_boards[code >> 9]:
+            return 1
+        return -1
+
+    def get_fast_score(self, code: int, reference_side: int, depth: int) -> int:
+        winner = self.get_winner_index(code)
+        if winner == reference_side:
+            return 10 * (10 - depth)
+        if winner >= 0:
+            return -10 * (10 - depth)
+        mine = code >> 9 * reference_side & 0x1FF
+        weights = self.heuristic_weights            # nul : draw_center pour le centre, draw_corner par coin
+        return weights["draw_center"] * (mine >> 4 & 1) + weights["draw_corner"] * (mine & 0b101000101).bit_count()
+
+    def get_fast_heuristic(self, code: int, reference_side: int, depth: int) -> int:
+        mine, theirs = code >> 9 * reference_side & 0x1FF, code >> 9 * (1 - reference_side) & 0x1FF
+        near_win = 0
+        for line in self.line_masks:
+            if not line & theirs and (line & mine).bit_count() == 2:
+                near_win += 1
+            elif not line & mine and (line & theirs).bit_count() == 2:
+                near_win -= 1
+        weights = self.heuristic_weights
+        return weights["near_win"] * near_win + weights["center"] * ((mine >> 4 & 1) - (theirs >> 4 & 1))
+
+    def get_fast_proven_result(self, code: int) -> str | None:
+        """
+        get_proven_result sur les bitboards (même règle des coups restants de chaque joueur).
+        """
+        boards = (code & 0x1FF, code >> 9)
+        empty = ~(boards[0] | boards[1]) & 0x1FF
+        counts = (boards[0].bit_count(), boards[1].bit_count())
+        fewest = min(counts)
+        nb_empty = empty.bit_count()
+        max_moves_next, max_moves_other = (nb_empty + 1) // 2, nb_empty // 2
+        for line in self.line_masks:
+            owned = [side for side in (0, 1) if line & boards[side]]
+            if len(owned) == 2:
+                continue                                    # alignement bloqué
+            max_moves = max_moves_next if not owned or counts[owned[0]] == fewest else max_moves_other
+            if (line & empty).bit_count() <= max_moves:
+                return None
+        return PROVEN_DRAW
+
+    def get_fast_proven_score(self, code: int, reference_side: int, depth: int, side: int = None) -> int | None:
+        if self.get_fast_proven_result(code) != PROVEN_DRAW:
+            return None
+        mine, theirs = code >> 9 * reference_side & 0x1FF, code >> 9 * (1 - reference_side) & 0x1FF
+        return self.get_proven_draw_score(mine, theirs, None if side is None else side == reference_side)
+
+    def get_move_hints(self, state: StateType, moves: List[Move], player) -> dict:
+        """
+        Indices tactiques pour MoveOrdering : 2 pour un coup qui complète une ligne du joueur (victoire),
+        1 pour un coup qui bloque une ligne presque complète de l'adversaire.
+        """
+
+        hints = {}
+        for combo in self.WINNING_COMBINATIONS:
+            line = [state[i] for i in combo]
+            if line.count(' ') != 1:
+                continue
+            a, b = [symbol for symbol in line if symbol != ' ']
+            if a != b:
+                continue
+            move = combo[line.index(' ')]
+            priority = 2 if a == player.symbol else 1
+            hints[move] = max(hints.get(move, 0), priority)
+        return hints
                                 
-    def apply_move(self, state: StateType, move: str, player) -> StateType:
+    def apply_move(self, state: StateType, move: Move, player) -> StateType:
         
         new_state = deepcopy(state)                     # deepcopy par précaution : au cas où l'on utilise des listes de listes (multi tictactoe)
         
-        new_state[int(move)] = player.symbol
+        new_state[move] = player.symbol
         return new_state
         
     def state_to_str(self, state: StateType) -> str:
         return "".join(state)
+
+    def str_to_state(self, state_str: str) -> StateType:
+        if len(state_str) != len(self.initial_state):
+            raise ValueError(f"'{state_str}' is not a valid state (expected {len(self.initial_state)} cells).")
+        return list(state_str)
+
+    def state_to_tensor(self, state: StateType, player):
+        """
+        Encode l'état du point de vue de player en un tableau NumPy int8 de forme (3, 3, 3) :
+        plan 0 = cases de player, plan 1 = cases de l'adversaire, plan 2 = cases vides.
+        """
+        import numpy as np                              # import local : NumPy n'est nécessaire que pour les réseaux de neurones
+
+        cells = np.array(state).reshape(3, 3)
+        mine = cells == player.symbol
+        empty = cells == ' '
+        return np.stack([mine, ~mine & ~empty, empty]).astype(np.int8)
     
     def print_state_from_str(self, state : str) -> None:
         
@@ -152,7 +407,8 @@ class TicTacToe(Game):
     
     def print_colored_state(self, state : StateType, players : List[Any]):
         
-        colored_state = [self.symbol_to_colored_symbol(case,players) for case in state]
+        colored_symbols = self.get_colored_symbols(players)
+        colored_state = [colored_symbols.get(case, case) for case in state]
         
         self.print_state_from_str(colored_state)
 
@@ -169,7 +425,7 @@ class TicTacToe(Game):
 
 #TicTacToePlus
 
-# Move est un string calqué sur la disposition du pavé numérique
+# La saisie du joueur est calquée sur la disposition du pavé numérique (le Move reste l'index de 0 à 8 de TicTacToe)
 # De plus, l'utilisateur peut laisser l'IA joué à sa place si il ne saisit pas de coup
 
 #	╔═══╦═══╦═══╗
@@ -182,7 +438,7 @@ class TicTacToe(Game):
 
 class TicTacToePlus(TicTacToe):
     
-    def __init__(self, initial_state: StateType = [' '] * 9, all_against_ref_player = True):
+    def __init__(self, initial_state: StateType = [' '] * 9, all_against_ref_player = True, players_ui: bool = True):
         #appel de l'init de Game et non de TicTacToe pour ne pas court-circuiter l'ajout du bot
         Game.__init__(self, initial_state, all_against_ref_player)
         
@@ -191,8 +447,9 @@ class TicTacToePlus(TicTacToe):
         
         #pre-start identique à la classe TicTacToe (mais qu'il faut appeler après avoir ajouté le bot...)
         self.nb_players = 2
-        self.managerUI.new_player(symbol = "X", color = "cyan")
-        self.managerUI.new_player(symbol = "O", color = "red")
+        if players_ui:
+            for symbol, color in zip(self.DEFAULT_SYMBOLS, self.DEFAULT_COLORS):
+                self.managerUI.new_player(symbol = symbol, color = color)
 
 
     
@@ -206,14 +463,14 @@ class TicTacToePlus(TicTacToe):
         print("- Type '?' or 'help' to display these instructions again.")
 
     
-    def get_possible_moves_faster(self, state: StateType) -> List[str]:
+    def get_possible_moves_faster(self, state: StateType) -> List[Move]:
         """plus rapide que get_possible_moves car optimise le temps de calcul des 3 premiers coups en limitant aux possibilités optimales
         on va l'obliger à choisir de préférence le centre puis les coins puis les bords en cas d'égalité d'evaluate...
         """ 
-        center = ["4"]
-        coins = ["0", "2", "6", "8"]
+        center = [4]
+        coins = [0, 2, 6, 8]
         random.shuffle(coins)           #on randomize coins
-        bords = ["1", "3", "5", "7"]
+        bords = [1, 3, 5, 7]
         random.shuffle(bords)           #on randomize bords
         
         order = center + coins + bords 
@@ -227,37 +484,37 @@ class TicTacToePlus(TicTacToe):
             return center
         
         if state.count(" ")== 8:    #2eme coup si le centre est pris : on prend 1 coin
-            return coins[0]
+            return [coins[0]]
         
         if state.count(" ")== 7:    #3eme coup : si je joue le 3eme coup c'est que j'ai joué le 1er coup donc j'ai le centre
                                     #2 possibilités : l'adversaire a joué un coin => je prends un coin adjacent (menace sur diagonale)
                                     #                 l'adversaire a joué un bord => je prends un coin adjacent 
             if state[0] != " ":
-                adj_coins = ["2", "6"]
+                adj_coins = [2, 6]
             elif state[1] != " ":
-                adj_coins = ["0", "2"]
+                adj_coins = [0, 2]
             elif state[2] != " ":
-                adj_coins = ["0", "8"]
+                adj_coins = [0, 8]
             elif state[3] != " ":
-                adj_coins = ["0", "6"]
+                adj_coins = [0, 6]
             elif state[5] != " ":
-                adj_coins = ["2", "8"]
+                adj_coins = [2, 8]
             elif state[6] != " ":
-                adj_coins = ["0", "8"]
+                adj_coins = [0, 8]
             elif state[7] != " ":
-                adj_coins = ["6", "8"]
+                adj_coins = [6, 8]
             elif state[8] != " ":
-                adj_coins = ["2", "6"]
+                adj_coins = [2, 6]
                 
             random.shuffle(adj_coins)
-            return adj_coins[0]
+            return [adj_coins[0]]
         
         #sinon on teste toutes les cases == ' ' dans l'ordre centre + coins + bords        
         
-        return [i for i in order if state[int(i)] == ' ']
+        return [i for i in order if state[i] == ' ']
     
     
-    def get_human_move(self, state, player, **kwargs)-> str:
+    def get_human_move(self, state, player, **kwargs)-> Move:
         """ 
         Surcharge de la méthode de classe notamment pour :
             -transformer l'entrée calquée sur les touches du pavé numérique (entre 1 et 9) au format requis par move (entre 0 et 8) 
@@ -269,41 +526,47 @@ class TicTacToePlus(TicTacToe):
         
         human_input = input(f"{self.current_player.name} : {current_colored_symbol} – Your turn ! Move or '?' for help ➤ ")
         
-        human_input_to_move = {"1":"6", "2":"7", "3":"8", "4":"3", "5":"4", "6":"5", "7":"0", "8":"1", "9":"2"}
-        
-        move = human_input_to_move.get(human_input, human_input)
+        human_input_to_move = {"1":6, "2":7, "3":8, "4":3, "5":4, "6":5, "7":0, "8":1, "9":2}
         
         moves = self.get_possible_moves(state)
         duration = None
         
-        if move == "" :      #IA calcule le best_move pour le joueur en cours ainsi que le temps de calcul en ms
+        if human_input == "" :      #IA calcule le best_move pour le joueur en cours ainsi que le temps de calcul en ms
             t_start = time()
             best_move = self.get_best_move_faster(state=state, player=player, reference_player=player, all_against_ref_player=True, max_depth=None)
             # le best move est calculé en minimax classique : le ref_player est le player courant (alterne à chaque tour), et all_agains_ref = True
             duration = int(1000*(time() - t_start))
-            print("AI played move", best_move, "in", duration, "ms")
+            print("AI played move", self.move_to_str(best_move), "in", duration, "ms")
             return best_move
             
-        elif move == "?" or move == "help":
+        elif human_input == "?" or human_input == "help":
             self.print_help()
             return self.get_human_move(state, player)
                               
-        elif not move.isdigit():
-            print(f"{move} is not a valid number! Please enter a valid number.")
+        elif not human_input.isdigit():
+            print(f"{human_input} is not a valid number! Please enter a valid number.")
             return self.get_human_move(state, player)
+        
+        move = human_input_to_move.get(human_input, int(human_input))
             
-        elif move not in moves:
+        if move not in moves:
             print(f"{human_input} is not a valid move !")
             return self.get_human_move(state, player)
         else:
             return move
         
-    def get_best_move_faster(self, state: StateType, player, reference_player, all_against_ref_player, max_depth: int) -> str:
+    def get_best_move_faster(self, state: StateType, player, reference_player, all_against_ref_player, max_depth: int, **kwargs) -> Move:
         """
         Utilise get_possible_moves_faster au lieu de get_possible_moves
              et minimax_fatser au lieu de minimax
+        Consulte d'abord le livre d'ouvertures du jeu s'il y en a un
+        NB: **kwargs permet de le rendre compatible avec les autres move_fn (l'échéance d'une cadence, deadline, n'est pas gérée)
         """
-        
+
+        book_move = self.minimax.get_book_move(state, player, reference_player, all_against_ref_player)
+        if book_move is not None:
+            return book_move
+
         best_move = None
         if all_against_ref_player:
             best_value = -float('inf') if player == reference_player else float('inf')
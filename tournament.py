@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Jun 15 10:48:09 2025
+
+@author: did
+
+Tournois de bots sans interface, en parallèle, avec classement Elo et arrêt anticipé par test séquentiel (SPRT).
+
+Les appariements (round-robin : chaque bot contre chaque autre, gauntlet : le premier bot contre chacun des autres)
+sont joués par séries de batch_size parties dans plusieurs process (run_headless, le joueur qui commence alternant).
+Les premiers coups de chaque partie sont joués au hasard (random_plies) pour que deux bots déterministes ne rejouent pas
+toujours la même partie.
+
+Après chaque série, l'écart Elo de l'appariement est réestimé avec son intervalle de confiance à 95 %
+et le rapport de log-vraisemblance (LLR) du SPRT est mis à jour :
+    H0 : écart Elo = elo0, H1 : écart Elo = elo1 (du point de vue du premier bot de l'appariement).
+Dès que le LLR sort de [log(beta / (1 - alpha)), log((1 - beta) / alpha)], l'appariement s'arrête : H0 ou H1 est acceptée
+avec des risques d'erreur alpha et beta. Sinon il s'arrête après max_games parties (sans décision).
+
+Exemple :
+    from tictactoe import TicTacToePlus
+    tournament = Tournament(TicTacToePlus, ["faster_best_move", "minimax_best_move"], mode="gauntlet", max_depth=9)
+    tournament.run()
+"""
+
+import os
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+def expected_score(elo: float) -> float:
+    """
+    Score moyen attendu (victoire 1, nul 0.5, défaite 0) pour un écart Elo donné.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """
+    Ecart Elo correspondant à un score moyen (borné pour rester fini à 0 % ou 100 %).
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class PairingStats:
+    """
+    Résultats d'un appariement (du point de vue du premier bot) et statistiques dérivées.
+    """
+
+    def __init__(self, bot_a: str, bot_b: str):
+        self.bot_a = bot_a
+        self.bot_b = bot_b
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.decision = None                 # "H0", "H1", "max_games" ou None (en cours)
+
+    @property
+    def nb_games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    def add(self, wins: int, draws: int, losses: int) -> None:
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+
+    def get_score_and_variance(self) -> tuple:
+        """
+        Retourne (score moyen, variance du résultat d'une partie).
+        Une demi-victoire et une demi-défaite fictives sont ajoutées : la variance n'est jamais nulle
+        (série de nuls uniquement) et l'estimation reste finie après quelques parties.
+        """
+        wins, draws, losses = self.wins + 0.5, self.draws, self.losses + 0.5
+        n = wins + draws + losses
+        score = (wins + 0.5 * draws) / n
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / n
+        return score, variance
+
+    def get_elo(self) -> tuple:
+        """
+        Retourne (écart Elo estimé, demi-largeur de l'intervalle de confiance à 95 %).
+        """
+        score, variance = self.get_score_and_variance()
+        margin = 1.96 * math.sqrt(variance / (self.nb_games + 1))
+        elo = score_to_elo(score)
+        return elo, (score_to_elo(score + margin) - score_to_elo(score - margin)) / 2
+
+    def get_llr(self, elo0: float, elo1: float) -> float:
+        """
+        Rapport de log-vraisemblance de H1 contre H0 (approximation gaussienne du SPRT généralisé).
+        """
+        score, variance = self.get_score_and_variance()
+        score0, score1 = expected_score(elo0), expected_score(elo1)
+        return self.nb_games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+    def to_dict(self, elo0: float, elo1: float) -> dict:
+        elo, margin = self.get_elo()
+        return {
+            "bot_a": self.bot_a,
+            "bot_b": self.bot_b,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "elo": round(elo, 1),
+            "elo_margin": round(margin, 1),
+            "llr": round(self.get_llr(elo0, elo1), 3),
+            "decision": self.decision
+        }
+
+
+class Tournament:
+    """
+    Tournoi de bots de bot_move_fns.
+
+    Paramètres :
+    - game_class : sous-classe de Game (doit accepter players_ui, cf. create_headless).
+    - bot_fn_names : noms des fonctions de bot_move_fns des bots en compétition.
+    - mode : "round_robin" ou "gauntlet" (le premier bot contre chacun des autres).
+    - max_games : nb maximal de parties par appariement.
+    - batch_size : nb de parties d'une série (unité de travail d'un process, nombre pair pour alterner le joueur qui commence).
+    - max_depth : profondeur maximale de la recherche des bots.
+    - random_plies : nb de premiers coups joués au hasard dans chaque partie.
+    - elo0, elo1, alpha, beta : hypothèses et risques du SPRT (sprt=False : pas d'arrêt anticipé).
+    - workers : nb de process (par défaut, le nb de CPU).
+    - seed : graine de base ; chaque série a sa propre graine dérivée de seed (appariement, n° de série), ce qui la rend reproductible.
+    - game_kwargs : paramètres passés au constructeur du jeu.
+    """
+
+    def __init__(self, game_class, bot_fn_names, mode: str = "round_robin", max_games: int = 1000, batch_size: int = 10,
+                 max_depth: int = None, random_plies: int = 2, elo0: float = 0, elo1: float = 50, alpha: float = 0.05,
+                 beta: float = 0.05, sprt: bool = True, workers: int = None, seed: int = 0, game_kwargs: dict = None):
+        if mode not in ("round_robin", "gauntlet"):
+            raise ValueError(f"Unknown tournament mode '{mode}' (expected 'round_robin' or 'gauntlet').")
+        self.game_class = game_class
+        self.bot_fn_names = list(bot_fn_names)
+        self.mode = mode
+        self.max_games = max_games
+        self.batch_size = batch_size
+        self.max_depth = max_depth
+        self.random_plies = random_plies
+        self.elo0, self.elo1 = elo0, elo1
+        self.alpha, self.beta = alpha, beta
+        self.sprt = sprt
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+        self.game_kwargs = game_kwargs or {}
+        self.pairings = [PairingStats(bot_a, bot_b) for bot_a, bot_b in self.get_pairs()]
+
+    def get_pairs(self) -> list:
+        names = self.bot_fn_names
+        if self.mode == "gauntlet":
+            return [(names[0], name) for name in names[1:]]
+        return [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+
+    def get_sprt_bounds(self) -> tuple:
+        return math.log(self.beta / (1 - self.alpha)), math.log((1 - self.beta) / self.alpha)
+
+    def update_decision(self, pairing: PairingStats) -> None:
+        """
+        Arrête l'appariement si le SPRT a conclu ou si max_games parties ont été jouées.
+        """
+        if self.sprt:
+            lower, upper = self.get_sprt_bounds()
+            llr = pairing.get_llr(self.elo0, self.elo1)
+            if llr <= lower:
+                pairing.decision = "H0"
+            elif llr >= upper:
+                pairing.decision = "H1"
+        if pairing.decision is None and pairing.nb_games >= self.max_games:
+            pairing.decision = "max_games"
+
+    def run(self) -> list:
+        """
+        Joue le tournoi et retourne le résumé de chaque appariement (cf. PairingStats.to_dict).
+        Chaque série terminée est affichée avec l'estimation Elo et le LLR à jour.
+        """
+
+        batches_started = [0] * len(self.pairings)
+        in_flight = {}                       # {future : index de l'appariement}
+
+        def submit(executor, index) -> bool:
+            #une série n'est lancée que si l'appariement est en cours et que les séries déjà lancées n'atteignent pas max_games
+            pairing = self.pairings[index]
+            if pairing.decision is not None or batches_started[index] * self.batch_size >= self.max_games:
+                return False
+            batch_index = batches_started[index]
+            batches_started[index] += 1
+            seed = self.seed + batch_index * len(self.pairings) + index
+            task = (self.game_class, self.game_kwargs, pairing.bot_a, pairing.bot_b, self.batch_size, self.max_depth, self.random_plies, seed,
+                    None, None, False)
+            in_flight[executor.submit(_play_batch, task)] = index
+            return True
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            #remplissage initial : les appariements se partagent les process à tour de rôle
+            index, nb_refused = 0, 0
+            while len(in_flight) < self.workers and nb_refused < len(self.pairings):
+                nb_refused = 0 if submit(executor, index % len(self.pairings)) else nb_refused + 1
+                index += 1
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    pairing = self.pairings[index]
+                    if pairing.decision is None:           # résultats des séries en vol après une décision : ignorés
+                        pairing.add(*future.result())
+                        self.update_decision(pairing)
+                        self.print_pairing(pairing)
+                    if not submit(executor, index):
+                        #appariement terminé : le process libéré sert au premier appariement encore en cours
+                        for other in range(len(self.pairings)):
+                            if submit(executor, other):
+                                break
+
+        return [pairing.to_dict(self.elo0, self.elo1) for pairing in self.pairings]
+
+    def print_pairing(self, pairing: PairingStats) -> None:
+        elo, margin = pairing.get_elo()
+        line = f"{pairing.bot_a} vs {pairing.bot_b} : +{pairing.wins} ={pairing.draws} -{pairing.losses}  elo {elo:+.1f} ± {margin:.1f}"
+        if self.sprt:
+            lower, upper = self.get_sprt_bounds()
+            line += f"  LLR {pairing.get_llr(self.elo0, self.elo1):.2f} [{lower:.2f}, {upper:.2f}]"
+        if pairing.decision:
+            line += f"  -> {pairing.decision}"
+        print(line)
+
+    def get_ratings(self, anchor: str = None, nb_iterations: int = 100) -> dict:
+        """
+        Retourne le classement Elo de tous les bots {nom : elo} ajusté sur l'ensemble des appariements (modèle de Bradley-Terry,
+        un nul valant une demi-victoire pour chacun), le bot anchor (par défaut le premier) étant fixé à 0.
+        """
+
+        names = self.bot_fn_names
+        strengths = {name: 1.0 for name in names}
+        points = {name: 0.0 for name in names}
+        for pairing in self.pairings:
+            points[pairing.bot_a] += pairing.wins + 0.5 * pairing.draws + 0.5            # pseudo-résultats : ratings finis même sans défaite
+            points[pairing.bot_b] += pairing.losses + 0.5 * pairing.draws + 0.5
+
+        for _ in range(nb_iterations):
+            for name in names:
+                denominator = 0.0
+                for pairing in self.pairings:
+                    if name in (pairing.bot_a, pairing.bot_b):
+                        other = pairing.bot_b if name == pairing.bot_a else pairing.bot_a
+                        denominator += (pairing.nb_games + 1) / (strengths[name] + strengths[other])
+                if denominator:
+                    strengths[name] = points[name] / denominator
+
+        anchor = anchor or names[0]
+        return {name: round(400 * math.log10(strengths[name] / strengths[anchor]), 1) for name in names}
+
+
+def _play_batch(task):
+    """
+    Worker : joue une série de parties entre bot_a (premier joueur de la première partie) et bot_b (tous les autres joueurs),
+    le joueur qui commence alternant. Retourne (victoires, nuls, défaites) de bot_a.
+    weights_a, weights_b : poids de l'heuristique propres à chaque camp (None : poids du jeu), pour les matchs entre poids de tuning.py.
+    record : retourne plutôt les positions non terminales des parties, étiquetées par le résultat final du joueur qui vient de jouer :
+    [(état textuel, symbole du joueur, 1, 0.5 ou 0)].
+    """
+
+    game_class, game_kwargs, bot_a, bot_b, batch_size, max_depth, random_plies, seed, weights_a, weights_b, record = task
+    random.seed(seed)
+
+    nb_players = len(game_class.DEFAULT_SYMBOLS) or 2
+    game = game_class.create_headless([bot_a] + [bot_b] * (nb_players - 1), **game_kwargs)
+    symbol_a = game.players[0].symbol
+    if weights_a is not None or weights_b is not None:
+        game.player_heuristic_weights = {player.symbol: (weights_a if player.symbol == symbol_a else weights_b) or game.heuristic_weights
+                                         for player in game.players}
+    game.log = record                                   # les positions sont relues dans les événements move du log de la partie
+
+    positions = []
+    wins = draws = losses = 0
+    for _ in range(batch_size):
+        winner = game.run_headless(nb_games=1, max_depth=max_depth, opening_plies=random_plies)[0]
+        if record:
+            moves = [event for event in game.games.pop()["events"] if event["event"] == "move"][:-1]
+            positions += [(event["state"], event["player"], 0.5 if winner is None else float(winner == event["player"])) for event in moves]
+        if winner is None:
+            draws += 1
+        elif winner == symbol_a:
+            wins += 1
+        else:
+            losses += 1
+    return positions if record else (wins, draws, losses)
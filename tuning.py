@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Jun 19 09:05:12 2025
+
+@author: did
+
+Optimisation des poids de l'heuristique d'un jeu paramétré (Game.HEURISTIC_WEIGHTS, ex : TicTacToe), en parallèle.
+
+L'heuristique d'un tel jeu est une somme pondérée de features (get_heuristic_features, calculées en bloc avec NumPy) et
+ses scores de fin de partie peuvent eux aussi dépendre de poids (ex : valeur des nuls de TicTacToe). Deux méthodes :
+    - texel : ajustement logistique (méthode de Texel) sur des positions étiquetées par le résultat final de leur partie.
+      La probabilité de gain du joueur qui vient de jouer est modélisée par sigmoid(K * heuristique) ; K est d'abord ajusté
+      avec les poids actuels (il fixe l'échelle de l'heuristique), puis les poids de HEURISTIC_FEATURES minimisent l'erreur
+      quadratique moyenne par descente de gradient. Les positions viennent de parties jouées en parallèle (generate_positions)
+      ou des logs de save_log (load_log_positions).
+    - spsa : recherche par matchs (Simultaneous Perturbation Stochastic Approximation). A chaque itération, tous les poids
+      optimisés sont perturbés en même temps dans une direction aléatoire (+c ou -c pour chacun), les deux jeux de poids
+      s'affrontent sur une série de parties réparties entre les process, et les poids avancent selon le résultat.
+      Tous les poids peuvent ainsi être optimisés, y compris ceux des scores.
+Les poids restent dans les bornes du jeu (HEURISTIC_BOUNDS), qui garantissent par exemple victoire > nul > défaite.
+
+save écrit les poids dans game_logs/<NomClasse>/heuristic_weights.json, chargé par le jeu à sa création (Game.load_heuristic_weights).
+NB : les poids non entiers rendent les valeurs des recherches non entières, qui ne sont pas conservées par le cache persistant.
+
+Exemple :
+    from tictactoe import TicTacToe
+    tuner = HeuristicTuner(TicTacToe, max_depth=2)
+    tuner.texel(tuner.generate_positions(2000))
+    tuner.spsa(nb_iterations=50)
+    tuner.save()
+"""
+
+import os
+import json
+import random
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tournament import _play_batch          # worker des parties entre poids (et des parties enregistrées)
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class HeuristicTuner:
+    """
+    Optimise les poids de l'heuristique d'un jeu.
+
+    Paramètres :
+    - game_class : sous-classe de Game paramétrée (HEURISTIC_WEIGHTS), qui doit accepter players_ui (cf. create_headless).
+    - bot_fn_name : nom de la fonction de bot_move_fns qui joue les parties (generate_positions et matchs de spsa).
+    - max_depth : profondeur de la recherche des bots (limitée : l'heuristique n'intervient qu'à l'horizon).
+    - random_plies : nb de premiers coups joués au hasard dans chaque partie (diversité des positions et des parties).
+    - workers : nb de process (par défaut, le nb de CPU).
+    - seed : graine de base ; chaque série de parties a sa propre graine dérivée de seed.
+    - game_kwargs : paramètres passés au constructeur du jeu.
+    Les poids de départ sont ceux que charge le jeu (poids sauvegardés, sinon HEURISTIC_WEIGHTS).
+    """
+
+    def __init__(self, game_class, bot_fn_name: str = "alphabeta_best_move", max_depth: int = 2, random_plies: int = 2,
+                 workers: int = None, seed: int = 0, game_kwargs: dict = None):
+        if game_class.HEURISTIC_WEIGHTS is None:
+            raise ValueError(f"{game_class.__name__} has no heuristic weights to tune (HEURISTIC_WEIGHTS is None).")
+        self.game_class = game_class
+        self.bot_fn_name = bot_fn_name
+        self.max_depth = max_depth
+        self.random_plies = random_plies
+        self.workers = workers or os.cpu_count()
+        self.seed = seed
+        self.game_kwargs = game_kwargs or {}
+        self.game = game_class.create_headless(["random_move"] * (len(game_class.DEFAULT_SYMBOLS) or 2), **self.game_kwargs)
+        self.weights = dict(self.game.heuristic_weights)
+        self.random = random.Random(seed)    # directions des perturbations de spsa
+        self.history = []                    # étapes d'optimisation (méthode et résultat), sauvegardées avec les poids
+        self._nb_batches = 0                 # nb de séries de parties lancées (graines)
+
+    def get_seed(self) -> int:
+        self._nb_batches += 1
+        return self.seed + self._nb_batches
+
+    def clip(self, weights: dict) -> dict:
+        """
+        Ramène chaque poids dans ses bornes (HEURISTIC_BOUNDS).
+        """
+        bounds = self.game_class.HEURISTIC_BOUNDS
+        return {name: min(max(value, bounds[name][0]), bounds[name][1]) if name in bounds else value for name, value in weights.items()}
+
+    def generate_positions(self, nb_games: int, batch_size: int = 50) -> list:
+        """
+        Joue nb_games parties (bot_fn_name contre lui-même, avec les poids actuels) réparties entre les process et retourne
+        leurs positions non terminales : [(état textuel, symbole du joueur qui vient de jouer, résultat pour lui : 1, 0.5 ou 0)].
+        """
+        tasks = []
+        for start in range(0, nb_games, batch_size):
+            tasks.append((self.game_class, self.game_kwargs, self.bot_fn_name, self.bot_fn_name, min(batch_size, nb_games - start),
+                          self.max_depth, self.random_plies, self.get_seed(), self.weights, self.weights, True))
+        positions = []
+        with ProcessPoolExecutor(self.workers) as executor:
+            for batch_positions in executor.map(_play_batch, tasks):
+                positions += batch_positions
+        return positions
+
+    def load_log_positions(self, log_folder: str = None) -> list:
+        """
+        Retourne les positions non terminales des logs de save_log du jeu (par défaut game_logs/<NomClasse>),
+        au format de generate_positions. Les parties interrompues (sans événement end) sont ignorées.
+        """
+        game = self.game
+        log_folder = log_folder or os.path.join("game_logs", self.game_class.__name__)
+        positions = []
+        for log_path in sorted(glob(os.path.join(log_folder, "*.json"))):
+            with open(log_path, "r", encoding="utf-8") as f:
+                log = json.load(f)
+            if not isinstance(log, dict) or log.get("game_class") != self.game_class.__name__ or "games" not in log:
+                continue                                    # autre fichier du dossier (poids, logs d'un autre jeu...)
+            for logged_game in log["games"]:
+                ends = [event for event in logged_game["events"] if event["event"] == "end"]
+                if not ends:
+                    continue
+                winner = ends[-1]["winner"]
+                for event in logged_game["events"]:
+                    if event["event"] == "move" and not game.is_terminal(game.str_to_state(event["state"])):
+                        result = 0.5 if winner is None else float(winner == event["player"])
+                        positions.append((event["state"], event["player"], result))
+        return positions
+
+    def get_dataset(self, positions: list) -> tuple:
+        """
+        Retourne (features, résultats) des positions sous forme de tableaux NumPy (features : cf. Game.get_heuristic_features).
+        """
+        if not self.game_class.HEURISTIC_FEATURES:
+            raise ValueError(f"{self.game_class.__name__} does not expose heuristic features (HEURISTIC_FEATURES is empty).")
+        if not positions:
+            raise ValueError("no positions to fit the heuristic weights on.")
+        states = [self.game.str_to_state(state_str) for state_str, _, _ in positions]
+        features = self.game.get_heuristic_features(states, [symbol for _, symbol, _ in positions])
+        if features is None:
+            raise ValueError(f"{self.game_class.__name__} does not implement get_heuristic_features.")
+        return features, np.array([result for _, _, result in positions], dtype=np.float64)
+
+    @staticmethod
+    def get_loss(features, results, feature_weights, scale: float) -> float:
+        return float(np.mean((results - sigmoid(scale * features @ feature_weights)) ** 2))
+
+    @classmethod
+    def fit_scale(cls, features, results, feature_weights) -> float:
+        """
+        Retourne le facteur d'échelle K qui minimise l'erreur des poids actuels (recherche sur une grille logarithmique).
+        """
+        scales = np.geomspace(0.01, 10, 121)
+        losses = np.mean((results - sigmoid(np.outer(scales, features @ feature_weights))) ** 2, axis=1)
+        return float(scales[np.argmin(losses)])
+
+    def texel(self, positions: list, nb_iterations: int = 2000, learning_rate: float = 1.0) -> dict:
+        """
+        Ajustement logistique des poids de HEURISTIC_FEATURES sur les positions (cf. generate_positions, load_log_positions).
+        Met à jour et retourne self.weights.
+        """
+        names = list(self.game_class.HEURISTIC_FEATURES)
+        features, results = self.get_dataset(positions)
+        feature_weights = np.array([self.weights[name] for name in names], dtype=np.float64)
+        bounds = self.game_class.HEURISTIC_BOUNDS
+        lower = np.array([bounds.get(name, (-np.inf, np.inf))[0] for name in names], dtype=np.float64)
+        upper = np.array([bounds.get(name, (-np.inf, np.inf))[1] for name in names], dtype=np.float64)
+
+        scale = self.fit_scale(features, results, feature_weights)
+        loss_before = self.get_loss(features, results, feature_weights, scale)
+        for _ in range(nb_iterations):
+            predictions = sigmoid(scale * features @ feature_weights)
+            #gradient de l'erreur quadratique moyenne par rapport aux poids
+            gradient = 2 * scale * ((predictions - results) * predictions * (1 - predictions)) @ features / len(results)
+            feature_weights = np.clip(feature_weights - learning_rate * gradient, lower, upper)
+
+        self.weights.update({name: round(float(value), 3) for name, value in zip(names, feature_weights)})
+        step = {"method": "texel", "positions": len(results), "scale": scale, "loss_before": round(loss_before, 5),
+                "loss_after": round(self.get_loss(features, results, feature_weights, scale), 5)}
+        self.history.append(step)
+        print(f"texel : {len(results)} positions, K = {scale:.3f}, loss {step['loss_before']} -> {step['loss_after']}  {self.weights}")
+        return self.weights
+
+    def spsa(self, nb_iterations: int = 50, games_per_iteration: int = 100, batch_size: int = 10, names: list = None,
+             step: float = 0.5, perturbation: float = 0.2) -> dict:
+        """
+        Optimisation SPSA des poids names (par défaut, tous) par matchs entre poids perturbés.
+
+        A l'itération k, chaque poids est perturbé de +c_k ou -c_k (c_k = perturbation / (k + 1)^0.101) ; les poids "+" et "-"
+        jouent games_per_iteration parties (par séries de batch_size, le joueur qui commence alternant) et, avec s le score
+        des poids "+" (victoires - défaites) / parties, chaque poids avance de a_k * s / (2 * c_k) dans la direction de sa
+        perturbation (a_k = step / (k + 1 + nb_iterations / 10)^0.602). Met à jour et retourne self.weights.
+        """
+        names = list(names or self.weights)
+        stability = nb_iterations / 10
+        batches = [min(batch_size, games_per_iteration - start) for start in range(0, games_per_iteration, batch_size)]
+        with ProcessPoolExecutor(self.workers) as executor:
+            for k in range(nb_iterations):
+                a_k = step / (k + 1 + stability) ** 0.602
+                c_k = perturbation / (k + 1) ** 0.101
+                directions = {name: self.random.choice((-1, 1)) for name in names}
+                weights_plus = self.clip({**self.weights, **{name: self.weights[name] + c_k * directions[name] for name in names}})
+                weights_minus = self.clip({**self.weights, **{name: self.weights[name] - c_k * directions[name] for name in names}})
+
+                tasks = [(self.game_class, self.game_kwargs, self.bot_fn_name, self.bot_fn_name, nb_games,
+                          self.max_depth, self.random_plies, self.get_seed(), weights_plus, weights_minus, False) for nb_games in batches]
+                wins = draws = losses = 0
+                for batch_wins, batch_draws, batch_losses in executor.map(_play_batch, tasks):
+                    wins, draws, losses = wins + batch_wins, draws + batch_draws, losses + batch_losses
+                score = (wins - losses) / games_per_iteration
+
+                self.weights = self.clip({**self.weights, **{name: round(self.weights[name] + a_k * score / (2 * c_k) * directions[name], 3)
+                                                             for name in names}})
+                print(f"spsa {k + 1}/{nb_iterations} : +{wins} ={draws} -{losses}  {self.weights}")
+
+        self.history.append({"method": "spsa", "iterations": nb_iterations, "games_per_iteration": games_per_iteration, "names": names})
+        return self.weights
+
+    def save(self, path: str = None) -> str:
+        """
+        Sauvegarde les poids (cf. Game.save_heuristic_weights), chargés par le jeu à sa prochaine création.
+        """
+        infos = {"bot_fn_name": self.bot_fn_name, "max_depth": self.max_depth, "tuning": self.history}
+        path = self.game.save_heuristic_weights(self.weights, path, infos)
+        print(f"💾 Heuristic weights saved to '{path}'")
+        return path
+
+
+if __name__ == "__main__":
+    from tictactoe import TicTacToe
+    tuner = HeuristicTuner(TicTacToe, max_depth=2)
+    tuner.texel(tuner.generate_positions(2000))
+    tuner.spsa(nb_iterations=20)
+    tuner.save()
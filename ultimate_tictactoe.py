@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Jun 10 09:12:51 2025
+
+@author: did
+
+Ultimate Tic-Tac-Toe : 9 grilles de TicTacToe (les sous-grilles) disposées elles-mêmes en grille de TicTacToe (la macro-grille).
+
+Règles :
+    - la case jouée dans une sous-grille désigne la sous-grille où l'adversaire doit jouer ensuite,
+    - si cette sous-grille est fermée (gagnée ou pleine), l'adversaire peut jouer dans n'importe quelle sous-grille ouverte,
+    - gagner une sous-grille y place son symbole sur la macro-grille ; le premier à aligner 3 sous-grilles gagne,
+    - si toutes les sous-grilles sont fermées sans alignement, la partie est nulle.
+
+exemple : https://www.codingame.com/multiplayer/bot-programming/tic-tac-toe (ligue Gold et au-delà)
+"""
+
+from game import Move, PROVEN_DRAW
+from tictactoe import TicTacToe
+from typing import List, Any
+
+# Move est un entier de 0 à 80 : 9 * (index de la sous-grille) + (index de la case dans la sous-grille),
+# les sous-grilles et les cases étant numérotées comme dans TicTacToe :
+
+#	╔═══╦═══╦═══╗
+#	║ 0 ║ 1 ║ 2 ║
+#	╠═══╬═══╬═══╣
+#	║ 3 ║ 4 ║ 5 ║
+#	╠═══╬═══╬═══╣
+#	║ 6 ║ 7 ║ 8 ║
+#	╚═══╩═══╩═══╝
+
+ALL_BOARDS_CLOSED = (1 << 9) - 1
+
+
+class UltimateState:
+    """
+    Etat compact et non modifiable d'une partie d'Ultimate Tic-Tac-Toe (apply_move crée un nouvel état sans deepcopy).
+
+    Attributs :
+    - cells : chaîne de 81 caractères ('X', 'O' ou ' '), sous-grille par sous-grille (case 9 * b + c).
+    - macro : chaîne de 9 caractères, la macro-grille mise en cache : symbole du vainqueur de chaque sous-grille ou ' '.
+    - closed : masque de 9 bits des sous-grilles fermées (gagnées ou pleines).
+    - next_board : sous-grille imposée au prochain joueur, ou -1 s'il peut jouer dans n'importe quelle sous-grille ouverte.
+    - winner : symbole du vainqueur de la partie (alignement sur la macro-grille) ou None.
+    """
+
+    __slots__ = ("cells", "macro", "closed", "next_board", "winner")
+
+    def __init__(self, cells: str = " " * 81, macro: str = " " * 9, closed: int = 0, next_board: int = -1, winner: str = None):
+        self.cells = cells
+        self.macro = macro
+        self.closed = closed
+        self.next_board = next_board
+        self.winner = winner
+
+    def get_board(self, board: int) -> str:
+        """
+        Retourne la sous-grille d'index board (chaîne de 9 caractères, au format d'un état de TicTacToe).
+        """
+        return self.cells[9 * board: 9 * board + 9]
+
+
+StateType = UltimateState
+
+
+class UltimateTicTacToe(TicTacToe):
+
+    ACTION_SIZE = 81
+    HEURISTIC_FEATURES = ()               # heuristique de TicTacToe (poids de la classe) sur plusieurs grilles : pas de features en bloc
+
+    def __init__(self, initial_state: StateType = None, all_against_ref_player = True, players_ui: bool = True):
+        super().__init__(initial_state if initial_state is not None else UltimateState(), all_against_ref_player, players_ui)
+
+    def print_help(self):
+        print("How to play:")
+        print("- The board is made of 9 small boards, numbered from 0 to 8 from left to right, top to bottom.")
+        print("- Choose a move with 2 digits: the small board, then the cell in this board (same numbering),")
+        print("  e.g. '48' is the bottom-right cell of the central board.")
+        print("- The cell you play sends your opponent to the matching small board.")
+        print("  If this board is already won or full, your opponent may play in any open board.")
+        print("- Win a small board to take its place on the big board: align 3 of them to win the game.")
+        print("- Type '?' or 'help' to display these instructions again.")
+
+    def is_terminal(self, state: StateType) -> bool:
+        return state.winner is not None or state.closed == ALL_BOARDS_CLOSED
+
+    def get_winner_by_symbol(self, state: StateType) -> str | None:
+        return state.winner
+
+    def get_score_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        - Victoire : 1000 - depth (une victoire rapide vaut plus), défaite : -(1000 - depth).
+        - Match nul : différence entre le nb de sous-grilles gagnées par le joueur de référence et par son adversaire.
+        """
+
+        if state.winner == reference_player_symbol:
+            return 1000 - depth
+        elif state.winner is not None:
+            return -(1000 - depth)
+        else:
+            opponent_symbol = self.get_next_player_by_symbol(reference_player_symbol)
+            return state.macro.count(reference_player_symbol) - state.macro.count(opponent_symbol)
+
+    def get_heuristic_by_symbol(self, state: StateType, reference_player_symbol: str, depth: int) -> int:
+        """
+        Heuristique de TicTacToe appliquée à la macro-grille (x10) et à chaque sous-grille encore ouverte.
+        Toujours inférieure en valeur absolue à une victoire (au plus 9 * 10 + 9 * 9 = 171).
+        """
+
+        score = 10 * super().get_heuristic_by_symbol(state.macro, reference_player_symbol, depth)
+        for board in range(9):
+            if not state.closed >> board & 1:
+                score += super().get_heuristic_by_symbol(state.get_board(board), reference_player_symbol, depth)
+        return score
+
+    def get_proven_result(self, state: StateType) -> str | None:
+        """
+        Match nul certain si plus aucun alignement de la macro-grille n'est possible : chaque alignement contient les 2 symboles
+        ou une sous-grille fermée sans vainqueur (pleine).
+        """
+        won = sum(1 << board for board in range(9) if state.macro[board] != ' ')
+        return None if self.has_open_line(state.macro, blocked=state.closed & ~won) else PROVEN_DRAW
+
+    def get_proven_score(self, state: StateType, reference_player_symbol: str, depth: int, player_symbol: str = None) -> int | None:
+        """
+        Pas de coupure : le score d'un nul (différence des sous-grilles gagnées) peut encore changer jusqu'à la fin de la partie.
+        get_proven_result reste utilisé par la recherche proof-number.
+        """
+        return None
+
+    def get_open_boards(self, state: StateType) -> List[int]:
+        """
+        Retourne les sous-grilles où le prochain joueur peut jouer.
+        """
+        if state.next_board >= 0:
+            return [state.next_board]
+        return [board for board in range(9) if not state.closed >> board & 1]
+
+    def get_possible_moves(self, state: StateType) -> List[Move]:
+        cells = state.cells
+        return [move for board in self.get_open_boards(state) for move in range(9 * board, 9 * board + 9) if cells[move] == ' ']
+
+    def get_move_hints(self, state: StateType, moves: List[Move], player) -> dict:
+        """
+        Indices tactiques de TicTacToe dans chaque sous-grille jouable (2 : gain de la sous-grille, 1 : blocage),
+        3 pour un coup qui gagne une sous-grille alignée avec deux sous-grilles déjà gagnées (victoire).
+        """
+
+        macro_hints = super().get_move_hints(state.macro, None, player)
+        hints = {}
+        for board in self.get_open_boards(state):
+            for cell, priority in super().get_move_hints(state.get_board(board), None, player).items():
+                if priority == 2 and macro_hints.get(board) == 2:
+                    priority = 3
+                hints[9 * board + cell] = priority
+        return hints
+
+    def apply_move(self, state: StateType, move: Move, player) -> StateType:
+        """
+        Retourne le nouvel état (l'état d'origine n'est pas modifié : les chaînes sont recopiées, sans deepcopy).
+        La macro-grille, les sous-grilles fermées et le vainqueur ne sont recalculés que pour la sous-grille jouée.
+        """
+
+        board, cell = divmod(move, 9)
+        symbol = player.symbol
+        cells = state.cells[:move] + symbol + state.cells[move + 1:]
+        macro, closed, winner = state.macro, state.closed, state.winner
+
+        sub_board = cells[9 * board: 9 * board + 9]
+        if super().get_winner_by_symbol(sub_board) is not None:
+            macro = macro[:board] + symbol + macro[board + 1:]
+            closed |= 1 << board
+            winner = super().get_winner_by_symbol(macro)
+        elif ' ' not in sub_board:
+            closed |= 1 << board
+
+        next_board = -1 if closed >> cell & 1 else cell
+        return UltimateState(cells, macro, closed, next_board, winner)
+
+    def move_to_str(self, move: Move) -> str:
+        board, cell = divmod(move, 9)
+        return f"{board}{cell}"
+
+    def str_to_move(self, move_str: str) -> Move:
+        digits = [char for char in move_str if char not in " ,;-"]
+        if len(digits) != 2 or not all(char in "012345678" for char in digits):
+            raise ValueError(f"'{move_str}' is not a valid move (expected 2 digits: board and cell).")
+        return 9 * int(digits[0]) + int(digits[1])
+
+    def state_to_str(self, state: StateType) -> str:
+        """
+        81 cases suivies de la sous-grille imposée : "<cells>|<next_board>" (la macro-grille se déduit des cases).
+        """
+        return f"{state.cells}|{state.next_board}"
+
+    def str_to_state(self, state_str: str) -> StateType:
+        """
+        Reconstruit l'état à partir de "<cells>|<next_board>" : macro-grille, sous-grilles fermées et vainqueur sont recalculés.
+        """
+        cells, _, next_board = state_str.partition("|")
+        if len(cells) != 81 or next_board not in [str(board) for board in range(-1, 9)]:
+            raise ValueError(f"'{state_str}' is not a valid state (expected 81 cells, '|' and the next board).")
+        macro, closed = "", 0
+        for board in range(9):
+            sub_board = cells[9 * board: 9 * board + 9]
+            winner = super().get_winner_by_symbol(sub_board)
+            macro += winner or ' '
+            if winner is not None or ' ' not in sub_board:
+                closed |= 1 << board
+        return UltimateState(cells, macro, closed, int(next_board), super().get_winner_by_symbol(macro))
+
+    def state_to_tensor(self, state: StateType, player):
+        """
+        Encode l'état du point de vue de player en un tableau NumPy int8 de forme (4, 9, 9) (lignes et colonnes du plateau 9x9) :
+        plan 0 = cases de player, plan 1 = cases de l'adversaire, plan 2 = cases vides, plan 3 = coups possibles.
+        """
+        import numpy as np                              # import local : NumPy n'est nécessaire que pour les réseaux de neurones
+
+        cells = np.array(list(state.cells))
+        mine = cells == player.symbol
+        empty = cells == ' '
+        legal = np.zeros(81, dtype=bool)
+        legal[self.get_possible_moves(state)] = True
+        planes = np.stack([mine, ~mine & ~empty, empty, legal]).astype(np.int8)
+        # ordre des cases : sous-grille par sous-grille -> lignes et colonnes du plateau 9x9
+        return planes.reshape(4, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(4, 9, 9)
+
+    def print_state_from_str(self, state) -> None:
+        """
+        Affiche le plateau 9x9 à partir de state_to_str (ou d'une liste de 81 symboles déjà colorisés),
+        les sous-grilles étant séparées par des doubles traits.
+        """
+
+        cells = state.split("|")[0] if isinstance(state, str) else state
+        for row in range(9):
+            if row % 3 == 0:
+                print("\t" + ("╬" if row else "╦").join(["═══════"] * 3).join("╔╗" if row == 0 else "╠╣"))
+            big_row, small_row = divmod(row, 3)
+            line = []
+            for big_col in range(3):
+                board = 3 * big_row + big_col
+                line.append(" ".join(cells[9 * board + 3 * small_row + small_col] for small_col in range(3)))
+            print("\t║ " + " ║ ".join(line) + " ║")
+        print("\t" + "╩".join(["═══════"] * 3).join("╚╝"))
+        if isinstance(state, str) and "|" in state and state.split("|")[1] != "-1":
+            print("\tnext board:", state.split("|")[1])
+
+    def print_colored_state(self, state: StateType, players: List[Any]):
+        colored_symbols = self.get_colored_symbols(players)
+        colored_cells = [colored_symbols.get(cell, cell) for cell in state.cells]
+        self.print_state_from_str(colored_cells)
+        if state.next_board >= 0 and not self.is_terminal(state):
+            print("\tnext board:", state.next_board)
+
+
+if __name__ == "__main__":
+    my_game = UltimateTicTacToe()
+    my_game.start(max_depth=4, log=True)
+    my_game.replay()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Jun  6 11:08:15 2025
+
+@author: did
+
+Réseau de valeur (MLP) en NumPy pur, utilisable comme heuristique par les moteurs de recherche.
+
+Le réseau prend l'état encodé par Game.state_to_tensor (du point de vue du joueur qui doit jouer) et prédit
+le résultat attendu pour ce joueur, entre -1 (défaite) et +1 (victoire) : c'est la cible z produite par selfplay.py.
+
+Les moteurs évaluent les feuilles par lots (evaluate) : une multiplication matricielle par couche pour tout le lot,
+au lieu d'un appel Python par noeud.
+
+Exemple :
+    my_game.minimax.evaluator = ValueNetwork.load("value_net.npz")
+    my_game.mcts.evaluator = my_game.minimax.evaluator            # feuilles de MCTS évaluées par lots à la place des parties aléatoires
+"""
+
+import numpy as np
+
+
+class ValueNetwork:
+    """
+    Perceptron multicouche : couches cachées ReLU, sortie tanh.
+
+    Paramètres :
+    - layers : liste de (W, b) avec W de forme (entrées, sorties) et b de forme (sorties,).
+    - value_scale : facteur appliqué à la sortie pour la ramener à l'échelle des scores du jeu
+                    (par défaut 9 : toujours inférieur à une victoire de TicTacToe, qui vaut au moins 10).
+    """
+
+    def __init__(self, layers, value_scale: float = 9):
+        self.layers = [(np.asarray(W, dtype=np.float32), np.asarray(b, dtype=np.float32)) for W, b in layers]
+        self.value_scale = value_scale
+
+    @classmethod
+    def load(cls, path: str, value_scale: float = 9) -> "ValueNetwork":
+        """
+        Charge les poids d'un fichier .npz contenant W0, b0, W1, b1... (dans l'ordre des couches).
+        """
+        with np.load(path) as data:
+            nb_layers = len([name for name in data.files if name.startswith("W")])
+            layers = [(data[f"W{i}"], data[f"b{i}"]) for i in range(nb_layers)]
+        return cls(layers, value_scale)
+
+    @classmethod
+    def random(cls, input_size: int, hidden_sizes=(64,), seed: int = 0, value_scale: float = 9) -> "ValueNetwork":
+        """
+        Crée un réseau aux poids aléatoires (initialisation de He), point de départ d'un entraînement.
+        """
+        rng = np.random.default_rng(seed)
+        sizes = [input_size, *hidden_sizes, 1]
+        layers = [(rng.normal(0, np.sqrt(2 / n_in), (n_in, n_out)), np.zeros(n_out)) for n_in, n_out in zip(sizes[:-1], sizes[1:])]
+        return cls(layers, value_scale)
+
+    def save(self, path: str) -> None:
+        """
+        Sauvegarde les poids au format lu par load().
+        """
+        arrays = {}
+        for i, (W, b) in enumerate(self.layers):
+            arrays[f"W{i}"] = W
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Retourne la valeur prédite (entre -1 et 1) de chaque ligne de X (forme (N, entrées)).
+        """
+        h = np.asarray(X, dtype=np.float32)
+        for W, b in self.layers[:-1]:
+            h = np.maximum(h @ W + b, 0)
+        W, b = self.layers[-1]
+        return np.tanh(h @ W + b)[:, 0]
+
+    def evaluate(self, game, states, players, reference_player) -> np.ndarray:
+        """
+        Evalue un lot d'états non terminaux en un seul passage du réseau.
+
+        Paramètres :
+        - states : liste d'états.
+        - players : joueur qui doit jouer dans chaque état (l'état est encodé de son point de vue).
+        - reference_player : joueur du point de vue duquel les valeurs sont retournées.
+
+        Retourne les valeurs à l'échelle des scores du jeu (value_scale).
+        """
+        X = np.stack([game.state_to_tensor(state, player).ravel() for state, player in zip(states, players)])
+        values = self.predict(X) * self.value_scale
+        signs = np.array([1 if player == reference_player else -1 for player in players])
+        return values * signs
+
+    def get_heuristic_by_symbol(self, game, state, player, reference_player_symbol: str) -> float:
+        """
+        Evalue un seul état (même signature de score que Game.get_heuristic_by_symbol) : player est le joueur qui doit jouer.
+        """
+        reference_player = game.get_player_by_symbol(reference_player_symbol)
+        return float(self.evaluate(game, [state], [player], reference_player)[0])